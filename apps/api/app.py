@@ -1,6 +1,8 @@
 from typing import Final
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from dishka.integrations.fastapi import setup_dishka
 from fastapi import FastAPI, Request, status
@@ -8,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from modules.media.application import RemoteStorage
 from modules.shared_kernel.domain import AppError, ErrorType
 
 from .container import container
@@ -16,8 +19,16 @@ from .v1.routers import router
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Долгоживущие клиенты создаются при старте, а не на первом запросе
+    await app.state.dishka_container.get(RemoteStorage)
+    yield
+    await app.state.dishka_container.close()
+
+
 def create_fastapi_app() -> FastAPI:
-    app = FastAPI(title="Alyosha AI API")
+    app = FastAPI(title="Alyosha AI API", lifespan=lifespan)
     app.include_router(router)
     app.add_middleware(
         CORSMiddleware,
@@ -4,9 +4,14 @@ from dishka import AsyncContainer, make_async_container
 
 from modules.iam.infrastructure.container import IAMProvider
 from modules.llm_catalog.infrastructure.container import LLMCatalogProvider
+from modules.media.infrastructure.container import MediaProvider
 from modules.shared_kernel.insrastructure.container import SharedKernelProvider
 from modules.workspaces.infrastructure.container import WorkspaceProvider
 
 container: Final[AsyncContainer] = make_async_container(
-    SharedKernelProvider(), IAMProvider(), LLMCatalogProvider(), WorkspaceProvider(),
+    SharedKernelProvider(),
+    IAMProvider(),
+    LLMCatalogProvider(),
+    WorkspaceProvider(),
+    MediaProvider(),
 )
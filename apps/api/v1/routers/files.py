@@ -63,7 +63,7 @@ async def download_file(
     file_metadata = await service.get_file_metadata(file_id)
     query = DownloadFileQuery(file_id=file_id, chunk_size=chunk_size)
 
-    async def file_content_generator() -> AsyncIterator[bytes]:
+    async def file_content_generator() -> AsyncIterator[memoryview]:
         async for file_part in service.download_file(query):
             yield file_part.content
 
@@ -0,0 +1,88 @@
+"""Бенчмарк сборки частей multipart загрузки из потока чанков запроса.
+
+Сравнивает прежнюю сборку (`buffer += chunk` и срез буфера) с `assemble_parts`
+и `FileMetadata.generate_file_parts`, выводит процессорное время на 1 GB.
+
+Запуск из директории apps:
+    python -m benchmarks.file_parts --size-mb 256 --chunk-kb 64 --part-mb 5
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+from modules.media.domain import FileMetadata, UploadFileCommand
+from modules.media.domain.entities import assemble_parts
+
+GB = 1024 ** 3
+
+
+async def legacy_assemble_parts(
+        stream: AsyncIterable[bytes], part_size: int
+) -> AsyncIterator[bytes]:
+    """Прежняя сборка частей: каждая итерация копирует весь буфер"""
+
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            content_part = buffer[:part_size]
+            buffer = buffer[part_size:]
+            yield content_part
+    if buffer:
+        yield buffer
+
+
+async def iter_chunks(size: int, chunk_size: int) -> AsyncIterator[bytes]:  # noqa: RUF029
+    chunk = bytes(chunk_size)
+    for _ in range(size // chunk_size):
+        yield chunk
+    if remainder := size % chunk_size:
+        yield chunk[:remainder]
+
+
+async def measure(
+        name: str, parts: Callable[[], AsyncIterable[object]], size: int
+) -> None:
+    count = 0
+    started_at = time.process_time()
+    async for _ in parts():
+        count += 1
+    elapsed = time.process_time() - started_at
+    print(  # noqa: T201
+        f"{name:<24} parts={count:<5} cpu={elapsed:.3f}s  cpu/GB={elapsed * GB / size:.3f}s"
+    )
+
+
+async def main(size: int, chunk_size: int, part_size: int) -> None:
+    file_metadata = FileMetadata.create(UploadFileCommand(
+        filename="recording.wav",
+        mime_type="audio/wav",
+        filesize=size,
+        tenant="benchmark",
+        entity_type="user",
+        entity_id="1",
+    ))
+    await measure(
+        "legacy buffer",
+        lambda: legacy_assemble_parts(iter_chunks(size, chunk_size), part_size),
+        size,
+    )
+    await measure(
+        "assemble_parts", lambda: assemble_parts(iter_chunks(size, chunk_size), part_size), size
+    )
+    await measure(
+        "generate_file_parts",
+        lambda: file_metadata.generate_file_parts(iter_chunks(size, chunk_size), part_size),
+        size,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256, help="Размер файла в MB")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="Размер чанка запроса в KB")
+    parser.add_argument("--part-mb", type=int, default=5, help="Размер части в MB")
+    args = parser.parse_args()
+    asyncio.run(main(args.size_mb * 1024 ** 2, args.chunk_kb * 1024, args.part_mb * 1024 ** 2))
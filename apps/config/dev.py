@@ -1,5 +1,8 @@
 from typing import Final, Literal
 
+from datetime import timedelta
+from pathlib import Path
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +31,10 @@ class MinioSettings(BaseSettings):
     user: str = "<USER>"
     password: str = "<PASSWORD>"
     bucket: str = "dev"
+    max_pool_connections: int = 50
+    keepalive_timeout: float = 60
+    upload_concurrency: int = 4
+    read_ahead: int = 4
 
     model_config = SettingsConfigDict(env_prefix="MINIO_")
 
@@ -65,6 +72,26 @@ class SaluteSpeechSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="SALUTE_SPEECH")
 
 
+class AudioPipelineSettings(BaseSettings):
+    claim_check: bool = True  # Передавать сегменты через брокер ссылкой на объект в хранилище
+    segments_prefix: str = "audio-segments"
+    encoding_profile: str = "stt-pcm"  # Профиль кодирования сегментов, см. ENCODING_PROFILES
+    transcription_concurrency: int = 4  # Одновременных распознаваний на воркер
+    transcription_cache: bool = True  # Переиспользовать распознавание одинаковых сегментов
+    transcription_cache_ttl: timedelta = timedelta(days=7)
+
+    model_config = SettingsConfigDict(env_prefix="AUDIO_PIPELINE_")
+
+
+class SoundEnhancerSettings(BaseSettings):
+    max_workers: int | None = None  # По умолчанию - количество доступных процессу ядер
+    prefetch_count: int | None = None  # По умолчанию - удвоенное количество процессов
+    profile: str = "speech-default"  # Профиль, если он не указан в метаданных сегмента
+    profiles_path: Path | None = None  # JSON файл с дополнительными профилями
+
+    model_config = SettingsConfigDict(env_prefix="SOUND_ENHANCER_")
+
+
 class JWTSettings(BaseSettings):
     secret_key: str = "<SECRET_KEY>"
     algorithm: str = "HS256"
@@ -130,6 +157,8 @@ class Settings(BaseSettings):
     rabbitmq: RabbitMQSettings = RabbitMQSettings()
     redis: RedisSettings = RedisSettings()
     salute_speech: SaluteSpeechSettings = SaluteSpeechSettings()
+    audio_pipeline: AudioPipelineSettings = AudioPipelineSettings()
+    sound_enhancer: SoundEnhancerSettings = SoundEnhancerSettings()
     jwt: JWTSettings = JWTSettings()
     vk: VKSettings = VKSettings()
     oauth: OAuthSettings = OAuthSettings()
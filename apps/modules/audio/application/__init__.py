@@ -1,5 +1,19 @@
 __all__ = (
+    "AUDIO_ENCODINGS",
+    "AudioSegmentStore",
     "AudioSplitter",
+    "CachedTranscription",
+    "TranscribedSegmentsCollector",
+    "TranscriptionOrchestrator",
+    "build_transcription_cache_key",
 )
 
+from .dto import CachedTranscription
+from .services import (
+    AUDIO_ENCODINGS,
+    AudioSegmentStore,
+    TranscribedSegmentsCollector,
+    TranscriptionOrchestrator,
+    build_transcription_cache_key,
+)
 from .workers import AudioSplitter
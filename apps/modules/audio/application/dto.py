@@ -0,0 +1,14 @@
+from typing import Any
+
+from modules.shared_kernel.application import DTO
+
+
+class CachedTranscription(DTO):
+    """Закешированный результат распознавания аудио сегмента
+
+    Attributes:
+        transcript: Столбцы расшифровки сегмента `Transcript.to_dict()`
+            (время от начала сегмента, нумерация спикеров сегмента)
+    """
+
+    transcript: dict[str, list[Any]]
@@ -1,11 +1,60 @@
 import asyncio
+import hashlib
 import logging
+import math
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from datetime import timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import aiofiles
 
 from config.dev import settings
-from salute_speech.asyncio import AsyncSaluteSpeechClient
+from modules.media.application import Storage
+from modules.media.domain import File, FilePart, Filepath, MimeType
+from modules.media.domain.entities import assemble_parts
+from modules.shared_kernel.application import KeyValueCache
+from modules.shared_kernel.application.exceptions import (
+    CacheHitError,
+    CacheSetError,
+    NotFoundError,
+)
+from modules.shared_kernel.utils import current_datetime
+from salute_speech.asyncio import AsyncSaluteSpeechClient, RecognitionTaskTracker
+from salute_speech.asyncio.client import UploadContent
+from salute_speech.constants import AudioEncoding, Language
+from salute_speech.transcript import Transcript
+
+from ..domain import (
+    AudioFormat,
+    AudioSegment,
+    AudioSegmentTranscribedEvent,
+    FileAudioSegment,
+    StoredAudioSegment,
+)
+from .dto import CachedTranscription
 
 logger = logging.getLogger(__name__)
 
+# Версия формата закешированных расшифровок, входит в ключ кеша
+TRANSCRIPTION_CACHE_VERSION = 2
+# Размер части при multipart загрузке сегмента из файла (минимум S3 - 5 MB)
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+type TranscribedSegment = (
+    AudioSegment | FileAudioSegment | StoredAudioSegment | AudioSegmentTranscribedEvent
+)
+"""Сегмент с началом и продолжительностью, расшифровка которого склеивается в запись"""
+
+# Кодировки Salute Speech для форматов сегментов (см. ENCODING_PROFILES)
+AUDIO_ENCODINGS: dict[AudioFormat, AudioEncoding] = {
+    AudioFormat.WAV: "PCM_S16LE",
+    AudioFormat.OPUS: "OPUS",
+    AudioFormat.OGG: "OPUS",
+    AudioFormat.FLAC: "FLAC",
+    AudioFormat.MP3: "MP3",
+}
+
 
 async def transcribe_audio(
         audio: bytes, max_speakers_count: int = 10, async_timeout: int = 1, **kwargs
@@ -14,22 +63,450 @@ async def transcribe_audio(
 
     :param audio: Байты аудио контента.
     :param max_speakers_count: Максимальное количество спикеров на записи.
-    :param async_timeout: Время задержки между polling запросами.
+    :param async_timeout: Минимальное время задержки между polling запросами.
     :returns: Трансрибация в формате Markdown.
+    :raises TaskFailedError: Задача распознавания завершилась с ошибкой или по таймауту.
     """
 
-    stt_client = AsyncSaluteSpeechClient(
+    async with AsyncSaluteSpeechClient(
         apikey=settings.salute_speech.apikey, scope=settings.salute_speech.scope
-    )
-    request_file_id = await stt_client.upload_file(
-        file=audio, audio_encoding="PCM_S16LE", **kwargs
-    )
-    task = await stt_client.async_recognize(
-        request_file_id=request_file_id, audio_encoding=..., max_speakers_count=max_speakers_count
-    )
-    while task.status != "DONE":
-        await asyncio.sleep(async_timeout)
-        task = await stt_client.get_task_status(task.id)
-    response_file_id = task.response_file_id
-    recognized_speech_list = await stt_client.download_file(response_file_id)
+    ) as stt_client:
+        request_file_id = await stt_client.upload_file(
+            file=audio, audio_encoding="PCM_S16LE", **kwargs
+        )
+        task = await stt_client.async_recognize(
+            request_file_id=request_file_id,
+            audio_encoding="PCM_S16LE",
+            max_speakers_count=max_speakers_count,
+        )
+        tracker = RecognitionTaskTracker(stt_client, min_interval=async_timeout)
+        try:
+            task = await tracker.wait(task)
+        finally:
+            await tracker.close()
+        response_file_id = task.response_file_id
+        recognized_speech_list = await stt_client.download_file(response_file_id)
     return recognized_speech_list.to_markdown()
+
+
+class AudioSegmentStore:
+    """Хранение аудио сегментов в объектном хранилище по шаблону claim-check.
+
+    Через брокер сообщений передаётся только StoredAudioSegment (ссылка + метаданные),
+    а байты аудио загружаются в хранилище и скачиваются получателем напрямую.
+    """
+
+    def __init__(self, storage: Storage, prefix: str = "audio-segments") -> None:
+        """
+        :param storage: Объектное хранилище для контента сегментов.
+        :param prefix: Префикс пути объектов сегментов в хранилище.
+        """
+
+        self._storage = storage
+        self._prefix = prefix
+
+    async def put(
+            self, segment: AudioSegment | FileAudioSegment, stage: str
+    ) -> StoredAudioSegment:
+        """Загрузка контента сегмента в хранилище.
+        Контент FileAudioSegment загружается потоком из файла (multipart), без чтения в память.
+
+        :param segment: Аудио сегмент с контентом.
+        :param stage: Этап обработки, например: 'split', 'enhanced'.
+        :returns: Ссылка на сегмент в хранилище.
+        """
+
+        filepath = Filepath(f"{self._prefix}/{stage}/{uuid4()}.{segment.format}")
+        mime_type = MimeType(f"audio/{segment.format}")
+        if isinstance(segment, FileAudioSegment):
+            checksum = await asyncio.to_thread(file_checksum, segment.filepath)
+            await self._storage.upload_multipart(
+                self._generate_file_parts(segment, filepath, mime_type)
+            )
+            segment_info = segment.model_dump(exclude={"filepath"})
+        else:
+            checksum = hashlib.sha256(segment.content).hexdigest()
+            await self._storage.upload(File(
+                path=filepath, size=segment.size, mime_type=mime_type, content=segment.content
+            ))
+            segment_info = segment.model_dump(exclude={"content"})
+        logger.debug("Audio segment %s stored to %s", segment.number, filepath)
+        return StoredAudioSegment(**segment_info, filepath=filepath, checksum=checksum)
+
+    @staticmethod
+    async def _generate_file_parts(
+            segment: FileAudioSegment,
+            filepath: Filepath,
+            mime_type: MimeType,
+            part_size: int = MULTIPART_PART_SIZE,
+    ) -> AsyncIterator[FilePart]:
+        """Части файла сегмента для multipart загрузки, файл читается потоком"""
+
+        total_parts = max(math.ceil(segment.size / part_size), 1)
+        uploaded_at = current_datetime()
+        part_number, offset = 0, 0
+        async for content in assemble_parts(segment.iter_content(), part_size):
+            part_number += 1
+            yield FilePart(
+                path=filepath,
+                mime_type=mime_type,
+                number=part_number,
+                offset=offset,
+                content=memoryview(content),
+                total_size=segment.size,
+                total_parts=total_parts,
+                uploaded_at=uploaded_at,
+            )
+            offset += len(content)
+
+    async def get(self, segment: StoredAudioSegment) -> AudioSegment:
+        """Скачивание контента сегмента из хранилища"""
+
+        file = await self._storage.download(Filepath(segment.filepath))
+        if file is None:
+            raise NotFoundError(
+                "Audio segment not found in storage",
+                entity_name="AudioSegment",
+                details={"filepath": segment.filepath},
+            )
+        return AudioSegment(
+            **segment.model_dump(exclude={"filepath", "checksum"}), content=file.content
+        )
+
+    async def iter_content(
+            self, segment: StoredAudioSegment, chunk_size: int = 1024 * 1024
+    ) -> AsyncIterator[memoryview]:
+        """Потоковое скачивание контента сегмента ranged запросами, без загрузки в память.
+
+        :param segment: Ссылка на сегмент в хранилище.
+        :param chunk_size: Размер части в байтах.
+        """
+
+        async for file_part in self._storage.download_multipart(
+            Filepath(segment.filepath), part_size=chunk_size
+        ):
+            yield file_part.content
+
+    async def download(self, segment: StoredAudioSegment, destination: Path) -> FileAudioSegment:
+        """Потоковое скачивание контента сегмента в файл, без загрузки в память.
+
+        :param segment: Ссылка на сегмент в хранилище.
+        :param destination: Путь до файла, в который записывается контент.
+        :returns: Сегмент с контентом в файле, файлом владеет вызывающий.
+        """
+
+        async with aiofiles.open(destination, mode="wb") as file:
+            async for chunk in self.iter_content(segment):
+                await file.write(chunk)
+        return FileAudioSegment(
+            **segment.model_dump(exclude={"filepath", "checksum"}), filepath=destination
+        )
+
+    async def remove(self, segment: StoredAudioSegment) -> None:
+        """Удаление обработанного сегмента из хранилища"""
+
+        await self._storage.remove(Filepath(segment.filepath))
+
+
+def file_checksum(filepath: Path) -> str:
+    """SHA-256 контента файла (hex), файл читается потоком"""
+
+    with open(filepath, mode="rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def build_transcription_cache_key(
+        checksum: str,
+        model: str,
+        language: Language,
+        max_speakers_count: int,
+        profanity_check: bool,
+) -> str:
+    """Ключ кеша распознавания: хеш контента сегмента + опции, влияющие на результат.
+
+    :param checksum: SHA-256 контента сегмента.
+    :param model: Модель распознавания.
+    :param language: Язык распознавания.
+    :param max_speakers_count: Максимальное количество спикеров.
+    :param profanity_check: Включён ли фильтр ненормативной лексики.
+    :returns: Ключ кеша.
+    """
+
+    options = f"{model}:{language}:{max_speakers_count}:{int(profanity_check)}"
+    return hashlib.sha256(
+        f"{TRANSCRIPTION_CACHE_VERSION}:{checksum}:{options}".encode()
+    ).hexdigest()
+
+
+class TranscriptionOrchestrator:
+    """Параллельная транскрибация сегментов аудио записи.
+
+    Все сегменты отправляются на распознавание одновременно (не больше `max_concurrency`
+    задач за раз), каждая задача отслеживается независимо, а результаты собираются
+    обратно в порядке сегментов. Время транскрибации записи приближается к времени
+    самого долгого сегмента, а не к сумме времени всех сегментов.
+
+    Статусы задач опрашиваются общим `RecognitionTaskTracker`, а семафор удерживается
+    только на время загрузки сегмента и скачивания результата, поэтому ожидающие
+    распознавания задачи не занимают слоты одновременных запросов.
+
+    Salute Speech нумерует спикеров в каждом сегменте заново, поэтому номера спикеров
+    сегмента сдвигаются на количество спикеров предыдущих сегментов: разные люди
+    из разных сегментов никогда не получают один номер.
+
+    Если передан кеш, результат распознавания сохраняется по хешу контента сегмента
+    и опций распознавания: повторная обработка той же записи не загружает сегменты
+    в Salute Speech и не тратит платное распознавание.
+
+    Воркер транскрибации распознаёт по одному сегменту на сообщение (`transcribe_segment`)
+    и публикует AudioSegmentTranscribedEvent, `transcribe` используется, когда все
+    сегменты записи обрабатываются в одном процессе. Расшифровку записи из событий
+    сегментов собирает `TranscribedSegmentsCollector` вместе с `reassemble_events`.
+    """
+
+    def __init__(
+            self,
+            client: AsyncSaluteSpeechClient,
+            max_concurrency: int = 4,
+            max_speakers_count: int = 10,
+            language: Language = "ru-RU",
+            tracker: RecognitionTaskTracker | None = None,
+            cache: KeyValueCache[CachedTranscription] | None = None,
+            cache_ttl: timedelta | None = None,
+    ) -> None:
+        """
+        :param client: Клиент Salute Speech.
+        :param max_concurrency: Максимальное количество одновременных загрузок и скачиваний.
+        :param max_speakers_count: Максимальное количество спикеров в сегменте.
+        :param language: Язык распознавания.
+        :param tracker: Трекер задач распознавания, по умолчанию создаётся для клиента.
+        :param cache: Кеш результатов распознавания, по умолчанию не используется.
+        :param cache_ttl: Время жизни результата в кеше, по умолчанию из кеша.
+        """
+
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_speakers_count = max_speakers_count
+        self._language = language
+        self._tracker = tracker or RecognitionTaskTracker(client)
+        self._cache = cache
+        self._cache_ttl = cache_ttl
+
+    async def close(self) -> None:
+        """Останавливает отслеживание задач распознавания"""
+        await self._tracker.close()
+
+    async def transcribe_segment(
+            self,
+            segment: AudioSegment | FileAudioSegment | StoredAudioSegment,
+            content: UploadContent | None = None,
+    ) -> Transcript:
+        """Распознавание одного сегмента: загрузка, создание задачи, ожидание, скачивание.
+
+        Контент FileAudioSegment отправляется потоком из файла, для StoredAudioSegment
+        поток контента нужно передать явно, например `AudioSegmentStore.iter_content`.
+        При попадании в кеш контент не читается и не загружается.
+
+        :param segment: Аудио сегмент.
+        :param content: Контент сегмента, по умолчанию берётся из самого сегмента.
+        :returns: Расшифровка сегмента (время от начала сегмента, нумерация спикеров сегмента).
+        :raises TaskFailedError: Задача распознавания завершилась с ошибкой.
+        :raises TaskTimeoutError: Задача распознавания не завершилась вовремя.
+        """
+
+        if content is None:
+            if isinstance(segment, StoredAudioSegment):
+                raise ValueError("Content stream is required for stored audio segment")
+            is_file = isinstance(segment, FileAudioSegment)
+            content = segment.filepath if is_file else segment.content
+        cache_key = await self._build_cache_key(segment)
+        if cache_key is not None:
+            cached_transcription = await self._get_cached(cache_key)
+            if cached_transcription is not None:
+                logger.debug("Audio segment %s transcription found in cache", segment.number)
+                return Transcript.from_dict(cached_transcription.transcript)
+        audio_encoding = AUDIO_ENCODINGS[segment.format]
+        async with self._semaphore:
+            request_file_id = await self._client.upload_file(
+                file=content,
+                audio_encoding=audio_encoding,
+                channels=segment.channels,
+                samplerate=segment.samplerate,
+            )
+            task = await self._client.async_recognize(
+                request_file_id,
+                audio_encoding=audio_encoding,
+                channels=segment.channels,
+                samplerate=segment.samplerate,
+                max_speakers_count=self._max_speakers_count,
+                language=self._language,
+            )
+        task = await self._tracker.wait(task, expected_duration=segment.duration)
+        async with self._semaphore:
+            transcript = await self._client.download_transcript(task.response_file_id)
+        logger.debug(
+            "Audio segment %s/%s transcribed", segment.number, segment.total_count
+        )
+        if cache_key is not None:
+            await self._set_cached(cache_key, transcript)
+        return transcript
+
+    async def _build_cache_key(
+            self, segment: AudioSegment | FileAudioSegment | StoredAudioSegment
+    ) -> str | None:
+        if self._cache is None:
+            return None
+        if isinstance(segment, StoredAudioSegment):
+            checksum = segment.checksum
+        elif isinstance(segment, FileAudioSegment):
+            checksum = await asyncio.to_thread(file_checksum, segment.filepath)
+        else:
+            checksum = hashlib.sha256(segment.content).hexdigest()
+        if checksum is None:
+            return None
+        return build_transcription_cache_key(
+            checksum,
+            model=self._client.model,
+            language=self._language,
+            max_speakers_count=self._max_speakers_count,
+            profanity_check=self._client.profanity_check,
+        )
+
+    async def _get_cached(self, cache_key: str) -> CachedTranscription | None:
+        # Недоступный кеш не должен останавливать распознавание
+        try:
+            return await self._cache.get(cache_key)
+        except CacheHitError:
+            logger.warning("Failed to get transcription from cache", exc_info=True)
+            return None
+
+    async def _set_cached(self, cache_key: str, transcript: Transcript) -> None:
+        try:
+            await self._cache.set(
+                cache_key,
+                CachedTranscription(transcript=transcript.to_dict()),
+                ttl=self._cache_ttl,
+            )
+        except CacheSetError:
+            logger.warning("Failed to set transcription to cache", exc_info=True)
+
+    async def transcribe(
+            self, segments: AsyncIterable[AudioSegment] | Iterable[AudioSegment]
+    ) -> Transcript:
+        """Транскрибация всех сегментов записи с сохранением порядка.
+
+        Распознавание сегмента начинается сразу после его получения, не дожидаясь
+        остальных сегментов (например, пока сплиттер режет следующие).
+
+        :param segments: Сегменты записи, в любом порядке.
+        :returns: Расшифровка всей записи со временем от начала записи.
+        """
+
+        segments_by_number: dict[int, AudioSegment] = {}
+        tasks: dict[int, asyncio.Task[Transcript]] = {}
+
+        def start_transcription(segment: AudioSegment) -> None:
+            segments_by_number[segment.number] = segment
+            tasks[segment.number] = asyncio.create_task(self.transcribe_segment(segment))
+
+        try:
+            if isinstance(segments, AsyncIterable):
+                async for segment in segments:
+                    start_transcription(segment)
+            else:
+                for segment in segments:
+                    start_transcription(segment)
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return self.reassemble([
+            (segments_by_number[number], tasks[number].result()) for number in sorted(tasks)
+        ])
+
+    @classmethod
+    def reassemble_events(cls, events: Iterable[AudioSegmentTranscribedEvent]) -> Transcript:
+        """Склейка расшифровки записи из событий распознавания её сегментов.
+
+        :param events: События всех сегментов записи, в любом порядке.
+        :returns: Расшифровка всей записи.
+        """
+
+        return cls.reassemble([
+            (event, Transcript.from_dict(event.transcript))
+            for event in sorted(events, key=lambda event: event.number)
+        ])
+
+    @staticmethod
+    def reassemble(
+            results: list[tuple[TranscribedSegment, Transcript]]
+    ) -> Transcript:
+        """Склейка расшифровок сегментов в расшифровку записи.
+
+        Время фраз сдвигается на начало сегмента в записи, спикеры получают единую
+        нумерацию, а фразы на перекрытии соседних сегментов не дублируются
+        (см. `Transcript.extend`). Если начало сегмента неизвестно, оно считается
+        по продолжительностям предыдущих сегментов.
+
+        :param results: Сегменты и их расшифровки в порядке сегментов.
+        :returns: Расшифровка всей записи.
+        """
+
+        reassembled = Transcript()
+        speaker_offset = 0
+        position = 0.0
+        for segment, transcript in results:
+            offset = segment.offset
+            if offset is None:
+                # Продолжительность округлена вниз, поэтому фразы предыдущего
+                # сегмента не должны приниматься за перекрытие
+                offset = max(position, reassembled.duration)
+            reassembled.extend(transcript, offset=offset, speaker_offset=speaker_offset)
+            speaker_offset += transcript.speakers_count
+            position = offset + segment.duration - segment.overlap
+        return reassembled
+
+
+class TranscribedSegmentsCollector:
+    """Накопление событий распознавания сегментов до получения всех сегментов записи.
+
+    Сегменты нумеруются заново для каждой записи коллекции, поэтому события
+    группируются по паре (collection_id, record_id) из метаданных сегмента.
+    Общее количество сегментов известно только из события последнего сегмента,
+    а события приходят в любом порядке. Повторно доставленное событие заменяет
+    полученное ранее для того же номера сегмента.
+
+    События хранятся в памяти процесса: все события записи должны попадать
+    в один экземпляр коллектора (один потребитель очереди).
+    """
+
+    def __init__(self) -> None:
+        self._events: dict[tuple[str, str], dict[int, AudioSegmentTranscribedEvent]] = {}
+        self._total_counts: dict[tuple[str, str], int] = {}
+
+    @property
+    def pending_count(self) -> int:
+        """Количество записей, сегменты которых ещё собираются"""
+
+        return len(self._events)
+
+    def add(
+            self, event: AudioSegmentTranscribedEvent
+    ) -> list[AudioSegmentTranscribedEvent] | None:
+        """Добавление события сегмента.
+
+        :param event: Событие распознавания сегмента записи.
+        :returns: События всех сегментов записи, если получен последний
+            недостающий сегмент, иначе None.
+        """
+
+        key = (event.metadata["collection_id"], event.metadata["record_id"])
+        events = self._events.setdefault(key, {})
+        events[event.number] = event
+        if event.total_count is not None:
+            self._total_counts[key] = event.total_count
+        if len(events) != self._total_counts.get(key):
+            return None
+        del self._events[key], self._total_counts[key]
+        return list(events.values())
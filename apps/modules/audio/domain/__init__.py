@@ -1,11 +1,33 @@
 __all__ = (
+    "ENCODING_PROFILES",
+    "HIFI_ENCODING_PROFILE",
+    "STT_FLAC_ENCODING_PROFILE",
+    "STT_OPUS_ENCODING_PROFILE",
+    "STT_PCM_ENCODING_PROFILE",
     "AudioFormat",
     "AudioSegment",
+    "AudioSegmentTranscribedEvent",
+    "EncodingProfile",
+    "FileAudioSegment",
+    "StoredAudioSegment",
     "SummarizeMeetingCommand",
     "TranscriptionSegment",
     "UnsupportedAudioError",
 )
 
 from .commands import SummarizeMeetingCommand
+from .events import AudioSegmentTranscribedEvent
 from .exceptions import UnsupportedAudioError
-from .value_objects import AudioFormat, AudioSegment, TranscriptionSegment
+from .value_objects import (
+    ENCODING_PROFILES,
+    HIFI_ENCODING_PROFILE,
+    STT_FLAC_ENCODING_PROFILE,
+    STT_OPUS_ENCODING_PROFILE,
+    STT_PCM_ENCODING_PROFILE,
+    AudioFormat,
+    AudioSegment,
+    EncodingProfile,
+    FileAudioSegment,
+    StoredAudioSegment,
+    TranscriptionSegment,
+)
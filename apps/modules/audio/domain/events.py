@@ -0,0 +1,30 @@
+from typing import Any, ClassVar
+
+from pydantic import Field, NonNegativeFloat, PositiveInt
+
+from modules.shared_kernel.domain import Event
+
+
+class AudioSegmentTranscribedEvent(Event):
+    """Расшифровка аудио сегмента со всем необходимым для склейки расшифровки записи
+
+    Attributes:
+        number: Номер сегмента
+        total_count: Общее количество сегментов записи
+        duration: Продолжительность сегмента в секундах
+        offset: Начало сегмента от начала записи в секундах (None если неизвестно)
+        overlap: Продолжительность перекрытия началом следующего сегмента в секундах
+        transcript: Столбцы расшифровки сегмента `Transcript.to_dict()`
+            (время от начала сегмента, нумерация спикеров сегмента)
+        metadata: Метаданные сегмента (идентификаторы задачи и записи)
+    """
+
+    event_type: ClassVar[str] = "audio_segment_transcribed"
+
+    number: PositiveInt
+    total_count: PositiveInt | None = None
+    duration: PositiveInt
+    offset: NonNegativeFloat | None = None
+    overlap: NonNegativeFloat = 0
+    transcript: dict[str, list[Any]]
+    metadata: dict[str, Any] = Field(default_factory=dict)
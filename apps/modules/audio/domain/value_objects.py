@@ -1,10 +1,14 @@
-from typing import Any, Self
+from typing import Any, BinaryIO, Self
 
+import mmap
 import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
 from enum import StrEnum
 from pathlib import Path
 
-from pydantic import Field, PositiveInt
+import aiofiles
+from pydantic import Field, NonNegativeFloat, PositiveInt
 
 from modules.shared_kernel.domain import ValueObject
 
@@ -76,39 +80,162 @@ class AudioFormat(StrEnum):
         return self in self.lossless_formats()
 
 
+class EncodingProfile(ValueObject):
+    """Профиль кодирования аудио сегментов при разбиении.
+
+    Attributes:
+        format: Формат (контейнер) сегмента.
+        codec: Аудио кодек FFmpeg.
+        channels: Количество каналов.
+        samplerate: Частота дискретизации.
+    """
+
+    format: AudioFormat
+    codec: str
+    channels: PositiveInt
+    samplerate: PositiveInt
+
+
+# Стерео 44.1 kHz PCM, прежний формат сегментов
+HIFI_ENCODING_PROFILE = EncodingProfile(
+    format=AudioFormat.WAV, codec="pcm_s16le", channels=2, samplerate=44100
+)
+# Профили под распознавание речи: моно 16 kHz, больше распознаванию не нужно
+STT_PCM_ENCODING_PROFILE = EncodingProfile(
+    format=AudioFormat.WAV, codec="pcm_s16le", channels=1, samplerate=16000
+)
+STT_OPUS_ENCODING_PROFILE = EncodingProfile(
+    format=AudioFormat.OPUS, codec="libopus", channels=1, samplerate=16000
+)
+STT_FLAC_ENCODING_PROFILE = EncodingProfile(
+    format=AudioFormat.FLAC, codec="flac", channels=1, samplerate=16000
+)
+
+ENCODING_PROFILES: dict[str, EncodingProfile] = {
+    "hifi": HIFI_ENCODING_PROFILE,
+    "stt-pcm": STT_PCM_ENCODING_PROFILE,
+    "stt-opus": STT_OPUS_ENCODING_PROFILE,
+    "stt-flac": STT_FLAC_ENCODING_PROFILE,
+}
+
+
 class _Segment(ValueObject):
     number: PositiveInt
-    total_count: PositiveInt
+    total_count: PositiveInt | None = None
 
     @property
     def is_last(self) -> bool:
-        """Является ли сегмент последним в последовательности"""
+        """Является ли сегмент последним в последовательности.
+        При потоковом разбиении общее количество сегментов известно только у последнего.
+        """
+
+        return self.total_count is not None and self.number == self.total_count
+
 
-        return self.number == self.total_count
+class _AudioSegmentInfo(_Segment):
+    format: AudioFormat
+    size: PositiveInt
+    duration: PositiveInt
+    channels: PositiveInt | None = None
+    samplerate: PositiveInt | None = None
+    offset: NonNegativeFloat | None = None
+    overlap: NonNegativeFloat = 0
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
 
-class AudioSegment(_Segment):
+class AudioSegment(_AudioSegmentInfo):
     """Часть аудио файла (аудио сегмент)
 
     Attributes:
         number: Номер сегмента (натуральное число)
-        total_count: Общее количество сегментов
+        total_count: Общее количество сегментов (None пока разбиение не завершено)
         content: Аудио контент (байты)
         format: Формат аудио, например 'wav', 'mp3', 'm4a', 'flac', ...
         size: Размер сегмента в байтах
         duration: Продолжительность сегмента в секундах
         channels: Количество аудио каналов
         samplerate: Частота дискретизации
+        offset: Начало сегмента от начала записи в секундах (None если неизвестно)
+        overlap: Продолжительность перекрытия началом следующего сегмента в секундах
         metadata: Дополнительная информация, которую нужно передать в контекст
     """
 
     content: bytes
-    format: AudioFormat
-    size: PositiveInt
-    duration: PositiveInt
-    channels: PositiveInt | None = None
-    samplerate: PositiveInt | None = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class FileAudioSegment(_AudioSegmentInfo):
+    """Аудио сегмент, контент которого хранится в файле и читается лениво.
+    Не держит байты в памяти процесса: контент отображается в память (mmap)
+    или читается потоком по частям. Файлом владеет получатель сегмента.
+
+    Attributes:
+        filepath: Путь до файла с аудио контентом сегмента
+    """
+
+    filepath: Path
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Открытие файла сегмента на чтение (например, для потоковой отправки по HTTP)"""
+
+        with open(self.filepath, mode="rb") as file:
+            yield file
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """Отображение контента сегмента в память без копирования.
+        memoryview действителен только внутри контекста.
+        """
+
+        if self.filepath.stat().st_size == 0:
+            # Пустой файл нельзя отобразить в память
+            yield memoryview(b"")
+            return
+        with (
+            open(self.filepath, mode="rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    async def iter_content(self, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        """Потоковое чтение контента сегмента по частям.
+
+        :param chunk_size: Размер части в байтах.
+        """
+
+        async with aiofiles.open(self.filepath, mode="rb") as file:
+            while chunk := await file.read(chunk_size):
+                yield chunk
+
+    def read(self) -> AudioSegment:
+        """Материализация сегмента в память (копия контента)"""
+
+        return AudioSegment(
+            **self.model_dump(exclude={"filepath"}), content=self.filepath.read_bytes()
+        )
+
+    def unlink(self) -> None:
+        """Удаление файла сегмента после обработки"""
+
+        self.filepath.unlink(missing_ok=True)
+
+
+class StoredAudioSegment(_AudioSegmentInfo):
+    """Ссылка на аудио сегмент в объектном хранилище (claim-check).
+    Передаётся через брокер сообщений вместо байтов аудио, получатель
+    сам скачивает контент из хранилища.
+
+    Attributes:
+        filepath: Путь до объекта сегмента в хранилище
+        checksum: SHA-256 контента сегмента для поиска одинаковых сегментов без скачивания
+    """
+
+    filepath: str
+    checksum: str | None = None
 
 
 class TranscriptionSegment(_Segment):
@@ -116,7 +243,9 @@ class TranscriptionSegment(_Segment):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
     @classmethod
-    def from_audio(cls, text: str, segment: AudioSegment) -> Self:
+    def from_audio(
+            cls, text: str, segment: AudioSegment | FileAudioSegment | StoredAudioSegment
+    ) -> Self:
         return cls(
             number=segment.number,
             total_count=segment.total_count,
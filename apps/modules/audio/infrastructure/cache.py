@@ -0,0 +1,38 @@
+import logging
+from datetime import timedelta
+
+from redis import RedisError
+
+from modules.shared_kernel.application.exceptions import CacheSetError
+from modules.shared_kernel.insrastructure.cache import RedisKeyValueCache
+from salute_speech.models import AccessToken
+
+from ..application.dto import CachedTranscription
+
+logger = logging.getLogger(__name__)
+
+
+class SaluteSpeechTokenCache(RedisKeyValueCache[AccessToken]):
+    """Общий для воркеров кеш access token Salute Speech.
+
+    Токен - секрет, поэтому в отличие от базового кеша значение не попадает
+    ни в логи, ни в сообщение об ошибке записи.
+    """
+
+    model = AccessToken
+
+    async def set(self, key: str, value: AccessToken, ttl: timedelta | None = None) -> None:
+        built_key = self._build_key(key)
+        try:
+            await self.redis.set(built_key, value.model_dump_json(), ex=ttl or self.ttl)
+        except RedisError as e:
+            raise CacheSetError(
+                key=built_key, value={"expires_at": f"{value.expires_at}"}, original_error=e
+            ) from e
+        logger.info("Access token cached", extra={"key": built_key})
+
+
+class TranscriptionCache(RedisKeyValueCache[CachedTranscription]):
+    """Кеш результатов распознавания по хешу контента сегмента и опций распознавания"""
+
+    model = CachedTranscription
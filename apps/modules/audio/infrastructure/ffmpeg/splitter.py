@@ -1,24 +1,44 @@
 from typing import Any
 
 import asyncio
-import glob
 import logging
+import math
 import os
-import re
+import shutil
+import tempfile
+from collections import deque
 from collections.abc import AsyncIterable, AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from uuid import UUID, uuid4
 
 import aiofiles
+import numpy as np
 
 from ...application import AudioSplitter
 from ...application.exceptions import AudioSplittingError
-from ...domain import AudioFormat, AudioSegment
-from ...utils.audio import get_audio_info
+from ...domain import (
+    AudioFormat,
+    AudioSegment,
+    EncodingProfile,
+    FileAudioSegment,
+    UnsupportedAudioError,
+)
+from ...utils.audio import append_wav_head, extract_audio_info, extract_wav_info
+from ...utils.vad import (
+    VAD_FRAME_SIZE,
+    VAD_SAMPLE_WIDTH,
+    VAD_SAMPLERATE,
+    SegmentCut,
+    frame_powers,
+    plan_segment_cuts,
+)
 
 logger = logging.getLogger(__name__)
 
+STDERR_TAIL_SIZE = 50  # Количество последних строк stderr FFmpeg для сообщения об ошибке
+ANALYSIS_CHUNK_SIZE = 64 * 1024  # Размер чтения декодированного PCM при поиске пауз
+
 
 class FFMpegAudioSplitter(AudioSplitter):
     """Асинхронный сплиттер аудио-потоков на сегменты фиксированной длительности
@@ -31,17 +51,25 @@ class FFMpegAudioSplitter(AudioSplitter):
 
     Основные возможности:
     - Потоковое разделение аудио на сегменты
+    - Потоковый режим: вход подаётся в stdin FFmpeg по мере скачивания, а сегменты
+      отдаются сразу после того как FFmpeg их закрыл (без промежуточного файла)
     - Автоматическая конвертация в указанный формат (по умолчанию WAV)
-    - Поддержка перекрытия сегментов (overlap)
+    - Профили кодирования (EncodingProfile), например моно 16 kHz под распознавание речи
+    - Привязка границ сегментов к паузам в речи (silence_tolerance > 0)
+    - Поддержка перекрытия сегментов (overlap) на границах, не попавших в паузу,
+      для WAV сегментов
     - Очистка временных файлов после обработки
+    - Сегменты без копирования контента в память (file_backed=True, см. FileAudioSegment)
     - Асинхронная обработка для эффективной работы с I/O
 
     Example:
         >>> splitter = FFMpegAudioSplitter(
         ...     segment_duration=300,  # 5 минут
         ...     segment_overlap=10,    # 10 секунд перекрытия
-        ...     segment_format=AudioFormat.WAV,
-        ...     prefix="session_123"
+        ...     silence_tolerance=30,  # Граница ищется в паузе ±30 секунд
+        ...     encoding_profile=STT_PCM_ENCODING_PROFILE,  # WAV, моно 16 kHz
+        ...     prefix="session_123",
+        ...     streaming=True,
         ... )
         >>> async for segment in splitter.split_stream(audio_stream):
         ...     process_segment(segment)
@@ -51,6 +79,12 @@ class FFMpegAudioSplitter(AudioSplitter):
         - Все временные файлы автоматически удаляются после обработки
         - Поддерживает форматы: WAV, MP3, OGG, FLAC (зависит от FFmpeg)
         - Сегменты нумеруются начиная с 1
+        - `total_count` известен только у последнего сегмента (сегменты отдаются до
+          завершения FFmpeg)
+        - Контейнеры с индексом в конце файла (например, MP4/M4A с moov atom в конце)
+          нельзя читать из pipe, для них нужен режим с временным файлом (streaming=False)
+        - Поиск пауз требует двух проходов по записи, поэтому при silence_tolerance > 0
+          вход всегда записывается во временный файл
     """
 
     def __init__(
@@ -60,6 +94,10 @@ class FFMpegAudioSplitter(AudioSplitter):
             segment_format: AudioFormat = AudioFormat.WAV,
             temp_dir: Path | None = None,
             prefix: str | float | UUID = "",
+            streaming: bool = False,
+            file_backed: bool = False,
+            encoding_profile: EncodingProfile | None = None,
+            silence_tolerance: int = 0,
     ) -> None:
         """
         :param segment_duration: Продолжительность сегмента в секундах
@@ -67,15 +105,31 @@ class FFMpegAudioSplitter(AudioSplitter):
         :param segment_format: Формат сегмента
         :param temp_dir: Директория для временных файлов обработки, по умолчанию текущая
         :param prefix: Уникальный префикс для временных файлов
+        :param streaming: Подавать вход в FFmpeg через stdin без записи во временный файл
+        :param file_backed: Отдавать сегменты-файлы (FileAudioSegment) вместо байтов,
+        удаление файла сегмента становится ответственностью получателя
+        :param encoding_profile: Профиль кодирования сегментов (формат, кодек, каналы,
+        частота дискретизации), если передан - переопределяет segment_format.
+        По умолчанию PCM 16-bit стерео 44.1 kHz в формате segment_format
+        :param silence_tolerance: Допустимое смещение границы сегмента в секундах
+        для привязки к ближайшей паузе, 0 - резать строго каждые segment_duration
         """
 
+        if encoding_profile is None:
+            encoding_profile = EncodingProfile(
+                format=segment_format, codec="pcm_s16le", channels=2, samplerate=44100
+            )
         super().__init__(
             segment_duration=segment_duration,
             segment_overlap=segment_overlap,
-            segment_format=segment_format
+            segment_format=encoding_profile.format
         )
+        self._encoding_profile = encoding_profile
         self._temp_dir = temp_dir
         self._prefix = prefix or uuid4()
+        self._streaming = streaming
+        self._file_backed = file_backed
+        self._silence_tolerance = silence_tolerance
 
     @property
     def _ffmpeg_output_pattern(self) -> str:
@@ -83,36 +137,59 @@ class FFMpegAudioSplitter(AudioSplitter):
         return f"{self._prefix}_segment_%03d.{self._segment_format}"
 
     @asynccontextmanager
-    async def _ffmpeg_pipe(self, input_path: Path):
+    async def _ffmpeg_pipe(
+            self,
+            output_dir: Path,
+            input_path: Path | None = None,
+            cuts: list[SegmentCut] | None = None,
+    ):
         """Создание асинхронного процесса для потоковой работы с FFMpeg.
 
+        FFmpeg пишет в stdout строку о каждом закрытом сегменте (segment list),
+        что позволяет отдавать сегменты, не дожидаясь завершения процесса.
+
+        :param output_dir: Директория для выходных сегментов.
         :param input_path: Путь до файла, который нужно разбить на чанки.
+        Если не передан, то FFmpeg читает вход из stdin.
+        :param cuts: Запланированные точки разреза, если не переданы -
+        разрез каждые segment_duration секунд.
         """
 
+        if cuts:
+            segment_boundaries = ["-segment_times", ",".join(f"{cut['time']}" for cut in cuts)]
+        else:
+            segment_boundaries = ["-segment_time", f"{self._segment_duration}"]
+
         ffmpeg_command = [
             "ffmpeg",
             "-y",  # Перезапись выхода
             "-i",
-            f"{input_path}",
+            "pipe:0" if input_path is None else f"{input_path}",
             "-f",
             "segment",
-            "-segment_time",
-            f"{self._segment_duration}",
+            *segment_boundaries,
+            "-segment_list",
+            "pipe:1",  # Сообщение о каждом закрытом сегменте в stdout
+            "-segment_list_type",
+            "csv",  # Формат строки: имя файла,начало,конец
             "-c:a",
-            "pcm_s16le",  # Кодирование в WAV (PCM 16-bit)
+            self._encoding_profile.codec,
             "-ac",
-            "2",  # 2 канала (стерео)
+            f"{self._encoding_profile.channels}",  # Понижающее сведение каналов
             "-ar",
-            "44100",  # Частота дискретизации 44.1 kHz
+            f"{self._encoding_profile.samplerate}",  # Передискретизация
             "-reset_timestamps",
             "1",
             "-map",
             "0:a",  # Только аудио
-            self._ffmpeg_output_pattern,
+            f"{output_dir / self._ffmpeg_output_pattern}",
         ]
         logger.info("FFmpeg launch command: %s", " ".join(ffmpeg_command))
         process = await asyncio.create_subprocess_exec(
-            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *ffmpeg_command,
+            stdin=asyncio.subprocess.PIPE if input_path is None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
         try:
             yield process
@@ -139,7 +216,7 @@ class FFMpegAudioSplitter(AudioSplitter):
         async with aiofiles.tempfile.NamedTemporaryFile(
             mode="wb+",
             suffix=f".{extension}",
-            prefix=self._prefix,
+            prefix=f"{self._prefix}",
             dir=self._temp_dir,
             delete=False
         ) as temp_file:
@@ -147,58 +224,275 @@ class FFMpegAudioSplitter(AudioSplitter):
                 await temp_file.write(chunk)
             return Path(temp_file.name)
 
+    @staticmethod
+    async def _feed_stdin(
+            process: asyncio.subprocess.Process, stream: AsyncIterable[bytes]
+    ) -> None:
+        """Подаёт входной поток в stdin FFmpeg по мере поступления данных.
+
+        :param process: Запущенный процесс FFmpeg.
+        :param stream: Поток аудио байтов.
+        """
+
+        try:
+            async for chunk in stream:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning("FFmpeg closed stdin before the input stream was fully consumed")
+        finally:
+            process.stdin.close()
+            with suppress(BrokenPipeError, ConnectionResetError):
+                await process.stdin.wait_closed()
+
+    @staticmethod
+    async def _drain_stderr(process: asyncio.subprocess.Process, tail: deque[str]) -> None:
+        """Вычитывает stderr FFmpeg, чтобы процесс не блокировался на переполненном pipe.
+        Последние строки сохраняются для сообщения об ошибке.
+        """
+
+        async for line in process.stderr:
+            tail.append(line.decode(errors="replace"))
+
+    async def _analyze_powers(self, input_path: Path) -> np.ndarray:
+        """Быстрый проход по декодированному в 8 kHz моно PCM для поиска пауз.
+
+        :param input_path: Путь до входного файла.
+        :returns: Мощность 20 мс фреймов записи.
+        """
+
+        ffmpeg_command = [
+            "ffmpeg",
+            "-i",
+            f"{input_path}",
+            "-map",
+            "0:a",
+            "-ac",
+            "1",
+            "-ar",
+            f"{VAD_SAMPLERATE}",
+            "-f",
+            "s16le",
+            "pipe:1",
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_SIZE)
+        drain_task = asyncio.create_task(self._drain_stderr(process, stderr_tail))
+        frame_bytes = VAD_FRAME_SIZE * VAD_SAMPLE_WIDTH
+        powers: list[np.ndarray] = []
+        remainder = b""
+        try:
+            while chunk := await process.stdout.read(ANALYSIS_CHUNK_SIZE):
+                buffer = remainder + chunk
+                size = len(buffer) - len(buffer) % frame_bytes
+                powers.append(frame_powers(np.frombuffer(buffer[:size], dtype="<i2")))
+                remainder = buffer[size:]
+            await drain_task
+        finally:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            drain_task.cancel()
+        if process.returncode != 0:
+            error_message = "".join(stderr_tail)
+            logger.error("FFmpeg silence analysis failed with error: %s", error_message)
+            raise AudioSplittingError(
+                f"FFmpeg silence analysis failed with error: {error_message}"
+            )
+        return np.concatenate(powers) if powers else np.empty(0, dtype=np.float32)
+
+    async def _overlap(
+            self,
+            filepath: Path,
+            next_filepath: Path,
+            number: int,
+            cuts: list[SegmentCut] | None = None,
+    ) -> float:
+        """Перекрытие сегмента началом следующего, если граница между ними не в паузе.
+
+        :returns: Продолжительность добавленного перекрытия в секундах.
+        """
+
+        if self._segment_overlap <= 0:
+            return 0.0
+        if cuts is not None and number <= len(cuts) and cuts[number - 1]["silent"]:
+            return 0.0
+        if self._segment_format != AudioFormat.WAV:
+            logger.debug("Segment overlap is supported only for WAV segments, skipping")
+            return 0.0
+        return await asyncio.to_thread(
+            append_wav_head, filepath, next_filepath, self._segment_overlap
+        )
+
+    def _read_segment(
+            self,
+            filepath: Path,
+            duration: int,
+            number: int,
+            metadata: dict[str, Any],
+            is_last: bool = False,
+            offset: float | None = None,
+            overlap: float = 0,
+    ) -> AudioSegment | FileAudioSegment:
+        """Чтение закрытого FFmpeg сегмента с диска.
+
+        Продолжительность берётся из segment list FFmpeg: не все контейнеры
+        (например, FLAC внутри segment муксера) получают корректную длину в заголовке.
+        """
+
+        try:
+            audioinfo = extract_wav_info(filepath)
+        except UnsupportedAudioError:
+            audioinfo = extract_audio_info(filepath)
+        segment_info = {
+            "number": number,
+            "total_count": number if is_last else None,
+            "format": self._segment_format,
+            "duration": duration,
+            "samplerate": audioinfo["samplerate"],
+            "channels": audioinfo["channels"],
+            "offset": offset,
+            "overlap": overlap,
+            "metadata": metadata.copy(),
+        }
+        if self._file_backed:
+            size = filepath.stat().st_size
+            return FileAudioSegment(**segment_info, filepath=self._detach(filepath), size=size)
+        content = filepath.read_bytes()
+        return AudioSegment(**segment_info, content=content, size=len(content))
+
+    def _detach(self, filepath: Path) -> Path:
+        """Перенос файла сегмента из рабочей директории FFmpeg (без копирования данных),
+        чтобы файл пережил очистку и перешёл во владение получателя сегмента.
+        """
+
+        fd, detached_path = tempfile.mkstemp(
+            suffix=filepath.suffix, prefix=f"{filepath.stem}_", dir=self._temp_dir
+        )
+        os.close(fd)
+        os.replace(filepath, detached_path)
+        return Path(detached_path)
+
     async def _iter_segments(
-            self, metadata: dict[str, Any] | None = None
-    ) -> AsyncIterator[AudioSegment]:
+            self,
+            process: asyncio.subprocess.Process,
+            output_dir: Path,
+            metadata: dict[str, Any] | None = None,
+            cuts: list[SegmentCut] | None = None,
+    ) -> AsyncIterator[AudioSegment | FileAudioSegment]:
+        """Выдаёт сегменты по мере того как FFmpeg сообщает об их закрытии.
+
+        Сегмент отдаётся как только закрыт следующий за ним (или FFmpeg завершился),
+        так у последнего сегмента становится известно общее количество сегментов,
+        а к сегменту можно дописать перекрытие из начала следующего.
+        """
+
         metadata = metadata or {}
-        files = sorted(
-            glob.glob(self._ffmpeg_output_pattern.replace("%03d", "*")),
-            key=lambda x: int(
-                re.search(rf"{self._prefix}_segment_(\d+)\.{self._segment_format}", x).group(1)
-            ),
-        )
-        for index, filepath in enumerate(files):
-            audioinfo = get_audio_info(Path(filepath))
-            async with aiofiles.open(filepath, mode="rb") as file:
-                content = await file.read()
-            yield AudioSegment(
-                number=index + 1,
-                total_count=len(files),
-                content=content,
-                format=self._segment_format,
-                size=len(content),
-                duration=audioinfo["duration"],
-                samplerate=audioinfo["samplerate"],
-                channels=audioinfo["channels"],
-                metadata=metadata.copy(),
+        pending: tuple[Path, float, float] | None = None
+        number = 0
+        async for line in process.stdout:
+            filename, *times = line.decode().strip().split(",")
+            if not filename:
+                continue
+            filepath = output_dir / filename
+            if pending is not None:
+                number += 1
+                pending_path, offset, duration = pending
+                overlap = await self._overlap(pending_path, filepath, number, cuts)
+                yield await asyncio.to_thread(
+                    self._read_segment,
+                    pending_path,
+                    math.floor(duration + overlap),
+                    number,
+                    metadata,
+                    offset=offset,
+                    overlap=overlap,
+                )
+                if not self._file_backed:
+                    self._unlink(pending_path)
+            start, end = map(float, times)
+            pending = filepath, start, end - start
+        if await process.wait() != 0:
+            return
+        if pending is not None:
+            number += 1
+            pending_path, offset, duration = pending
+            yield await asyncio.to_thread(
+                self._read_segment,
+                pending_path,
+                math.floor(duration),
+                number,
+                metadata,
+                is_last=True,
+                offset=offset,
             )
-            try:
-                os.unlink(filepath)
-                logger.debug("File %s unlinked successfully", filepath)
-            except OSError:
-                logger.exception("Error occurred while unlinking file %s", filepath)
+            if not self._file_backed:
+                self._unlink(pending_path)
+
+    @staticmethod
+    def _unlink(filepath: Path) -> None:
+        try:
+            os.unlink(filepath)
+            logger.debug("File %s unlinked successfully", filepath)
+        except OSError:
+            logger.exception("Error occurred while unlinking file %s", filepath)
 
     async def split_stream(
             self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
-    ) -> AsyncIterator[AudioSegment]:
+    ) -> AsyncIterator[AudioSegment | FileAudioSegment]:
         """Потоковое разделение аудио на чанки с переконвертацией.
 
+        Сегменты отдаются по мере того как FFmpeg их закрывает, параллельно
+        с кодированием следующих сегментов.
+
         :param stream: Поток байтов аудио записи.
         :param metadata: Дополнительные данные, которые нужно передать в контекст чанков.
         :returns: Генератор аудио сегментов.
         """
 
-        input_path = await self._write_input_file(stream)
-        async with self._ffmpeg_pipe(input_path) as pipe:
-            _, stderr = await pipe.communicate()
-            if pipe.returncode != 0:
-                error_message = stderr.decode()
-                logger.error("FFmpeg process failed with error: %s", error_message)
-                raise AudioSplittingError(f"FFmpeg process failed with error: {error_message}")
-            async for segment in self._iter_segments(metadata):
-                yield segment
+        silence_aware = self._silence_tolerance > 0
+        input_path = (
+            await self._write_input_file(stream)
+            if not self._streaming or silence_aware
+            else None
+        )
+        output_dir = Path(tempfile.mkdtemp(prefix=f"{self._prefix}_", dir=self._temp_dir))
+        stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_SIZE)
         try:
-            os.unlink(input_path)
-            logger.debug("Input file %s unlinked successfully", input_path)
-        except OSError:
-            logger.exception("Error occurred while unlinking input file %s", input_path)
+            cuts: list[SegmentCut] | None = None
+            if silence_aware:
+                powers = await self._analyze_powers(input_path)
+                cuts = await asyncio.to_thread(
+                    plan_segment_cuts, powers, self._segment_duration, self._silence_tolerance
+                )
+                logger.info(
+                    "Planned %s segment cuts, %s of them in silence",
+                    len(cuts), sum(cut["silent"] for cut in cuts),
+                )
+            async with self._ffmpeg_pipe(output_dir, input_path, cuts) as pipe:
+                tasks = [asyncio.create_task(self._drain_stderr(pipe, stderr_tail))]
+                if input_path is None:
+                    tasks.append(asyncio.create_task(self._feed_stdin(pipe, stream)))
+                try:
+                    async for segment in self._iter_segments(
+                            pipe, output_dir, metadata, cuts
+                    ):
+                        yield segment
+                    await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                        with suppress(asyncio.CancelledError):
+                            await task
+                if pipe.returncode != 0:
+                    error_message = "".join(stderr_tail)
+                    logger.error("FFmpeg process failed with error: %s", error_message)
+                    raise AudioSplittingError(
+                        f"FFmpeg process failed with error: {error_message}"
+                    )
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            if input_path is not None:
+                self._unlink(input_path)
@@ -1,14 +1,16 @@
-from typing import TypedDict
+from typing import BinaryIO, TypedDict
 
 import io
 import math
+import os
+import struct
 from pathlib import Path
 
 import mutagen
 import soundfile as sf
-from pedalboard import Compressor, Gain, LowShelfFilter, NoiseGate, Pedalboard
 
 from ..domain import AudioFormat, UnsupportedAudioError
+from .enhancement import DEFAULT_ENHANCEMENT_PROFILE, get_enhancement_board
 
 
 class AudioInfo(TypedDict):
@@ -35,30 +37,171 @@ def extract_audio_info(filepath: Path) -> AudioInfo:
         raise UnsupportedAudioError(f"Audio file is not supported or damaged: {filepath}")
     return {
         "duration": math.floor(audio.info.length),
-        "samplerate": audio.info.sample_rate,
+        # Opus не хранит исходную частоту, декодирование всегда идёт в 48 kHz
+        "samplerate": getattr(audio.info, "sample_rate", OPUS_SAMPLERATE),
         "channels": audio.info.channels,
-        "bitrate": audio.info.bitrate,
+        "bitrate": getattr(audio.info, "bitrate", 0),
     }
 
 
-def enhance_sound_quality(audio: bytes, output_format: AudioFormat = "wav") -> tuple[bytes, int]:
+class WavInfo(AudioInfo):
+    """Информация о WAV (RIFF) файле
+
+    Attributes:
+        bits_per_sample: Разрядность сэмпла
+        data_offset: Смещение начала PCM данных в байтах
+        data_size: Размер PCM данных в байтах
+    """
+
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
+
+
+WAV_FORMAT_PCM = 0x0001
+WAV_FORMAT_EXTENSIBLE = 0xFFFE
+RIFF_HEADER_SIZE = 12
+RIFF_CHUNK_HEADER_SIZE = 8
+
+OPUS_SAMPLERATE = 48000
+
+ENHANCEMENT_BLOCK_SIZE = 65536  # Фреймов, ~1.5 сек при 44.1 kHz
+
+
+def extract_wav_info(filepath: Path) -> WavInfo:
+    """Получение информации о PCM WAV файле чтением RIFF заголовка без внешних процессов.
+
+    :param filepath: Путь до WAV файла.
+    :returns: Информация об аудио + расположение PCM данных в файле.
+    :raises UnsupportedAudioError: Файл не является PCM WAV.
+    """
+
+    filesize = os.path.getsize(filepath)
+    with open(filepath, mode="rb") as file:
+        riff_header = file.read(RIFF_HEADER_SIZE)
+        if riff_header[:4] != b"RIFF" or riff_header[8:RIFF_HEADER_SIZE] != b"WAVE":
+            raise UnsupportedAudioError(f"File is not a RIFF/WAVE file: {filepath}")
+        fmt: tuple[int, ...] | None = None
+        while chunk_header := file.read(RIFF_CHUNK_HEADER_SIZE):
+            if len(chunk_header) < RIFF_CHUNK_HEADER_SIZE:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                # format, channels, samplerate, byterate, block_align, bits_per_sample
+                fmt = struct.unpack("<HHIIHH", file.read(16))
+                file.seek(chunk_size - 16 + chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    break
+                audio_format, channels, samplerate, byterate, _, bits_per_sample = fmt
+                if audio_format not in {WAV_FORMAT_PCM, WAV_FORMAT_EXTENSIBLE} or not byterate:
+                    break
+                data_offset = file.tell()
+                # При записи в pipe размер data чанка может быть не заполнен
+                data_size = min(chunk_size, filesize - data_offset)
+                return {
+                    "duration": math.floor(data_size / byterate),
+                    "samplerate": samplerate,
+                    "channels": channels,
+                    "bitrate": byterate * 8,
+                    "bits_per_sample": bits_per_sample,
+                    "data_offset": data_offset,
+                    "data_size": data_size,
+                }
+            else:
+                file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    raise UnsupportedAudioError(f"WAV file is not PCM encoded or damaged: {filepath}")
+
+
+def append_wav_head(filepath: Path, source_filepath: Path, duration: float) -> float:
+    """Дописывает в конец PCM WAV файла начало другого PCM WAV файла с тем же форматом.
+
+    Используется для перекрытия (overlap) соседних сегментов без повторного кодирования.
+    Ожидается, что data чанк последний в файле (так пишет FFmpeg).
+
+    :param filepath: Путь до WAV файла, который нужно дополнить.
+    :param source_filepath: Путь до WAV файла, из начала которого берутся данные.
+    :param duration: Продолжительность дописываемого фрагмента в секундах.
+    :returns: Фактически дописанная продолжительность в секундах.
+    :raises UnsupportedAudioError: Файлы не являются PCM WAV одного формата.
+    """
+
+    target_info, source_info = extract_wav_info(filepath), extract_wav_info(source_filepath)
+    audio_format = ("samplerate", "channels", "bits_per_sample")
+    if any(target_info[key] != source_info[key] for key in audio_format):
+        raise UnsupportedAudioError(
+            f"WAV files {filepath} and {source_filepath} have different formats"
+        )
+    byterate = target_info["bitrate"] // 8
+    block_align = target_info["channels"] * target_info["bits_per_sample"] // 8
+    size = min(round(duration * target_info["samplerate"]) * block_align, source_info["data_size"])
+    with open(source_filepath, mode="rb") as source:
+        source.seek(source_info["data_offset"])
+        head = source.read(size)
+    data_size = target_info["data_size"] + len(head)
+    with open(filepath, mode="r+b") as file:
+        file.seek(target_info["data_offset"] + target_info["data_size"])
+        file.write(head)
+        file.truncate()
+        file.seek(4)
+        file.write(struct.pack("<I", target_info["data_offset"] + data_size - 8))
+        file.seek(target_info["data_offset"] - 4)
+        file.write(struct.pack("<I", data_size))
+    return len(head) / byterate
+
+
+def enhance_sound_quality_stream(
+        source: Path | BinaryIO,
+        destination: Path | BinaryIO,
+        output_format: AudioFormat = "wav",
+        block_size: int = ENHANCEMENT_BLOCK_SIZE,
+        profile: str = DEFAULT_ENHANCEMENT_PROFILE,
+) -> int:
+    """Потоковое улучшение качества звука блоками фиксированного размера.
+
+    Запись читается блоками float32 и пропускается через одну и ту же цепочку эффектов
+    без сброса её состояния, поэтому результат совпадает с обработкой всей записи,
+    а потребление памяти не зависит от её длительности.
+
+    :param source: Путь или файловый объект исходной аудио записи.
+    :param destination: Путь или файловый объект для обработанной аудио записи.
+    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
+    :param block_size: Размер блока в фреймах.
+    :param profile: Название профиля улучшения звука.
+    :returns: Частота дискретизации обработанной аудио записи.
+    """
+
+    with sf.SoundFile(source) as input_file:
+        samplerate = input_file.samplerate
+        board = get_enhancement_board(profile)
+        board.reset()  # Цепочка переиспользуется между записями
+        with sf.SoundFile(
+                destination,
+                mode="w",
+                samplerate=samplerate,
+                channels=input_file.channels,
+                format=output_format,
+        ) as output_file:
+            for block in input_file.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+                output_file.write(board(block, samplerate, reset=False))
+    return samplerate
+
+
+def enhance_sound_quality(
+        audio: bytes,
+        output_format: AudioFormat = "wav",
+        profile: str = DEFAULT_ENHANCEMENT_PROFILE,
+) -> tuple[bytes, int]:
     """Улучшение качества звука используя технологии Spotify.
 
     :param audio: Байты аудио записи.
     :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
+    :param profile: Название профиля улучшения звука.
     :returns: Байты обработанной аудио записи + частота дискретизации.
     """
 
-    with io.BytesIO(audio) as stream:
-        content, samplerate = sf.read(stream)
-    board = Pedalboard([
-        NoiseGate(threshold_db=-30, ratio=1.5, release_ms=250),
-        Compressor(threshold_db=-16, ratio=4, attack_ms=5, release_ms=100),
-        LowShelfFilter(cutoff_frequency_hz=400, gain_db=8, q=1),
-        Gain(gain_db=2)
-    ])
-    effected = board(content, samplerate)
-    with io.BytesIO(effected) as stream:
-        sf.write(stream, content, samplerate, format=output_format)
-        stream.seek(0)
-        return stream.read(), samplerate
+    with io.BytesIO(audio) as source, io.BytesIO() as destination:
+        samplerate = enhance_sound_quality_stream(
+            source, destination, output_format, profile=profile
+        )
+        return destination.getvalue(), samplerate
@@ -0,0 +1,107 @@
+from typing import Any
+
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+import pedalboard
+from pedalboard import Pedalboard, Plugin
+
+from ..domain import UnsupportedAudioError
+
+logger = logging.getLogger(__name__)
+
+type PluginSpec = dict[str, Any]
+"""Описание эффекта: название класса Pedalboard в ключе `plugin` и его параметры"""
+
+DEFAULT_ENHANCEMENT_PROFILE = "speech-default"
+
+# Профили улучшения звука для разных источников записи
+ENHANCEMENT_PROFILES: dict[str, list[PluginSpec]] = {
+    "speech-default": [
+        {"plugin": "NoiseGate", "threshold_db": -30, "ratio": 1.5, "release_ms": 250},
+        {
+            "plugin": "Compressor",
+            "threshold_db": -16,
+            "ratio": 4,
+            "attack_ms": 5,
+            "release_ms": 100,
+        },
+        {"plugin": "LowShelfFilter", "cutoff_frequency_hz": 400, "gain_db": 8, "q": 1},
+        {"plugin": "Gain", "gain_db": 2},
+    ],
+    "phone-line": [
+        {"plugin": "HighpassFilter", "cutoff_frequency_hz": 300},
+        {"plugin": "LowpassFilter", "cutoff_frequency_hz": 3400},
+        {"plugin": "NoiseGate", "threshold_db": -35, "ratio": 2, "release_ms": 200},
+        {
+            "plugin": "Compressor",
+            "threshold_db": -20,
+            "ratio": 6,
+            "attack_ms": 3,
+            "release_ms": 80,
+        },
+        {"plugin": "Gain", "gain_db": 4},
+    ],
+}
+
+
+def _build_plugin(spec: PluginSpec) -> Plugin:
+    params = dict(spec)
+    name = params.pop("plugin")
+    plugin_class = getattr(pedalboard, name, None)
+    if not isinstance(plugin_class, type) or not issubclass(plugin_class, Plugin):
+        raise UnsupportedAudioError(
+            f"Unknown enhancement plugin '{name}'", details={"plugin": name}
+        )
+    return plugin_class(**params)
+
+
+def register_enhancement_profile(name: str, plugins: list[PluginSpec]) -> None:
+    """Регистрирует (или переопределяет) профиль улучшения звука.
+
+    :param name: Название профиля, например 'speech-default'.
+    :param plugins: Цепочка эффектов в порядке применения.
+    """
+
+    for spec in plugins:
+        _build_plugin(spec)  # Проверка описания до регистрации
+    ENHANCEMENT_PROFILES[name] = plugins
+    get_enhancement_board.cache_clear()
+
+
+def load_enhancement_profiles(filepath: Path | None) -> None:
+    """Загружает профили улучшения звука из JSON файла вида {"<profile>": [<plugin>, ...]}.
+
+    Используется в том числе как инициализатор процессов пула обработки.
+
+    :param filepath: Путь до JSON файла с профилями, если не указан - остаются встроенные.
+    """
+
+    if filepath is None:
+        return
+    profiles: dict[str, list[PluginSpec]] = json.loads(Path(filepath).read_text(encoding="utf-8"))
+    for name, plugins in profiles.items():
+        register_enhancement_profile(name, plugins)
+    logger.info("Loaded %s enhancement profiles from %s", len(profiles), filepath)
+
+
+@lru_cache(maxsize=32)
+def get_enhancement_board(profile: str) -> Pedalboard:
+    """Возвращает цепочку эффектов профиля, создавая её один раз на процесс.
+
+    Цепочка хранит состояние эффектов, поэтому перед обработкой новой записи
+    её нужно сбросить через `board.reset()`. Частота дискретизации передаётся
+    при каждом вызове цепочки, поэтому одна цепочка подходит для любых записей.
+
+    :param profile: Название профиля улучшения звука.
+    :returns: Закешированная цепочка эффектов.
+    """
+
+    if profile not in ENHANCEMENT_PROFILES:
+        raise UnsupportedAudioError(
+            f"Unknown enhancement profile '{profile}'",
+            details={"profile": profile, "available": list(ENHANCEMENT_PROFILES)},
+        )
+    return Pedalboard([_build_plugin(spec) for spec in ENHANCEMENT_PROFILES[profile]])
@@ -0,0 +1,101 @@
+from typing import TypedDict
+
+import numpy as np
+
+# Параметры декодирования для анализа энергии: речи достаточно 8 kHz моно
+VAD_SAMPLERATE = 8000
+VAD_FRAME_DURATION = 0.02  # 20 мс
+VAD_FRAME_SIZE = int(VAD_SAMPLERATE * VAD_FRAME_DURATION)
+VAD_SAMPLE_WIDTH = 2  # PCM 16-bit
+INT16_FULL_SCALE = 32768.0
+
+MIN_SILENCE_DURATION = 0.3  # Минимальная длительность паузы между словами в секундах
+SILENCE_MARGIN_DB = 6.0  # Запас над уровнем шума, ниже которого звук считается тишиной
+NOISE_FLOOR_PERCENTILE = 10
+SPEECH_LEVEL_PERCENTILE = 90
+SPEECH_DYNAMIC_RANGE_DB = 20.0  # Минимальный запас тишины ниже уровня речи
+POWER_EPSILON = 1e-10  # Защита от log10(0) на цифровой тишине
+
+
+class SegmentCut(TypedDict):
+    """Точка разреза аудио записи
+
+    Attributes:
+        time: Время разреза от начала записи в секундах
+        silent: Попадает ли разрез в паузу (если нет - нужен overlap)
+    """
+
+    time: float
+    silent: bool
+
+
+def frame_powers(samples: np.ndarray, frame_size: int = VAD_FRAME_SIZE) -> np.ndarray:
+    """Средняя мощность каждого полного фрейма PCM 16-bit сигнала.
+
+    :param samples: Сэмплы моно сигнала (int16), длина кратна frame_size.
+    :param frame_size: Количество сэмплов во фрейме.
+    :returns: Мощность фреймов относительно полной шкалы (0..1).
+    """
+
+    frames = samples[: len(samples) - len(samples) % frame_size].reshape(-1, frame_size)
+    normalized = frames.astype(np.float32) / INT16_FULL_SCALE
+    return np.mean(normalized * normalized, axis=1)
+
+
+def _detect_silent_frames(powers: np.ndarray, window: int) -> np.ndarray:
+    """Маска фреймов, средняя мощность которых на окне из `window` фреймов ниже порога"""
+
+    smoothed = np.convolve(powers, np.full(window, 1 / window), mode="same")
+    levels = 10 * np.log10(smoothed + POWER_EPSILON)
+    noise_floor, speech_level = np.percentile(
+        levels, [NOISE_FLOOR_PERCENTILE, SPEECH_LEVEL_PERCENTILE]
+    )
+    threshold = min(noise_floor + SILENCE_MARGIN_DB, speech_level - SPEECH_DYNAMIC_RANGE_DB)
+    return levels <= threshold
+
+
+def plan_segment_cuts(
+        powers: np.ndarray,
+        segment_duration: float,
+        tolerance: float,
+        frame_duration: float = VAD_FRAME_DURATION,
+        min_silence_duration: float = MIN_SILENCE_DURATION,
+) -> list[SegmentCut]:
+    """Планирование точек разреза с привязкой к ближайшей паузе.
+
+    Каждая точка разреза ищется в окне `±tolerance` вокруг целевой границы сегмента
+    среди фреймов, средняя мощность которых на интервале `min_silence_duration`
+    не превышает уровень шума записи + SILENCE_MARGIN_DB (но не выше уровня речи
+    - SPEECH_DYNAMIC_RANGE_DB, на случай записей почти без пауз). Если пауза не найдена,
+    разрез делается по целевой границе и помечается как `silent=False`.
+
+    :param powers: Мощность фреймов записи, см. `frame_powers`.
+    :param segment_duration: Целевая продолжительность сегмента в секундах.
+    :param tolerance: Допустимое отклонение разреза от целевой границы в секундах.
+    :param frame_duration: Длительность фрейма в секундах.
+    :param min_silence_duration: Минимальная длительность паузы в секундах.
+    :returns: Точки разреза по возрастанию (без начала и конца записи).
+    """
+
+    if powers.size == 0:
+        return []
+    total_duration = powers.size * frame_duration
+    silent_frames = _detect_silent_frames(
+        powers, max(1, round(min_silence_duration / frame_duration))
+    )
+    cuts: list[SegmentCut] = []
+    start = 0.0
+    while total_duration - start > segment_duration:
+        target = start + segment_duration
+        # Разрез не может уйти раньше начала текущего сегмента
+        low = int(max(target - tolerance, start + frame_duration) / frame_duration)
+        high = int(min(target + tolerance, total_duration) / frame_duration)
+        candidates = np.flatnonzero(silent_frames[low:high]) + low
+        if candidates.size > 0:
+            nearest = candidates[np.argmin(np.abs(candidates * frame_duration - target))]
+            cut = SegmentCut(time=round(float(nearest) * frame_duration, 3), silent=True)
+        else:
+            cut = SegmentCut(time=round(target, 3), silent=False)
+        cuts.append(cut)
+        start = cut["time"]
+    return cuts
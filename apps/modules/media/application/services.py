@@ -55,7 +55,7 @@ class MediaService:
         return file_metadata
 
     async def download_file(self, query: DownloadFileQuery) -> AsyncIterator[FilePart]:
-        file_metadata = self.get_file_metadata(query.file_id)
+        file_metadata = await self.get_file_metadata(query.file_id)
         async for file_part in self._storage.download_multipart(
             filepath=file_metadata.filepath, part_size=query.chunk_size
         ):
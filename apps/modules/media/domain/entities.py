@@ -1,11 +1,12 @@
 from typing import Self
 
 import math
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from pydantic import Field, NonPositiveInt, PositiveInt
+from pydantic import Field, PositiveInt
 
 from modules.shared_kernel.domain import Entity
 from modules.shared_kernel.utils import current_datetime
@@ -33,18 +34,40 @@ class File(Entity):
     uploaded_at: datetime = Field(default_factory=current_datetime)
 
 
-class FilePart(File):
-    """Файловый объект для добавления файла по частям (Multipart upload)
+@dataclass(frozen=True, slots=True)
+class FilePart:
+    """Часть файла для потоковой загрузки и скачивания по частям (Multipart upload).
+
+    Обычный slotted dataclass вместо pydantic сущности: файл в несколько GB проходит
+    через хранилище сотнями частей, а путь и MIME-тип уже проверены один раз на файл
+    (FileMetadata или ответ хранилища). Контент не копируется, часть держит
+    memoryview на буфер и своё смещение в файле.
 
     Attributes:
-        number: Номер чанка файла.
+        path: Путь до файла в системе (s3, local, http, ...)
+        mime_type: MIME-тип файла.
+        number: Номер части файла (начиная с 1).
+        offset: Смещение части от начала файла в байтах.
+        content: Содержимое части.
         total_size: Общий объём полного файла.
         total_parts: Общее количество частей.
+        uploaded_at: Дата и время загрузки файла.
     """
 
-    number: NonPositiveInt
-    total_size: PositiveInt
-    total_parts: PositiveInt
+    path: Filepath
+    mime_type: MimeType
+    number: int
+    offset: int
+    content: memoryview
+    total_size: int
+    total_parts: int
+    uploaded_at: datetime
+
+    @property
+    def size(self) -> int:
+        """Размер части в байтах"""
+
+        return self.content.nbytes
 
     @property
     def is_last(self) -> bool:
@@ -57,8 +80,7 @@ class FilePart(File):
         """Процент выполнения загрузки файла"""
 
         if self.total_size > 0:
-            uploaded = self.number * self.size
-            return (uploaded / self.total_size) * 100
+            return min((self.offset + self.size) / self.total_size, 1.0) * 100
         return 0.0
 
 
@@ -151,33 +173,47 @@ class FileMetadata(Entity):
         """
 
         total_parts = math.ceil(self.filesize / min_part_size)
-        part_number = 1
-        buffer = b""
-        async for chunk in file_stream:
-            buffer += chunk
-            while len(buffer) >= min_part_size:
-                content_part = buffer[:min_part_size]
-                buffer = buffer[min_part_size:]
-                yield FilePart(
-                    number=part_number,
-                    total_size=self.filesize,
-                    total_parts=total_parts,
-                    path=self.filepath,
-                    size=len(content_part),
-                    mime_type=self.mime_type,
-                    content=content_part,
-                    uploaded_at=self.uploaded_at,
-                )
+        part_number, offset = 0, 0
+        async for content_part in assemble_parts(file_stream, min_part_size):
             part_number += 1
-        # Отправка оставшихся данных (последняя часть может быть меньше min_part_size)
-        if buffer:
             yield FilePart(
+                path=self.filepath,
+                mime_type=self.mime_type,
                 number=part_number,
+                offset=offset,
+                content=memoryview(content_part),
                 total_size=self.filesize,
                 total_parts=total_parts,
-                path=self.filepath,
-                size=self.filesize,
-                mime_type=self.mime_type,
-                content=buffer,
                 uploaded_at=self.uploaded_at,
             )
+            offset += len(content_part)
+
+
+async def assemble_parts(
+        stream: AsyncIterable[bytes], part_size: int
+) -> AsyncIterator[bytes]:
+    """Сборка частей ровно по `part_size` байт из потока чанков произвольного размера.
+
+    Чанки не склеиваются в промежуточный буфер: накапливаются memoryview на них,
+    а часть собирается одним `b"".join`, поэтому каждый байт копируется ровно один раз.
+    Последняя часть может быть меньше `part_size`.
+
+    :param stream: Байтовый поток, например тело HTTP запроса.
+    :param part_size: Размер части в байтах.
+    """
+
+    pieces: list[memoryview] = []
+    buffered = 0
+    async for chunk in stream:
+        view = memoryview(chunk)
+        while buffered + len(view) >= part_size:
+            head, view = view[:part_size - buffered], view[part_size - buffered:]
+            pieces.append(head)
+            yield b"".join(pieces)
+            pieces.clear()
+            buffered = 0
+        if view:
+            pieces.append(view)
+            buffered += len(view)
+    if buffered:
+        yield b"".join(pieces)
@@ -0,0 +1,42 @@
+from collections.abc import AsyncIterator
+
+from dishka import Provider, Scope, provide
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.dev import settings
+from modules.shared_kernel.application import UnitOfWork
+
+from ..application import FileMetaRepository, MediaService, RemoteStorage, Storage
+from .database import SQLAlchemyFileMetaRepository
+from .storage import S3Storage
+
+
+class MediaProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def provide_remote_storage(self) -> AsyncIterator[RemoteStorage]:  # noqa: PLR6301
+        # Один клиент S3 с пулом соединений на процесс, закрывается вместе с контейнером
+        async with S3Storage(
+            endpoint_url=settings.minio.url,
+            access_key=settings.minio.user,
+            secret_key=settings.minio.password,
+            bucket=settings.minio.bucket,
+            upload_concurrency=settings.minio.upload_concurrency,
+            read_ahead=settings.minio.read_ahead,
+            max_pool_connections=settings.minio.max_pool_connections,
+            keepalive_timeout=settings.minio.keepalive_timeout,
+        ) as storage:
+            yield storage
+
+    @provide(scope=Scope.APP)
+    def provide_storage(self, storage: RemoteStorage) -> Storage:  # noqa: PLR6301
+        return storage
+
+    @provide(scope=Scope.REQUEST)
+    def provide_file_meta_repo(self, session: AsyncSession) -> FileMetaRepository:  # noqa: PLR6301
+        return SQLAlchemyFileMetaRepository(session)
+
+    @provide(scope=Scope.REQUEST)
+    def provide_media_service(  # noqa: PLR6301
+            self, uow: UnitOfWork, file_meta_repo: FileMetaRepository, storage: Storage
+    ) -> MediaService:
+        return MediaService(uow=uow, repository=file_meta_repo, storage=storage)
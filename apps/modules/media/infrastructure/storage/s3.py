@@ -1,9 +1,18 @@
+from typing import Any, Self
+
+import asyncio
+import io
 import logging
 import math
+import time
+from collections import deque
 from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from types import TracebackType
 
 from aiobotocore.client import AioBaseClient
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
 
@@ -17,9 +26,121 @@ from ...domain import File, FilePart, Filepath
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_READ_AHEAD = 4
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+
+
+@dataclass(slots=True)
+class TransferMetrics:
+    """Метрики передачи файла по частям
+
+    Attributes:
+        filepath: Путь до файла в хранилище
+        parts: Количество переданных частей
+        bytes: Количество переданных байт
+        started_at: Время начала передачи (time.monotonic)
+        finished_at: Время окончания передачи (time.monotonic)
+        wait_time: Суммарное время ожидания очередной части получателем в секундах
+    """
+
+    filepath: Filepath
+    parts: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+    wait_time: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Продолжительность передачи в секундах"""
+        finished_at = time.monotonic() if self.finished_at is None else self.finished_at
+        return finished_at - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Скорость передачи в байтах в секунду"""
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, float | int | str]:
+        return {
+            "filepath": self.filepath,
+            "parts": self.parts,
+            "bytes": self.bytes,
+            "elapsed": round(self.elapsed, 3),
+            "wait_time": round(self.wait_time, 3),
+            "throughput": round(self.throughput),
+        }
+
+
+@dataclass(slots=True)
+class _MultipartUpload:
+    """Состояние конвейерной multipart загрузки"""
+
+    id: str | None = None
+    filepath: Filepath | None = None
+    filesize: int | None = None
+    etags: dict[int, str] = field(default_factory=dict)
+    pending: set[asyncio.Task[tuple[int, str]]] = field(default_factory=set)
+
+    async def wait(self, return_when: str) -> None:
+        """Ожидание загружаемых частей, ошибка части пробрасывается"""
+        if not self.pending:
+            return
+        done, self.pending = await asyncio.wait(self.pending, return_when=return_when)
+        self.etags.update(task.result() for task in done)
+
+    async def cancel(self) -> None:
+        for task in self.pending:
+            task.cancel()
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        self.pending.clear()
+
+
+class _MemoryviewReader(io.RawIOBase):
+    """Файловый объект поверх memoryview: botocore не принимает memoryview как тело
+    запроса, а bytes(view) скопировал бы часть целиком ещё раз.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    # Методы интерфейса io.RawIOBase, поэтому остаются методами экземпляра
+    def readable(self) -> bool:  # noqa: PLR6301
+        return True
+
+    def seekable(self) -> bool:  # noqa: PLR6301
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        size = min(len(buffer), self._view.nbytes - self._position)
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._view.nbytes
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
 
 class S3Storage(RemoteStorage):
-    """Реализация S3 хранилища"""
+    """Реализация S3 хранилища
+
+    Хранилище держит один долгоживущий клиент с пулом соединений: его нужно открыть
+    через `connect()` (или `async with`) при старте процесса и закрыть через `close()`
+    при остановке. До открытия каждая операция создаёт собственный клиент.
+    """
 
     def __init__(
             self,
@@ -27,21 +148,81 @@ class S3Storage(RemoteStorage):
             access_key: str,
             secret_key: str,
             bucket: str,
-            use_ssl: bool = False
+            use_ssl: bool = False,
+            upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+            read_ahead: int = DEFAULT_READ_AHEAD,
+            max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+            keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
     ) -> None:
-        self.config: dict[str, str] = {
+        """
+        :param upload_concurrency: Максимальное количество одновременно загружаемых частей
+            при multipart загрузке. Память ограничена (upload_concurrency + 1) частями.
+        :param read_ahead: Количество частей, которые скачиваются заранее при multipart
+            скачивании. Память ограничена read_ahead частями.
+        :param max_pool_connections: Максимальное количество соединений в пуле клиента.
+        :param keepalive_timeout: Время жизни простаивающего соединения в секундах.
+        :raises ValueError: Если upload_concurrency или read_ahead меньше 1.
+        """
+
+        if upload_concurrency < 1:
+            raise ValueError(f"upload_concurrency must be at least 1, got {upload_concurrency}")
+        if read_ahead < 1:
+            raise ValueError(f"read_ahead must be at least 1, got {read_ahead}")
+        self.config: dict[str, Any] = {
             "endpoint_url": endpoint_url,
             "aws_access_key_id": access_key,
             "aws_secret_access_key": secret_key,
             "use_ssl": use_ssl,
             "region_name": "us-east-1",
             "service_name": "s3",
+            "config": AioConfig(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                connector_args={"keepalive_timeout": keepalive_timeout},
+            ),
         }
         self.bucket = bucket
         self.session = get_session()
+        self._client: AioBaseClient | None = None
+        self._exit_stack: AsyncExitStack | None = None
+        self.upload_concurrency = upload_concurrency
+        self.read_ahead = read_ahead
+
+    async def connect(self) -> None:
+        """Создание долгоживущего клиента, разрешение учётных данных и настройка пула"""
+        if self._client is not None:
+            return
+        exit_stack = AsyncExitStack()
+        self._client = await exit_stack.enter_async_context(
+            self.session.create_client(**self.config)
+        )
+        self._exit_stack = exit_stack
+        logger.info("S3 client connected to %s", self.config["endpoint_url"])
+
+    async def close(self) -> None:
+        """Закрытие долгоживущего клиента и его пула соединений"""
+        if self._exit_stack is None:
+            return
+        exit_stack, self._exit_stack, self._client = self._exit_stack, None, None
+        await exit_stack.aclose()
+
+    async def __aenter__(self) -> Self:
+        await self.connect()
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
 
     @asynccontextmanager
     async def _get_client(self) -> AsyncGenerator[AioBaseClient]:
+        if self._client is not None:
+            yield self._client
+            return
         async with self.session.create_client(**self.config) as client:
             yield client
 
@@ -59,54 +240,109 @@ class S3Storage(RemoteStorage):
             ) from e
 
     async def upload_multipart(self, file_parts: AsyncIterable[FilePart]) -> None:
+        """Конвейерная multipart загрузка.
+
+        Одновременно загружается до `upload_concurrency` частей, следующая часть
+        читается из потока только когда освобождается место, поэтому в памяти
+        не больше (upload_concurrency + 1) частей. ETag-и собираются по мере
+        завершения и сортируются по номерам частей перед завершением загрузки.
+        При ошибке незавершённые части отменяются, а multipart загрузка прерывается,
+        чтобы в бакете не оставались осиротевшие части.
+        """
+
+        upload = _MultipartUpload()
+        async with self._get_client() as client:
+            try:
+                await self._upload_parts(client, file_parts, upload)
+                if upload.id is not None:
+                    await self._complete_multipart_upload(client, upload)
+            except BaseException as e:
+                await upload.cancel()
+                if upload.id is not None:
+                    await self._abort_multipart_upload(client, upload)
+                if isinstance(e, ClientError):
+                    raise UploadingFailedError(
+                        f"Multipart upload failed with error: {e}",
+                        details={"filepath": upload.filepath, "filesize": upload.filesize},
+                        original_error=e
+                    ) from e
+                raise
+
+    async def _upload_parts(
+            self,
+            client: AioBaseClient,
+            file_parts: AsyncIterable[FilePart],
+            upload: _MultipartUpload,
+    ) -> None:
+        async for file_part in file_parts:
+            if upload.id is None:
+                await self._create_multipart_upload(client, file_part, upload)
+            while len(upload.pending) >= self.upload_concurrency:
+                await upload.wait(return_when=asyncio.FIRST_COMPLETED)
+            upload.pending.add(asyncio.create_task(
+                self._upload_part(client, upload.id, file_part)
+            ))
+        while upload.pending:
+            await upload.wait(return_when=asyncio.FIRST_EXCEPTION)
+
+    async def _create_multipart_upload(
+            self, client: AioBaseClient, file_part: FilePart, upload: _MultipartUpload
+    ) -> None:
+        response = await client.create_multipart_upload(Bucket=self.bucket, Key=file_part.path)
+        upload.id = response["UploadId"]
+        upload.filepath, upload.filesize = file_part.path, file_part.total_size
+        logger.info(
+            "Initiate multipart uploading",
+            extra={
+                "upload_id": upload.id,
+                "filepath": upload.filepath,
+                "filesize": upload.filesize,
+            }
+        )
+
+    async def _complete_multipart_upload(
+            self, client: AioBaseClient, upload: _MultipartUpload
+    ) -> None:
+        parts = [
+            {"PartNumber": number, "ETag": etag} for number, etag in sorted(upload.etags.items())
+        ]
+        await client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=upload.filepath,
+            UploadId=upload.id,
+            MultipartUpload={"Parts": parts}
+        )
+        logger.info(
+            "Multipart upload completed for %s", len(parts),
+            extra={"upload_id": upload.id, "part_count": len(parts)},
+        )
+
+    async def _upload_part(
+            self, client: AioBaseClient, upload_id: str, file_part: FilePart
+    ) -> tuple[int, str]:
+        part_response = await client.upload_part(
+            Bucket=self.bucket,
+            Key=file_part.path,
+            UploadId=upload_id,
+            PartNumber=file_part.number,
+            Body=_MemoryviewReader(file_part.content),
+        )
+        logger.info(
+            "Successful upload file part with number %s", file_part.number,
+            extra={"upload_id": upload_id, "etag": part_response["ETag"]},
+        )
+        return file_part.number, part_response["ETag"]
+
+    async def _abort_multipart_upload(
+            self, client: AioBaseClient, upload: _MultipartUpload
+    ) -> None:
         try:
-            upload_id: str | None = None
-            parts: list[dict[str, int | str]] = []
-            async with self._get_client() as client:
-                async for file_part in file_parts:
-                    if upload_id is None:
-                        response = await client.create_multipart_upload(
-                            Bucket=self.bucket, Key=file_part.path
-                        )
-                        upload_id = response["UploadId"]
-                        logger.info(
-                            "Initiate multipart uploading",
-                            extra={
-                                "upload_id": upload_id,
-                                "filepath": file_part.path,
-                                "filesize": file_part.size,
-                            }
-                        )
-                    part_response = await client.upload_part(
-                        Bucket=self.bucket,
-                        Key=file_part.path,
-                        UploadId=upload_id,
-                        PartNumber=file_part.number,
-                        Body=file_part.content
-                    )
-                    parts.append({
-                        "PartNumber": file_part.number, "ETag": part_response["ETag"]
-                    })
-                    logger.info(
-                        "Successful upload file part with number %s", file_part.number,
-                        extra={"upload_id": upload_id, "etag": part_response["ETag"]},
-                    )
-                await client.complete_multipart_upload(
-                    Bucket=self.bucket,
-                    Key=file_part.path,
-                    UploadId=upload_id,
-                    MultipartUpload={"Parts": parts}
-                )
-                logger.info(
-                    "Multipart upload completed for %s", len(parts),
-                    extra={"upload_id": upload_id, "part_count": len(parts)},
-                )
-        except ClientError as e:
-            raise UploadingFailedError(
-                f"Multipart upload failed with error: {e}",
-                details={"filepath": file_part.path, "filesize": file_part.size},
-                original_error=e
-            ) from e
+            await client.abort_multipart_upload(
+                Bucket=self.bucket, Key=upload.filepath, UploadId=upload.id
+            )
+            logger.warning("Multipart upload aborted", extra={"upload_id": upload.id})
+        except ClientError:
+            logger.exception("Failed to abort multipart upload", extra={"upload_id": upload.id})
 
     async def download(self, filepath: Filepath) -> File | None:
         try:
@@ -128,50 +364,94 @@ class S3Storage(RemoteStorage):
             ) from e
 
     async def download_multipart(
-            self, filepath: Filepath, part_size: int
+            self, filepath: Filepath, part_size: int, metrics: TransferMetrics | None = None
     ) -> AsyncIterator[FilePart]:
+        """Скачивание файла ranged запросами с упреждающим чтением.
+
+        Следующие диапазоны скачиваются параллельно, пока получатель обрабатывает
+        текущую часть, а части отдаются строго по порядку. Отданная часть вместе
+        с заранее скачиваемыми занимает не больше read_ahead × part_size байт.
+        Метрики передачи пишутся в лог по завершении.
+
+        :param metrics: Метрики передачи, заполняются по мере скачивания (*опционально).
+        """
+
+        metrics = metrics or TransferMetrics(filepath=filepath)
+        prefetched: deque[asyncio.Task[bytes]] = deque()
         try:
             async with self._get_client() as client:
-                head = await client.head_object(Bucket=self.bucket, Key=filepath)
-                filesize, mime_type, uploaded_at = (
-                    head["ContentLength"], head["ContentType"], head["LastModified"]
-                )
-                part_numbers = math.ceil(filesize / part_size)
-                logger.info(
-                    "Start multipart downloading file, filesize %s, total parts %s",
-                    filesize, part_numbers
-                )
-                for part_number in range(part_numbers):
-                    start = part_number * part_size
-                    end = min((part_number + 1) * part_size - 1, filesize - 1)
-                    logger.info(
-                        "Downloading part %s: bytes %s-%s", part_number, start, end
-                    )
-                    response = await client.get_object(
-                        Bucket=self.bucket, Key=filepath, Range=f"bytes={start}-{end}"
-                    )
-                    content = await response["Body"].read()
-                    yield FilePart(
-                        number=part_number,
-                        total_size=filesize,
-                        total_parts=part_numbers,
-                        path=filepath,
-                        size=len(content),
-                        mime_type=mime_type,
-                        content=content,
-                        uploaded_at=uploaded_at,
-                    )
+                async for file_part in self._download_parts(
+                        client, filepath, part_size, metrics, prefetched
+                ):
+                    yield file_part
         except ClientError as e:
             raise DownloadFailedError(
                 f"File multipart downloading failed with error: {e}",
                 details={"filepath": filepath, "part_size": part_size},
                 original_error=e
             ) from e
+        finally:
+            for task in prefetched:
+                task.cancel()
+            await asyncio.gather(*prefetched, return_exceptions=True)
+            metrics.finished_at = time.monotonic()
+            logger.info("Multipart downloading finished", extra=metrics.as_dict())
+
+    async def _download_parts(
+            self,
+            client: AioBaseClient,
+            filepath: Filepath,
+            part_size: int,
+            metrics: TransferMetrics,
+            prefetched: deque[asyncio.Task[bytes]],
+    ) -> AsyncIterator[FilePart]:
+        head = await client.head_object(Bucket=self.bucket, Key=filepath)
+        filesize, mime_type, uploaded_at = (
+            head["ContentLength"], head["ContentType"], head["LastModified"]
+        )
+        part_numbers = math.ceil(filesize / part_size)
+        logger.info(
+            "Start multipart downloading file, filesize %s, total parts %s",
+            filesize, part_numbers
+        )
+        ranges = (
+            (start, min(start + part_size, filesize) - 1)
+            for start in range(0, filesize, part_size)
+        )
+        for part_number in range(1, part_numbers + 1):
+            while len(prefetched) < self.read_ahead and (byte_range := next(ranges, None)):
+                prefetched.append(asyncio.create_task(
+                    self._get_range(client, filepath, *byte_range)
+                ))
+            waited_at = time.monotonic()
+            content = await prefetched.popleft()
+            metrics.wait_time += time.monotonic() - waited_at
+            metrics.parts += 1
+            metrics.bytes += len(content)
+            yield FilePart(
+                path=filepath,
+                mime_type=mime_type,
+                number=part_number,
+                offset=(part_number - 1) * part_size,
+                content=memoryview(content),
+                total_size=filesize,
+                total_parts=part_numbers,
+                uploaded_at=uploaded_at,
+            )
+
+    async def _get_range(
+            self, client: AioBaseClient, filepath: Filepath, start: int, end: int
+    ) -> bytes:
+        logger.debug("Downloading bytes %s-%s of %s", start, end, filepath)
+        response = await client.get_object(
+            Bucket=self.bucket, Key=filepath, Range=f"bytes={start}-{end}"
+        )
+        return await response["Body"].read()
 
     async def remove(self, filepath: Filepath) -> bool:
         try:
             async with self._get_client() as client:
-                response = await client.delete_object(Bucket=self.bucket, Key=filepath)
+                await client.delete_object(Bucket=self.bucket, Key=filepath)
         except ClientError as e:
             raise RemovingFailedError(
                 f"File remove failed with error: {e}",
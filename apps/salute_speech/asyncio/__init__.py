@@ -1,3 +1,12 @@
-__all__ = ("AsyncSaluteSpeechClient",)
+__all__ = (
+    "AsyncOAuthSberDevicesClient",
+    "AsyncSaluteSpeechClient",
+    "AsyncTransport",
+    "RecognitionTaskTracker",
+    "TokenCache",
+)
 
 from .client import AsyncSaluteSpeechClient
+from .oauth import AsyncOAuthSberDevicesClient, TokenCache
+from .tracker import RecognitionTaskTracker
+from .transport import AsyncTransport
@@ -1,18 +1,79 @@
-import json
+from typing import BinaryIO, Self
+
+import asyncio
 import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+from types import TracebackType
 from uuid import UUID
 
-import aiohttp
-
-from ..constants import AUDIO_ENCODING_CONFIG, SALUTE_SPEECH_BASE_URL, AudioEncoding, Language
-from ..exceptions import DownloadingFileError, TaskFailedError, UploadingFileError
-from ..models import RecognizedSpeech, RecognizedSpeechList, Task
-from .oauth import AsyncOAuthSberDevicesClient
+from ..constants import (
+    CONNECT_TIMEOUT,
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    READ_TIMEOUT,
+    SALUTE_SPEECH_BASE_URL,
+    UPLOAD_CHUNK_SIZE,
+    AudioEncoding,
+    Language,
+)
+from ..exceptions import (
+    DownloadingFileError,
+    TaskFailedError,
+    TransportError,
+    UploadingFileError,
+)
+from ..models import RecognizedSpeechList, Task
+from ..payloads import (
+    build_recognition_request,
+    build_upload_headers,
+    parse_recognized_speech,
+    parse_task,
+    parse_transcript,
+)
+from ..transcript import Transcript
+from ..transport import RetryPolicy
+from .oauth import AsyncOAuthSberDevicesClient, TokenCache
+from .transport import AsyncTransport
 
 logger = logging.getLogger(__name__)
 
+type UploadContent = bytes | Path | BinaryIO | AsyncIterable[bytes | memoryview]
+"""Контент загружаемого файла: байты, путь, файловый объект или поток частей"""
+
+
+async def iter_file_chunks(
+        file: Path | BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Потоковое чтение файла по частям без блокировки event loop.
+
+    :param file: Путь до файла или открытый на чтение бинарный файловый объект.
+    :param chunk_size: Размер части в байтах.
+    """
+
+    if isinstance(file, Path):
+        fileobj = await asyncio.to_thread(file.open, mode="rb")
+        try:
+            while chunk := await asyncio.to_thread(fileobj.read, chunk_size):
+                yield chunk
+        finally:
+            await asyncio.to_thread(fileobj.close)
+    else:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
 
 class AsyncSaluteSpeechClient:
+    """Асинхронный клиент Salute Speech.
+
+    Клиент держит одну долгоживущую HTTP сессию с пулом keep-alive соединений,
+    поэтому загрузка файлов и опрос статуса задач переиспользуют прогретые соединения.
+    Временные ошибки (сетевые, 429, 5xx) повторяются транспортом с учётом `Retry-After`,
+    а при недоступности хоста запросы отклоняются circuit breaker-ом.
+    Сессия создаётся при первом запросе, клиент нужно закрыть через `close()`
+    или использовать как асинхронный контекстный менеджер.
+    """
+
     def __init__(
             self,
             apikey: str,
@@ -21,63 +82,95 @@ class AsyncSaluteSpeechClient:
             profanity_check: bool = False,
             base_url: str = SALUTE_SPEECH_BASE_URL,
             use_ssl: bool = False,
+            connection_limit: int = CONNECTION_LIMIT,
+            connection_limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+            client_id: str | None = None,
+            client_secret: str | None = None,
+            token_cache: TokenCache | None = None,
+            retry_policy: RetryPolicy | None = None,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            read_timeout: float = READ_TIMEOUT,
     ) -> None:
         self._model = model
         self._profanity_check = profanity_check
         self._base_url = base_url
-        self._use_ssl = use_ssl
+        self._transport = AsyncTransport(
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            verify=use_ssl,
+            connection_limit=connection_limit,
+            connection_limit_per_host=connection_limit_per_host,
+        )
         self._oauth_client = AsyncOAuthSberDevicesClient(
-            apikey=apikey, scope=scope, use_ssl=use_ssl
+            apikey=apikey,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+            use_ssl=use_ssl,
+            token_cache=token_cache,
+            transport=self._transport,
         )
 
+    @property
+    def model(self) -> str:
+        """Модель распознавания"""
+        return self._model
+
+    @property
+    def profanity_check(self) -> bool:
+        """Включён ли фильтр ненормативной лексики"""
+        return self._profanity_check
+
+    async def close(self) -> None:
+        """Закрывает HTTP сессию клиента и OAuth клиент"""
+        await self._oauth_client.close()
+        await self._transport.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
     async def upload_file(
             self,
-            file: bytes,
+            file: UploadContent,
             audio_encoding: AudioEncoding,
             channels: int = 1,
             samplerate: int | None = None
     ) -> UUID:
-        if samplerate is None:
-            samplerate = 16000
+        """Загрузка аудио файла для последующего распознавания.
+
+        Всё, кроме байтов, отправляется потоком частей (chunked transfer encoding),
+        поэтому файл не нужно целиком держать в памяти. Потоковая загрузка
+        выполняется за одну попытку, так как поток нельзя прочитать повторно.
+
+        :param file: Байты, путь до файла, файловый объект или асинхронный поток частей.
+        :param audio_encoding: Аудио-кодек.
+        :param channels: Количество каналов аудио.
+        :param samplerate: Частота дискретизации аудио.
+        :returns: Идентификатор загруженного файла.
+        """
         access_token = await self._oauth_client.authenticate()
-        config = AUDIO_ENCODING_CONFIG.get(audio_encoding)
-        if config is None:
-            raise ValueError(
-                f"Unsupported audio encoding format! Input format {audio_encoding},"
-                f"supported formats {", ".join(list(AUDIO_ENCODING_CONFIG.keys()))}"
-            )
-        if channels > config["max_channels"]:
-            raise ValueError(
-                f"Format {audio_encoding} supports max {config['max_channels']} "
-                f"channels, but got {channels}"
-            )
-        if config["samplerate_range"] is not None:
-            min_samplerate, max_samplerate = config["samplerate_range"]
-            if not (min_samplerate < samplerate < max_samplerate):
-                raise ValueError(
-                    f"Format {audio_encoding} requires sample rate between "
-                    f"{min_samplerate} and {max_samplerate} Hz, but got {samplerate} Hz"
-                )
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": config["content_type"].format(samplerate=samplerate),
-        }
+        headers = build_upload_headers(access_token, audio_encoding, channels, samplerate)
+        if isinstance(file, Path) or hasattr(file, "read"):
+            file = iter_file_chunks(file)
+        logger.debug("Start uploading file with format of audio %s", audio_encoding)
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.post(
-                    url="/data:upload", headers=headers, data=file, ssl=self._use_ssl
-            ) as response:
-                logger.debug("Start uploading file with format of audio %s", audio_encoding)
-                response.raise_for_status()
-                data = await response.json()
-            return UUID(data["result"]["request_file_id"])
-        except aiohttp.ClientResponseError as e:
-            error_message = f"Uploading failed with {response.status} status, error: {e}"
-            logger.exception(error_message)
-            raise UploadingFileError(error_message) from e
-        except aiohttp.ClientError as e:
-            error_message = f"An unexpected error occurred while uploading file: {e}"
+            response = await self._transport.request(
+                "POST", f"{self._base_url}/data:upload", headers=headers, data=file
+            )
+        except TransportError as e:
+            error_message = f"Uploading failed with {e.status} status, error: {e}"
             logger.exception(error_message)
             raise UploadingFileError(error_message) from e
+        return UUID(response.json()["result"]["request_file_id"])
 
     async def async_recognize(
             self,
@@ -112,104 +205,68 @@ class AsyncSaluteSpeechClient:
         :returns: Созданная задача со статусом 'NEW'.
         """
         access_token = await self._oauth_client.authenticate()
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "X-Request-ID": f"{request_file_id}",
-        }
-        payload = {
-            "options": {
-                "model": self._model,
-                "audio_encoding": audio_encoding,
-                "sample_rate": samplerate,
-                "language": language,
-                "enable_profanity_filter": self._profanity_check,
-                "channels_count": channels,
-                "speaker_separation_options": {
-                    "enable": diarization,
-                    "enable_only_main_speaker": False,
-                    "count": min(max_speakers_count, 10)
-                    # Ограничение на максимальное количество спикеров
-                }
-            },
-            # Убираем insight_models для одноканального аудио
-            "request_file_id": request_file_id,
-        }
-        if words:
-            payload["hints"] = {
-                "words": words,
-                "enable_letters": enable_letters,
-                "eou_timeout": eou_timeout
-            }
+        headers, payload = build_recognition_request(
+            access_token,
+            request_file_id,
+            audio_encoding,
+            model=self._model,
+            profanity_check=self._profanity_check,
+            diarization=diarization,
+            max_speakers_count=max_speakers_count,
+            language=language,
+            channels=channels,
+            samplerate=samplerate,
+            words=words,
+            enable_letters=enable_letters,
+            eou_timeout=eou_timeout,
+        )
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.post(
-                    url="/speech/async_recognize",
-                    headers=headers,
-                    data=json.dumps(payload),
-                    ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-            return Task.model_validate(data["result"])
-        except aiohttp.ClientResponseError as e:
-            error_message = f"Task creation failed with status {e.status} error: {e.message}"
-            logger.exception(error_message)
-            raise TaskFailedError(error_message) from e
-        except aiohttp.ClientError as e:
-            error_message = f"An error occurred while task creation, error {e}"
+            response = await self._transport.request(
+                "POST",
+                f"{self._base_url}/speech:async_recognize",
+                headers=headers,
+                data=payload,
+                # Повтор после таймаута или 5xx может создать вторую платную задачу
+                idempotent=False,
+            )
+        except TransportError as e:
+            error_message = f"Task creation failed with status {e.status} error: {e}"
             logger.exception(error_message)
             raise TaskFailedError(error_message) from e
+        return parse_task(response.json())
 
     async def get_task_status(self, task_id: UUID) -> Task:
         access_token = await self._oauth_client.authenticate()
         headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/json"}
-        params = {"id": f"{task_id}"}
-        payload = {}
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.get(
-                url="/task:get",
-                headers=headers,
-                params=params,
-                data=json.dumps(payload),
-                ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-            return Task.model_validate(data["result"])
-        except aiohttp.ClientResponseError as e:
-            error_message = f"Task receiving failed with status {e.status} error: {e.message}"
-            logger.exception(error_message)
-            raise TaskFailedError(error_message) from e
-        except aiohttp.ClientError as e:
-            error_message = f"An error occurred while task receiving, error {e}"
+            response = await self._transport.request(
+                "GET", f"{self._base_url}/task:get", headers=headers, params={"id": f"{task_id}"}
+            )
+        except TransportError as e:
+            error_message = f"Task receiving failed with status {e.status} error: {e}"
             logger.exception(error_message)
             raise TaskFailedError(error_message) from e
+        return parse_task(response.json())
 
     async def download_file(self, response_file_id: UUID) -> RecognizedSpeechList:
+        return parse_recognized_speech(await self._download(response_file_id))
+
+    async def download_transcript(self, response_file_id: UUID) -> Transcript:
+        """Скачивание результатов распознавания в столбцовом виде с таймингами фраз и слов"""
+        return parse_transcript(await self._download(response_file_id))
+
+    async def _download(self, response_file_id: UUID) -> bytes:
         access_token = await self._oauth_client.authenticate()
         headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/octet-stream"}
-        params = {"response_file_id": f"{response_file_id}"}
-        payload = {}
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.get(
-                url="/data:download",
+            response = await self._transport.request(
+                "GET",
+                f"{self._base_url}/data:download",
                 headers=headers,
-                params=params,
-                data=payload,
-                ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.text()
-            results = json.loads(data)
-            return RecognizedSpeechList(
-                [RecognizedSpeech.from_response(result) for result in results]
+                params={"response_file_id": f"{response_file_id}"},
             )
-        except aiohttp.ClientResponseError as e:
-            error_message = f"Downloading failed with status {e.status} error: {e.message}"
-            logger.exception(error_message)
-            raise DownloadingFileError(error_message) from e
-        except aiohttp.ClientError as e:
-            error_message = f"An error occurred while downloading, error {e}"
+        except TransportError as e:
+            error_message = f"Downloading failed with status {e.status} error: {e}"
             logger.exception(error_message)
             raise DownloadingFileError(error_message) from e
+        return response.content
@@ -1,70 +1,171 @@
-import base64
+from typing import Protocol
+
+import asyncio
+import hashlib
 import logging
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
-import aiohttp
+from pydantic import ValidationError
+
+from modules.shared_kernel.application.exceptions import CacheHitError, CacheSetError
 
-from ..constants import SBER_DEVICES_BASE_URL
-from ..exceptions import AuthenticationFailedError
+from ..constants import ACCESS_TOKEN_REFRESH_MARGIN, SBER_DEVICES_BASE_URL
+from ..exceptions import AuthenticationFailedError, TransportError
+from ..models import AccessToken
+from ..payloads import build_apikey, build_oauth_headers, parse_access_token
+from .transport import AsyncTransport
 
 logger = logging.getLogger(__name__)
 
 
+class TokenCache(Protocol):
+    """Общий для нескольких процессов кеш access token, например `SaluteSpeechTokenCache`.
+    Ошибки хранилища сообщаются через CacheHitError и CacheSetError.
+    """
+
+    async def get(self, key: str) -> AccessToken | None: ...
+
+    async def set(self, key: str, value: AccessToken, ttl: timedelta | None = None) -> None: ...
+
+
 class AsyncOAuthSberDevicesClient:
+    """Асинхронный OAuth клиент SberDevices с кешированием access token.
+
+    Токен хранится до истечения `expires_at` и обновляется в фоне за `refresh_margin`
+    секунд до него, поэтому запросы к API не ждут аутентификацию. Одновременные вызовы
+    `authenticate` разделяют одно обновление токена (single-flight). Если передан
+    `token_cache`, токен разделяется между процессами воркеров.
+    """
+
     def __init__(
             self,
             apikey: str,
             scope: str,
-            client_id: str,
-            client_secret: str,
+            client_id: str | None = None,
+            client_secret: str | None = None,
             use_ssl: bool = False,
             base_url: str = SBER_DEVICES_BASE_URL,
+            token_cache: TokenCache | None = None,
+            refresh_margin: float = ACCESS_TOKEN_REFRESH_MARGIN,
+            transport: AsyncTransport | None = None,
     ) -> None:
+        """
+        :param apikey: Ключ авторизации (base64 от client_id:client_secret).
+        :param scope: Версия API.
+        :param client_id: Идентификатор клиента, если ключ нужно собрать самостоятельно.
+        :param client_secret: Секрет клиента, если ключ нужно собрать самостоятельно.
+        :param use_ssl: Проверять SSL сертификат.
+        :param base_url: Базовый URL SberDevices.
+        :param token_cache: Общий кеш access token (*опционально).
+        :param refresh_margin: За сколько секунд до истечения обновлять токен.
+        :param transport: Общий HTTP транспорт, по умолчанию клиент создаёт собственный.
+        """
+
         self._apikey = apikey
         self._scope = scope
         self._client_id = client_id
         self._client_secret = client_secret
         self._rq_uid = uuid4()
-        self._use_ssl = use_ssl
         self._base_url = base_url
+        self._owns_transport = transport is None
+        self._transport = transport or AsyncTransport(verify=use_ssl)
+        self._token_cache = token_cache
+        self._refresh_margin = refresh_margin
+        self._token: AccessToken | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[AccessToken] | None = None
+
+    async def close(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._owns_transport:
+            await self._transport.close()
 
     def _build_apikey(self) -> str:
-        credentials = f"{self._client_id}:{self._client_secret}"
-        return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
+        return build_apikey(self._apikey, self._client_id, self._client_secret)
+
+    @property
+    def _cache_key(self) -> str:
+        """Ключ токена в общем кеше, без раскрытия ключа авторизации"""
+        apikey_hash = hashlib.sha256(self._build_apikey().encode("utf-8")).hexdigest()
+        return f"{self._scope}:{apikey_hash[:16]}"
 
     async def authenticate(self) -> str:
-        """Производит аутентификацию клиента, выдавая access token"""
-        headers = {
-            "Authorization": f"Bearer {self._build_apikey()}",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-            "RqUID": self._rq_uid,
-        }
-        payload = {"scope": self._scope}
+        """Выдаёт действующий access token, при необходимости обновляя его"""
+        token = self._token
+        if token is None or token.expires_within(0):
+            token = await self._refresh()
+        elif token.expires_within(self._refresh_margin):
+            self._schedule_refresh()
+        return token.access_token
+
+    def _schedule_refresh(self) -> None:
+        """Запуск фонового обновления токена, если оно ещё не запущено"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+        self._refresh_task.add_done_callback(self._log_refresh_error)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task[AccessToken]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background access token refresh failed: %s", task.exception())
+
+    async def _refresh(self) -> AccessToken:
+        """Обновление токена, одновременные вызовы ждут одно обновление"""
+        async with self._refresh_lock:
+            # Токен мог обновить другой вызов, пока этот ждал блокировку
+            if self._token is not None and not self._token.expires_within(self._refresh_margin):
+                return self._token
+            token = await self._get_cached_token()
+            if token is None or token.expires_within(self._refresh_margin):
+                token = await self._request_token()
+                await self._cache_token(token)
+            self._token = token
+            return token
+
+    async def _get_cached_token(self) -> AccessToken | None:
+        if self._token_cache is None:
+            return None
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session:
-                async with session.post(
-                        url="/oauth", headers=headers, data=payload, ssl=self._use_ssl
-                ) as response:
-                    logger.debug("Make request for authentication")
-                    response.raise_for_status()
-                    data = await response.json()
-                access_token = data.get("access_token")
-                if access_token is None:
-                    error_message = (
-                        "Authentication failed, "
-                        "because access token missing in response!"
-                    )
-                    logger.error(error_message)
-                    raise AuthenticationFailedError(error_message)
-        except aiohttp.ClientResponseError as e:
-            error_message = f"Authentication failed with status {response.status}, error: {e}"
-            logger.exception(error_message)
-            raise AuthenticationFailedError(error_message) from e
-        except aiohttp.ClientError as e:
-            error_message = f"An unexpected error occurred while authentication, error {e}"
+            return await self._token_cache.get(self._cache_key)
+        except CacheHitError:
+            logger.warning("Failed to read access token from shared cache", exc_info=True)
+            return None
+        except ValidationError as e:
+            # Без exc_info: ошибка валидации содержит значение из кеша, то есть токен
+            logger.warning(
+                "Invalid access token in shared cache, %s errors", e.error_count()
+            )
+            return None
+
+    async def _cache_token(self, token: AccessToken) -> None:
+        if self._token_cache is None:
+            return
+        ttl = token.expires_at - datetime.now(UTC)
+        try:
+            await self._token_cache.set(self._cache_key, token, ttl=ttl)
+        except CacheSetError:
+            logger.warning("Failed to write access token to shared cache", exc_info=True)
+
+    async def _request_token(self) -> AccessToken:
+        """Запрос нового access token у SberDevices"""
+        logger.debug("Make request for authentication")
+        try:
+            response = await self._transport.request(
+                "POST",
+                f"{self._base_url}/oauth",
+                headers=build_oauth_headers(self._build_apikey(), self._rq_uid),
+                data={"scope": self._scope},
+            )
+            token = parse_access_token(response.json())
+        except TransportError as e:
+            error_message = f"Authentication failed with status {e.status}, error: {e}"
             logger.exception(error_message)
             raise AuthenticationFailedError(error_message) from e
-        else:
-            logger.info("Client successfully authenticated!")
-            return access_token
+        except AuthenticationFailedError:
+            logger.exception("Authentication failed")
+            raise
+        logger.info("Client successfully authenticated!")
+        return token
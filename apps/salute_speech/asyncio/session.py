@@ -0,0 +1,29 @@
+import aiohttp
+
+from ..constants import (
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+)
+
+
+def create_session(
+        limit: int = CONNECTION_LIMIT, limit_per_host: int = CONNECTION_LIMIT_PER_HOST
+) -> aiohttp.ClientSession:
+    """Создаёт долгоживущую HTTP сессию с пулом keep-alive соединений.
+
+    Сессию нужно создавать внутри запущенного event loop и закрывать через `close()`.
+
+    :param limit: Максимальное количество одновременных соединений.
+    :param limit_per_host: Максимальное количество одновременных соединений с одним хостом.
+    :returns: HTTP сессия.
+    """
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector)
@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from dataclasses import dataclass
+from itertools import starmap
+from uuid import UUID
+
+from ..constants import (
+    MAX_CONCURRENT_POLLS,
+    POLL_BACKOFF_FACTOR,
+    POLL_DURATION_RATIO,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    TASK_TIMEOUT,
+)
+from ..exceptions import TaskFailedError, TaskTimeoutError
+from ..models import Task
+from .client import AsyncSaluteSpeechClient
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = frozenset({"DONE", "ERROR", "CANCELED"})
+
+
+@dataclass(slots=True)
+class _TrackedTask:
+    """Состояние ожидаемой задачи распознавания"""
+
+    future: asyncio.Future[Task]
+    interval: float
+    next_poll_at: float
+    deadline: float | None
+
+
+class RecognitionTaskTracker:
+    """Отслеживание всех задач распознавания воркера на одном таймере.
+
+    Вместо отдельного цикла опроса на каждую задачу трекер хранит все ожидаемые задачи
+    и опрашивает только те, у которых подошёл срок. Первый опрос откладывается
+    пропорционально продолжительности аудио, а следующие - с экспоненциально растущим
+    интервалом до `max_interval`. Одновременно выполняется не больше
+    `max_concurrent_polls` запросов статуса, поэтому частота запросов ограничена
+    даже при сотнях одновременных сегментов.
+    """
+
+    def __init__(
+            self,
+            client: AsyncSaluteSpeechClient,
+            min_interval: float = POLL_MIN_INTERVAL,
+            max_interval: float = POLL_MAX_INTERVAL,
+            backoff_factor: float = POLL_BACKOFF_FACTOR,
+            duration_ratio: float = POLL_DURATION_RATIO,
+            max_concurrent_polls: int = MAX_CONCURRENT_POLLS,
+            timeout: float | None = TASK_TIMEOUT,
+    ) -> None:
+        """
+        :param client: Клиент Salute Speech.
+        :param min_interval: Минимальный интервал опроса задачи в секундах.
+        :param max_interval: Максимальный интервал опроса задачи в секундах.
+        :param backoff_factor: Множитель интервала после каждого опроса.
+        :param duration_ratio: Доля продолжительности аудио до первого опроса.
+        :param max_concurrent_polls: Максимальное количество одновременных запросов статуса.
+        :param timeout: Максимальное время ожидания задачи в секундах по умолчанию.
+        """
+
+        self._client = client
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff_factor = backoff_factor
+        self._duration_ratio = duration_ratio
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._timeout = timeout
+        self._tracked: dict[UUID, _TrackedTask] = {}
+        self._wakeup = asyncio.Event()
+        self._loop_task: asyncio.Task[None] | None = None
+
+    @property
+    def pending_count(self) -> int:
+        """Количество ожидаемых задач"""
+        return len(self._tracked)
+
+    async def wait(
+            self,
+            task: Task,
+            expected_duration: float | None = None,
+            timeout: float | None = None,
+    ) -> Task:
+        """Ожидание завершения задачи распознавания.
+
+        :param task: Созданная задача распознавания.
+        :param expected_duration: Продолжительность распознаваемого аудио в секундах.
+        :param timeout: Максимальное время ожидания в секундах, по умолчанию из трекера.
+        :returns: Задача со статусом 'DONE'.
+        :raises TaskFailedError: Задача завершилась со статусом 'ERROR' или 'CANCELED'.
+        :raises TaskTimeoutError: Задача не завершилась за отведённое время.
+        """
+
+        if task.status in FINAL_STATUSES:
+            return self._resolve(task)
+        if task.id in self._tracked:
+            return self._resolve(await asyncio.shield(self._tracked[task.id].future))
+        timeout = self._timeout if timeout is None else timeout
+        now = time.monotonic()
+        interval = self._min_interval
+        if expected_duration is not None:
+            interval = expected_duration * self._duration_ratio
+        interval = min(max(interval, self._min_interval), self._max_interval)
+        tracked_task = _TrackedTask(
+            future=asyncio.get_running_loop().create_future(),
+            interval=interval,
+            next_poll_at=now + interval,
+            deadline=None if timeout is None else now + timeout,
+        )
+        self._tracked[task.id] = tracked_task
+        self._ensure_running()
+        try:
+            return self._resolve(await tracked_task.future)
+        except asyncio.CancelledError:
+            # Ожидающий отменён - задачу больше не нужно опрашивать
+            self._tracked.pop(task.id, None)
+            raise
+
+    async def close(self) -> None:
+        """Останавливает цикл опроса и отменяет ожидание всех задач"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._loop_task
+            self._loop_task = None
+        for tracked_task in self._tracked.values():
+            tracked_task.future.cancel()
+        self._tracked.clear()
+
+    @staticmethod
+    def _resolve(task: Task) -> Task:
+        if task.status != "DONE":
+            raise TaskFailedError(
+                f"Recognition task {task.id} finished with status {task.status}"
+            )
+        return task
+
+    def _ensure_running(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()  # Новая задача может быть опрошена раньше текущего сна
+
+    async def _run(self) -> None:
+        try:
+            await self._poll_due_tasks()
+        except asyncio.CancelledError:
+            self._fail_pending(None)
+            raise
+        except Exception as error:
+            # Без цикла опроса ожидающие задачи никогда не завершатся
+            logger.exception("Recognition task tracker loop failed")
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception | None) -> None:
+        tracked, self._tracked = self._tracked, {}
+        for task_id, tracked_task in tracked.items():
+            if tracked_task.future.done():
+                continue
+            if error is None:
+                tracked_task.future.cancel()
+            else:
+                failure = TaskFailedError(f"Tracking of recognition task {task_id} failed")
+                failure.__cause__ = error
+                tracked_task.future.set_exception(failure)
+
+    async def _poll_due_tasks(self) -> None:
+        while self._tracked:
+            now = time.monotonic()
+            due = [
+                (task_id, tracked_task)
+                for task_id, tracked_task in self._tracked.items()
+                if tracked_task.next_poll_at <= now
+            ]
+            if due:
+                await asyncio.gather(*starmap(self._poll, due))
+            self._expire(time.monotonic())
+            if not self._tracked:
+                break
+            wakeup_at = min(
+                min(tracked_task.next_poll_at, tracked_task.deadline or math.inf)
+                for tracked_task in self._tracked.values()
+            )
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(wakeup_at - time.monotonic(), 0)
+                )
+
+    async def _poll(self, task_id: UUID, tracked_task: _TrackedTask) -> None:
+        async with self._semaphore:
+            try:
+                task = await self._client.get_task_status(task_id)
+            except Exception:
+                # Ошибка запроса статуса (сеть, авторизация, разбор ответа) не означает
+                # ошибку задачи, повторим позже с увеличенным интервалом
+                logger.warning(
+                    "Failed to poll recognition task %s, retrying later", task_id, exc_info=True
+                )
+                task = None
+        if task is not None and task.status in FINAL_STATUSES:
+            self._tracked.pop(task_id, None)
+            if not tracked_task.future.done():
+                tracked_task.future.set_result(task)
+            return
+        tracked_task.next_poll_at = time.monotonic() + tracked_task.interval
+        tracked_task.interval = min(
+            tracked_task.interval * self._backoff_factor, self._max_interval
+        )
+
+    def _expire(self, now: float) -> None:
+        expired = [
+            task_id for task_id, tracked_task in self._tracked.items()
+            if tracked_task.deadline is not None and tracked_task.deadline <= now
+        ]
+        for task_id in expired:
+            tracked_task = self._tracked.pop(task_id)
+            if not tracked_task.future.done():
+                tracked_task.future.set_exception(
+                    TaskTimeoutError(f"Recognition task {task_id} timed out")
+                )
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Mapping
+
+import aiohttp
+
+from ..constants import CONNECT_TIMEOUT, CONNECTION_LIMIT, CONNECTION_LIMIT_PER_HOST, READ_TIMEOUT
+from ..exceptions import TransportError
+from ..transport import Response, RetryPolicy, get_circuit_breaker, is_failure, is_success
+from .session import create_session
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransport:
+    """Асинхронный HTTP транспорт Salute Speech поверх `aiohttp`.
+
+    Повторяет временные ошибки по той же `RetryPolicy` и с тем же circuit breaker хоста,
+    что и синхронный `Transport`. Потоковое тело запроса (AsyncIterable) нельзя
+    отправить повторно, поэтому такие запросы выполняются за одну попытку.
+    Сессия создаётся при первом запросе, транспорт нужно закрыть через `close()`.
+    """
+
+    def __init__(
+            self,
+            retry_policy: RetryPolicy | None = None,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            read_timeout: float = READ_TIMEOUT,
+            verify: bool = False,
+            connection_limit: int = CONNECTION_LIMIT,
+            connection_limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+    ) -> None:
+        """
+        :param retry_policy: Политика повторов, по умолчанию `RetryPolicy()`.
+        :param connect_timeout: Таймаут установки соединения в секундах.
+        :param read_timeout: Таймаут ожидания данных от сервера в секундах.
+        :param verify: Проверять SSL сертификат.
+        :param connection_limit: Максимальное количество одновременных соединений.
+        :param connection_limit_per_host: Максимальное количество соединений с одним хостом.
+        """
+
+        self._retry_policy = retry_policy or RetryPolicy()
+        # Общий таймаут не задаётся, чтобы не обрывать загрузку больших файлов
+        self._timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._verify = verify
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """HTTP сессия транспорта, создаётся при первом обращении"""
+        if self._session is None or self._session.closed:
+            self._session = create_session(
+                limit=self._connection_limit, limit_per_host=self._connection_limit_per_host
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            headers: Mapping[str, str] | None = None,
+            params: Mapping[str, str] | None = None,
+            data: (
+                bytes | str | Mapping[str, str] | AsyncIterable[bytes | memoryview] | None
+            ) = None,
+            idempotent: bool = True,
+    ) -> Response:
+        """Выполнение запроса с повторами временных ошибок.
+
+        :param idempotent: Можно ли повторять запрос после таймаута чтения и 5xx.
+        :returns: Ответ с успешным (2xx/3xx) статусом.
+        :raises TransportError: Ответ с ошибкой или исчерпаны попытки.
+        :raises CircuitOpenError: Хост недоступен по данным circuit breaker.
+        """
+
+        circuit_breaker = get_circuit_breaker(url)
+        retry_policy = self._retry_policy
+        if isinstance(data, AsyncIterable):
+            retry_policy = RetryPolicy(max_attempts=1)
+        attempt = 0
+        while True:
+            circuit_breaker.before_request()
+            try:
+                async with self.session.request(
+                        method,
+                        url,
+                        headers=headers,
+                        params=params,
+                        data=data,
+                        timeout=self._timeout,
+                        ssl=self._verify,
+                ) as response:
+                    status, response_headers = response.status, response.headers
+                    content = await response.read()
+            except (aiohttp.ClientError, TimeoutError) as e:
+                circuit_breaker.record_failure()
+                # Ошибка соединения означает, что запрос не был отправлен
+                sent = not isinstance(
+                    e, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)
+                )
+                if not retry_policy.should_retry(attempt, idempotent=idempotent, sent=sent):
+                    raise TransportError(f"{method} {url} failed: {e!r}") from e
+                delay = retry_policy.delay(attempt)
+                logger.warning("%s %s failed: %r, retry in %.2f s", method, url, e, delay)
+            except BaseException:
+                # В том числе отмена: иначе пробный запрос circuit breaker не освободится
+                circuit_breaker.record_cancelled()
+                raise
+            else:
+                if is_failure(status):
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+                if is_success(status):
+                    return Response(status, response_headers, content)
+                retry_after = response_headers.get("Retry-After")
+                if not retry_policy.should_retry(
+                        attempt, status, idempotent, retry_after=retry_after
+                ):
+                    raise TransportError(
+                        f"{method} {url} failed with status {status}: "
+                        f"{content[:200].decode('utf-8', errors='replace')}",
+                        status=status,
+                    )
+                delay = retry_policy.delay(attempt, retry_after)
+                logger.warning(
+                    "%s %s failed with status %s, retry in %.2f s", method, url, status, delay
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
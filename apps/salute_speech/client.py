@@ -1,18 +1,39 @@
-import json
+from typing import Self
+
 import logging
+from types import TracebackType
 from uuid import UUID
 
-import requests
-
-from .constants import AUDIO_ENCODING_CONFIG, SALUTE_SPEECH_BASE_URL, AudioEncoding, Language
-from .exceptions import DownloadingFileError, TaskFailedError, UploadingFileError
-from .models import RecognizedSpeech, RecognizedSpeechList, Task
+from .constants import (
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    SALUTE_SPEECH_BASE_URL,
+    AudioEncoding,
+    Language,
+)
+from .exceptions import DownloadingFileError, TaskFailedError, TransportError, UploadingFileError
+from .models import RecognizedSpeechList, Task
 from .oauth import OAuthSberDevicesClient
+from .payloads import (
+    build_recognition_request,
+    build_upload_headers,
+    parse_recognized_speech,
+    parse_task,
+    parse_transcript,
+)
+from .transcript import Transcript
+from .transport import RetryPolicy, Transport
 
 logger = logging.getLogger(__name__)
 
 
 class SaluteSpeechClient:
+    """Синхронный клиент Salute Speech.
+
+    Использует тот же транспорт с повторами временных ошибок и circuit breaker,
+    что и `AsyncSaluteSpeechClient`, а также общие проверки и сборку запросов.
+    """
+
     def __init__(
             self,
             apikey: str,
@@ -21,12 +42,45 @@ class SaluteSpeechClient:
             profanity_check: bool = False,
             base_url: str = SALUTE_SPEECH_BASE_URL,
             use_ssl: bool = False,
+            client_id: str | None = None,
+            client_secret: str | None = None,
+            retry_policy: RetryPolicy | None = None,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            read_timeout: float = READ_TIMEOUT,
     ) -> None:
         self._model = model
         self._profanity_check = profanity_check
         self._base_url = base_url
-        self._use_ssl = use_ssl
-        self._oauth_client = OAuthSberDevicesClient(apikey=apikey, scope=scope, use_ssl=use_ssl)
+        self._transport = Transport(
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            verify=use_ssl,
+        )
+        self._oauth_client = OAuthSberDevicesClient(
+            apikey=apikey,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+            use_ssl=use_ssl,
+            transport=self._transport,
+        )
+
+    def close(self) -> None:
+        """Закрывает HTTP сессию клиента"""
+        self._oauth_client.close()
+        self._transport.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
 
     def upload_file(
             self,
@@ -35,44 +89,17 @@ class SaluteSpeechClient:
             channels: int = 1,
             samplerate: int | None = None
     ) -> UUID:
-        if samplerate is None:
-            samplerate = 16000
-        url = f"{self._base_url}/data:upload"
         access_token = self._oauth_client.authenticate()
-        config = AUDIO_ENCODING_CONFIG.get(audio_encoding)
-        if config is None:
-            raise ValueError(
-                f"Unsupported audio encoding format! Input format {audio_encoding},"
-                f"supported formats {", ".join(list(AUDIO_ENCODING_CONFIG.keys()))}"
-            )
-        if channels > config["max_channels"]:
-            raise ValueError(
-                f"Format {audio_encoding} supports max {config['max_channels']} "
-                f"channels, but got {channels}"
-            )
-        if config["samplerate_range"] is not None:
-            min_samplerate, max_samplerate = config["samplerate_range"]
-            if not (min_samplerate < samplerate < max_samplerate):
-                raise ValueError(
-                    f"Format {audio_encoding} requires sample rate between "
-                    f"{min_samplerate} and {max_samplerate} Hz, but got {samplerate} Hz"
-                )
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": config["content_type"].format(samplerate=samplerate),
-        }
+        headers = build_upload_headers(access_token, audio_encoding, channels, samplerate)
+        logger.debug("Start uploading file with format of audio %s", audio_encoding)
         try:
-            with requests.Session() as session:
-                logger.debug("Start uploading file with format of audio %s", audio_encoding)
-                response = session.post(
-                    url=url, headers=headers, data=file, verify=False, stream=True
-                )
-                response.raise_for_status()
-                data = response.json()
-            return UUID(data["result"]["request_file_id"])
-        except requests.exceptions.HTTPError as e:
-            error_message = f"Uploading failed with {response.status_code} status, error: {e}"
+            response = self._transport.request(
+                "POST", f"{self._base_url}/data:upload", headers=headers, data=file
+            )
+        except TransportError as e:
+            error_message = f"Uploading failed with {e.status} status, error: {e}"
             raise UploadingFileError(error_message) from e
+        return UUID(response.json()["result"]["request_file_id"])
 
     def async_recognize(
             self,
@@ -106,90 +133,69 @@ class SaluteSpeechClient:
         :param eou_timeout: Настройка распознавания конца фразы (End of Utterance — eou).
         :returns: Созданная задача со статусом 'NEW'.
         """
-        url = f"{SALUTE_SPEECH_BASE_URL}/speech/async_recognize"
         access_token = self._oauth_client.authenticate()
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "X-Request-ID": f"{request_file_id}",
-        }
-        payload = {
-            "options": {
-                "model": self._model,
-                "audio_encoding": audio_encoding,
-                "sample_rate": samplerate,
-                "language": language,
-                "enable_profanity_filter": self._profanity_check,
-                "channels_count": channels,
-                "speaker_separation_options": {
-                    "enable": diarization,
-                    "enable_only_main_speaker": False,
-                    "count": min(max_speakers_count, 10)
-                    # Ограничение на максимальное количество спикеров
-                }
-            },
-            # Убираем insight_models для одноканального аудио
-            "request_file_id": request_file_id,
-        }
-        if words:
-            payload["hints"] = {
-                "words": words,
-                "enable_letters": enable_letters,
-                "eou_timeout": eou_timeout
-            }
+        headers, payload = build_recognition_request(
+            access_token,
+            request_file_id,
+            audio_encoding,
+            model=self._model,
+            profanity_check=self._profanity_check,
+            diarization=diarization,
+            max_speakers_count=max_speakers_count,
+            language=language,
+            channels=channels,
+            samplerate=samplerate,
+            words=words,
+            enable_letters=enable_letters,
+            eou_timeout=eou_timeout,
+        )
         try:
-            with requests.Session() as session:
-                response = session.post(
-                    url=url, headers=headers, data=json.dumps(payload), verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
-            return Task.model_validate(data["result"])
-        except requests.exceptions.HTTPError as e:
+            response = self._transport.request(
+                "POST",
+                f"{self._base_url}/speech:async_recognize",
+                headers=headers,
+                data=payload,
+                # Повтор после таймаута или 5xx может создать вторую платную задачу
+                idempotent=False,
+            )
+        except TransportError as e:
             raise TaskFailedError(
-                f"Task creation failed with status {response.status_code} error: {e}"
+                f"Task creation failed with status {e.status} error: {e}"
             ) from e
+        return parse_task(response.json())
 
     def get_task_status(self, task_id: UUID) -> Task:
-        url = f"{self._base_url}/task:get"
         access_token = self._oauth_client.authenticate()
         headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/json"}
-        params = {"id": f"{task_id}"}
-        payload = {}
         try:
-            with requests.Session() as session:
-                response = session.get(
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    data=json.dumps(payload),
-                    verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
-            return Task.model_validate(data["result"])
-        except requests.exceptions.HTTPError:
-            raise TaskFailedError("Task receiving failed") from None
+            response = self._transport.request(
+                "GET", f"{self._base_url}/task:get", headers=headers, params={"id": f"{task_id}"}
+            )
+        except TransportError as e:
+            raise TaskFailedError(
+                f"Task receiving failed with status {e.status} error: {e}"
+            ) from e
+        return parse_task(response.json())
 
     def download_file(self, response_file_id: UUID) -> RecognizedSpeechList:
-        url = f"{self._base_url}/data:download"
+        return parse_recognized_speech(self._download(response_file_id))
+
+    def download_transcript(self, response_file_id: UUID) -> Transcript:
+        """Скачивание результатов распознавания в столбцовом виде с таймингами фраз и слов"""
+        return parse_transcript(self._download(response_file_id))
+
+    def _download(self, response_file_id: UUID) -> bytes:
         access_token = self._oauth_client.authenticate()
         headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/octet-stream"}
-        params = {"response_file_id": f"{response_file_id}"}
-        payload = {}
         try:
-            with requests.Session() as session:
-                response = session.get(
-                    url=url, headers=headers, params=params, data=payload, verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.text
-            results = json.loads(data)
-            return RecognizedSpeechList(
-                [RecognizedSpeech.from_response(result) for result in results]
+            response = self._transport.request(
+                "GET",
+                f"{self._base_url}/data:download",
+                headers=headers,
+                params={"response_file_id": f"{response_file_id}"},
             )
-        except requests.exceptions.HTTPError as e:
+        except TransportError as e:
             raise DownloadingFileError(
-                f"Downloading failed with status {response.status_code} error: {e}"
+                f"Downloading failed with status {e.status} error: {e}"
             ) from e
+        return response.content
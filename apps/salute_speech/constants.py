@@ -2,8 +2,14 @@ from typing import Any, Final, Literal
 
 # Базовый URL сервиса SberDevices
 SBER_DEVICES_BASE_URL = "https://ngw.devices.sberbank.ru:9443/api/v2"
+# Время жизни access token SberDevices, если оно не пришло в ответе (секунды)
+ACCESS_TOKEN_LIFETIME = 30 * 60
+# За сколько секунд до истечения access token начинается его фоновое обновление
+ACCESS_TOKEN_REFRESH_MARGIN = 60
 # Базовый URL для REST API Salute-Speech
 SALUTE_SPEECH_BASE_URL = "https://smartspeech.sber.ru/rest/v1"
+# Адрес gRPC API Salute-Speech для потокового распознавания
+SALUTE_SPEECH_GRPC_TARGET = "smartspeech.sber.ru:443"
 
 # Язык для распознавания речи
 Language = Literal["ru-RU", "en-US", "kk-KZ", "ky-KG", "uz-UZ"]
@@ -54,3 +60,33 @@ AUDIO_ENCODING_CONFIG: Final[dict[AudioEncoding, dict[str, Any]]] = {
         "content_type": "audio/g729"
     }
 }
+
+# Параметры пула соединений асинхронных клиентов
+CONNECTION_LIMIT = 100  # Всего одновременных соединений
+CONNECTION_LIMIT_PER_HOST = 20  # Одновременных соединений с одним хостом
+DNS_CACHE_TTL = 300  # Время жизни DNS кеша в секундах
+KEEPALIVE_TIMEOUT = 30  # Время удержания простаивающего соединения в секундах
+UPLOAD_CHUNK_SIZE = 256 * 1024  # Размер части потоковой загрузки файла в байтах
+
+# Параметры транспорта: таймауты, повторы и circuit breaker
+CONNECT_TIMEOUT = 10  # Таймаут установки соединения в секундах
+READ_TIMEOUT = 60  # Таймаут ожидания данных от сервера в секундах
+RETRY_MAX_ATTEMPTS = 4  # Всего попыток запроса, включая первую
+RETRY_BASE_DELAY = 0.5  # Базовая задержка перед повтором в секундах
+RETRY_MAX_DELAY = 30.0  # Максимальная задержка перед повтором в секундах
+# HTTP статусы временных ошибок, после которых запрос повторяется
+RETRY_STATUSES: Final[frozenset[int]] = frozenset({408, 429, 500, 502, 503, 504})
+# Статусы явного отказа сервера, после которых (при наличии Retry-After) повторяется
+# неидемпотентный запрос: сервер не начинал его выполнение
+NON_IDEMPOTENT_RETRY_STATUSES: Final[frozenset[int]] = frozenset({429, 503})
+CIRCUIT_FAILURE_THRESHOLD = 5  # Ошибок подряд до размыкания цепи
+CIRCUIT_RESET_TIMEOUT = 30.0  # Время до пробного запроса после размыкания в секундах
+
+# Параметры опроса статуса задач распознавания
+POLL_MIN_INTERVAL = 1.0  # Минимальный интервал опроса задачи в секундах
+POLL_MAX_INTERVAL = 30.0  # Максимальный интервал опроса задачи в секундах
+POLL_BACKOFF_FACTOR = 1.5  # Множитель интервала после каждого опроса
+# Доля продолжительности аудио, через которую задача опрашивается впервые
+POLL_DURATION_RATIO = 0.1
+MAX_CONCURRENT_POLLS = 8  # Одновременных запросов статуса за один тик
+TASK_TIMEOUT = 60 * 60  # Максимальное время ожидания задачи в секундах
@@ -20,3 +20,21 @@ class DownloadingFileError(SaluteSpeechError):
 
 class TaskFailedError(SaluteSpeechError):
     pass
+
+
+class TaskTimeoutError(TaskFailedError):
+    pass
+
+
+class StreamingRecognitionError(SaluteSpeechError):
+    pass
+
+
+class TransportError(SaluteSpeechError):
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(TransportError):
+    pass
@@ -1,15 +1,37 @@
 from typing import Any, Literal, Self
 
-import operator
-from collections import UserList
-from datetime import datetime
+import json
+import re
+from collections import Counter, UserList
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import groupby, starmap
+from operator import attrgetter
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 Emotion = Literal["positive", "neutral", "negative"]
 
 
+class AccessToken(BaseModel):
+    access_token: str
+    expires_at: datetime
+
+    @field_validator("expires_at", mode="before")
+    @classmethod
+    def _parse_expires_at(cls, value: Any) -> Any:
+        # SberDevices возвращает время истечения в миллисекундах Unix time
+        if isinstance(value, int | float):
+            return datetime.fromtimestamp(value / 1000, tz=UTC)
+        return value
+
+    def expires_within(self, seconds: float) -> bool:
+        """Истекает ли токен в течение заданного количества секунд"""
+        return self.expires_at - datetime.now(UTC) <= timedelta(seconds=seconds)
+
+
 class Task(BaseModel):
     id: UUID
     status: Literal["NEW", "RUNNING", "CANCELED", "DONE", "ERROR"]
@@ -18,35 +40,156 @@ class Task(BaseModel):
     response_file_id: UUID | None = None
 
 
-class RecognizedSpeech(BaseModel):
+class StreamingHypothesis(BaseModel):
+    """Гипотеза потокового распознавания
+
+    Attributes:
+        text: Распознанный текст
+        normalized_text: Нормализованный текст (числа, пунктуация)
+        start: Начало фразы от начала потока в секундах
+        end: Конец фразы от начала потока в секундах
+        is_final: Окончательная гипотеза фразы (конец фразы), иначе промежуточная
+        speaker: Номер спикера, если включена диаризация
+    """
+
+    text: str = ""
+    normalized_text: str = ""
+    start: float = 0
+    end: float = 0
+    is_final: bool = False
+    speaker: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RecognizedSpeech:
+    """Распознанная фраза. Обычный slotted dataclass вместо pydantic модели:
+    многочасовые записи содержат десятки тысяч фраз, а валидация им не нужна.
+    """
+
     text: str
     speaker: int | None = None
     emotion: Emotion | None = None
+    start: float | None = None
+    end: float | None = None
 
     @classmethod
-    def from_response(cls, response: dict[str, Any]) -> Self:
+    def from_response(cls, response: dict[str, Any]) -> Self | None:
+        """Фраза из элемента файла результатов, None если текст не распознан"""
+        results = response.get("results")
+        if not results:
+            return None
+        speaker_info = response.get("speaker_info")
+        start, end = results[0].get("start"), results[0].get("end")
         return cls(
-            text=response["results"][0]["normalized_text"],
-            speaker=response["speaker_info"]["speaker_id"],
-            emotion=cls._parse_emotion(response["emotions_result"]),
+            text=results[0]["normalized_text"],
+            speaker=None if speaker_info is None else speaker_info["speaker_id"],
+            emotion=cls._parse_emotion(response.get("emotions_result")),
+            start=None if start is None else parse_seconds(start),
+            end=None if end is None else parse_seconds(end),
         )
 
     @staticmethod
-    def _parse_emotion(emotions_result: dict[Emotion, float]) -> Emotion:
-        return max(emotions_result.items(), key=operator.itemgetter(1))[0]
+    def _parse_emotion(emotions_result: dict[Emotion, float] | None) -> Emotion | None:
+        if not emotions_result:
+            return None
+        return max(emotions_result, key=emotions_result.__getitem__)
+
+
+def parse_seconds(value: str | float) -> float:
+    """Время из файла результатов в секундах, например '1.480s' -> 1.48"""
+    if isinstance(value, str):
+        return float(value.removesuffix("s"))
+    return float(value)
+
+
+def iter_json_array(content: str) -> Iterator[Any]:
+    """Разбор JSON массива с выдачей элементов по одному.
+
+    Текст массива целиком должен быть в памяти: разбор не потоковый. Элементы
+    декодируются из него по одному через `JSONDecoder.raw_decode`, поэтому не
+    создаётся только промежуточный список словарей для всего массива.
+
+    :param content: Полный текст JSON массива.
+    """
+
+    position = _skip_whitespace(content, 0)
+    if content[position:position + 1] != "[":
+        raise ValueError("JSON array expected")
+    position = _skip_whitespace(content, position + 1)
+    if content[position:position + 1] == "]":
+        return
+    while True:
+        item, position = _json_decoder.raw_decode(content, position)
+        yield item
+        position = _skip_whitespace(content, position)
+        separator = content[position:position + 1]
+        if separator == "]":
+            return
+        if not separator:
+            raise ValueError("Unterminated JSON array")
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' at position {position} of JSON array")
+        position = _skip_whitespace(content, position + 1)
+
+
+_json_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def _skip_whitespace(content: str, position: int) -> int:
+    match = _whitespace.match(content, position)
+    return position if match is None else match.end()
 
 
 class RecognizedSpeechList(UserList[RecognizedSpeech]):
+    @classmethod
+    def from_json(cls, content: bytes | str) -> Self:
+        """Быстрый разбор файла результатов распознавания.
+
+        :param content: JSON массив результатов распознавания.
+        :returns: Распознанная речь без фраз с пустым результатом.
+        """
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        recognized_speech_list = cls()
+        append = recognized_speech_list.data.append
+        for response in iter_json_array(content):
+            recognized_speech = RecognizedSpeech.from_response(response)
+            if recognized_speech is not None:
+                append(recognized_speech)
+        return recognized_speech_list
+
+    def iter_turns(self) -> Iterator[RecognizedSpeech]:
+        """Реплики: подряд идущие фразы одного спикера склеиваются в одну.
+
+        Эмоция реплики - самая частая эмоция её фраз. Фразы неопределённого спикера
+        (None или отрицательный номер) не склеиваются.
+        """
+        for speaker, group in groupby(self.data, key=attrgetter("speaker")):
+            phrases = list(group)
+            if speaker is None or speaker < 0 or len(phrases) == 1:
+                yield from phrases
+                continue
+            emotions = Counter(phrase.emotion for phrase in phrases if phrase.emotion)
+            yield RecognizedSpeech(
+                text=" ".join(phrase.text for phrase in phrases),
+                speaker=speaker,
+                emotion=emotions.most_common(1)[0][0] if emotions else None,
+                start=phrases[0].start,
+                end=phrases[-1].end,
+            )
+
     def to_markdown(self) -> str:
-        """Приводит распознанную речь в Markdown формат"""
+        """Приводит распознанную речь в Markdown формат, по строке на реплику"""
         if not self.data:
             return "No speech recognized"
-        lines: list[str] = []
-        for i, recognized_speech in enumerate(self.data):
-            parts = [f"{i}. {recognized_speech.text}"]
-            if recognized_speech.speaker is not None:
-                parts.append(f"({recognized_speech.speaker})")
-            if recognized_speech.emotion is not None:
-                parts.append(f"[{recognized_speech.emotion}]")
-            lines.append(" ".join(parts))
-        return "\n".join(lines)
+        return "\n".join(starmap(_format_turn, enumerate(self.iter_turns())))
+
+
+def _format_turn(number: int, recognized_speech: RecognizedSpeech) -> str:
+    line = f"{number}. {recognized_speech.text}"
+    if recognized_speech.speaker is not None:
+        line += f" ({recognized_speech.speaker})"
+    if recognized_speech.emotion is not None:
+        line += f" [{recognized_speech.emotion}]"
+    return line
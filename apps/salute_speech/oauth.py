@@ -1,11 +1,10 @@
-import base64
 import logging
 from uuid import uuid4
 
-import requests
-
 from .constants import SBER_DEVICES_BASE_URL
-from .exceptions import AuthenticationFailedError
+from .exceptions import AuthenticationFailedError, TransportError
+from .payloads import build_apikey, build_oauth_headers, parse_access_token
+from .transport import Transport
 
 logger = logging.getLogger(__name__)
 
@@ -15,50 +14,45 @@ class OAuthSberDevicesClient:
             self,
             apikey: str,
             scope: str,
-            client_id: str,
-            client_secret: str,
+            client_id: str | None = None,
+            client_secret: str | None = None,
             use_ssl: bool = False,
             base_url: str = SBER_DEVICES_BASE_URL,
+            transport: Transport | None = None,
     ) -> None:
         self._apikey = apikey
         self._scope = scope
         self._client_id = client_id
         self._client_secret = client_secret
         self._rq_uid = uuid4()
-        self._use_ssl = use_ssl
         self._base_url = base_url
+        self._owns_transport = transport is None
+        self._transport = transport or Transport(verify=use_ssl)
+
+    def close(self) -> None:
+        if self._owns_transport:
+            self._transport.close()
 
     def _build_apikey(self) -> str:
-        credentials = f"{self._client_id}:{self._client_secret}"
-        return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
+        return build_apikey(self._apikey, self._client_id, self._client_secret)
 
     def authenticate(self) -> str:
         """Производит аутентификацию клиента, выдавая access token"""
-        url = f"{self._base_url}/oauth"
-        headers = {
-            "Authorization": f"Bearer {self._build_apikey()}",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-            "RqUID": self._rq_uid,
-        }
-        payload = {"scope": self._scope}
+        logger.debug("Make request for authentication")
         try:
-            with requests.Session() as session:
-                logger.debug("Make request for authentication")
-                response = session.post(
-                    url=url, headers=headers, data=payload, verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
-            access_token = data.get("access_token")
-            if access_token is None:
-                error_message = "Authentication failed, because access token missing in response!"
-                logger.error(error_message)
-                raise AuthenticationFailedError(error_message)
-        except requests.exceptions.HTTPError as e:
-            error_message = f"Authentication failed with status {response.status_code}, error: {e}"
+            response = self._transport.request(
+                "POST",
+                f"{self._base_url}/oauth",
+                headers=build_oauth_headers(self._build_apikey(), self._rq_uid),
+                data={"scope": self._scope},
+            )
+            token = parse_access_token(response.json())
+        except TransportError as e:
+            error_message = f"Authentication failed with status {e.status}, error: {e}"
             logger.exception(error_message)
             raise AuthenticationFailedError(error_message) from e
-        else:
-            logger.info("Client successfully authenticated!")
-            return access_token
+        except AuthenticationFailedError:
+            logger.exception("Authentication failed")
+            raise
+        logger.info("Client successfully authenticated!")
+        return token.access_token
@@ -0,0 +1,153 @@
+from typing import Any
+
+import base64
+import json
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from .constants import ACCESS_TOKEN_LIFETIME, AUDIO_ENCODING_CONFIG, AudioEncoding, Language
+from .exceptions import AuthenticationFailedError
+from .models import AccessToken, RecognizedSpeechList, Task
+from .transcript import Transcript
+
+DEFAULT_SAMPLERATE = 16000
+MAX_SPEAKERS_COUNT = 10  # Ограничение Salute Speech на количество спикеров
+
+
+def build_apikey(apikey: str, client_id: str | None, client_secret: str | None) -> str:
+    """Ключ авторизации: переданный как есть или base64 от client_id:client_secret"""
+
+    if client_id is None or client_secret is None:
+        return apikey
+    credentials = f"{client_id}:{client_secret}"
+    return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
+
+
+def build_oauth_headers(apikey: str, rq_uid: UUID) -> dict[str, str]:
+    """Заголовки запроса access token у SberDevices"""
+
+    return {
+        "Authorization": f"Bearer {apikey}",
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Accept": "application/json",
+        "RqUID": f"{rq_uid}",
+    }
+
+
+def parse_access_token(data: dict[str, Any]) -> AccessToken:
+    """Разбор ответа SberDevices с access token.
+
+    :raises AuthenticationFailedError: В ответе нет access token.
+    """
+
+    if data.get("access_token") is None:
+        raise AuthenticationFailedError(
+            "Authentication failed, because access token missing in response!"
+        )
+    if data.get("expires_at") is None:
+        data["expires_at"] = datetime.now(UTC) + timedelta(seconds=ACCESS_TOKEN_LIFETIME)
+    return AccessToken.model_validate(data)
+
+
+def build_upload_headers(
+        access_token: str,
+        audio_encoding: AudioEncoding,
+        channels: int = 1,
+        samplerate: int | None = None,
+) -> dict[str, str]:
+    """Проверка параметров аудио и заголовки запроса загрузки файла.
+
+    :raises ValueError: Параметры аудио не поддерживаются кодировкой.
+    """
+
+    if samplerate is None:
+        samplerate = DEFAULT_SAMPLERATE
+    config = AUDIO_ENCODING_CONFIG.get(audio_encoding)
+    if config is None:
+        raise ValueError(
+            f"Unsupported audio encoding format! Input format {audio_encoding},"
+            f"supported formats {", ".join(list(AUDIO_ENCODING_CONFIG.keys()))}"
+        )
+    if channels > config["max_channels"]:
+        raise ValueError(
+            f"Format {audio_encoding} supports max {config['max_channels']} "
+            f"channels, but got {channels}"
+        )
+    if config["samplerate_range"] is not None:
+        min_samplerate, max_samplerate = config["samplerate_range"]
+        if not (min_samplerate < samplerate < max_samplerate):
+            raise ValueError(
+                f"Format {audio_encoding} requires sample rate between "
+                f"{min_samplerate} and {max_samplerate} Hz, but got {samplerate} Hz"
+            )
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": config["content_type"].format(samplerate=samplerate),
+    }
+
+
+def build_recognition_request(
+        access_token: str,
+        request_file_id: UUID,
+        audio_encoding: AudioEncoding,
+        model: str,
+        profanity_check: bool,
+        diarization: bool = True,
+        max_speakers_count: int = 1,
+        language: Language = "ru-RU",
+        channels: int = 1,
+        samplerate: int = DEFAULT_SAMPLERATE,
+        words: list[str] | None = None,
+        enable_letters: bool = False,
+        eou_timeout: int = 1,
+) -> tuple[dict[str, str], str]:
+    """Заголовки и JSON тело запроса создания задачи распознавания"""
+
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "X-Request-ID": f"{request_file_id}",
+    }
+    payload: dict[str, Any] = {
+        "options": {
+            "model": model,
+            "audio_encoding": audio_encoding,
+            "sample_rate": samplerate,
+            "language": language,
+            "enable_profanity_filter": profanity_check,
+            "channels_count": channels,
+            "speaker_separation_options": {
+                "enable": diarization,
+                "enable_only_main_speaker": False,
+                "count": min(max_speakers_count, MAX_SPEAKERS_COUNT),
+            }
+        },
+        # Убираем insight_models для одноканального аудио
+        "request_file_id": f"{request_file_id}",
+    }
+    if words:
+        payload["hints"] = {
+            "words": words,
+            "enable_letters": enable_letters,
+            "eou_timeout": eou_timeout
+        }
+    return headers, json.dumps(payload)
+
+
+def parse_task(data: dict[str, Any]) -> Task:
+    """Разбор ответа с задачей распознавания"""
+
+    return Task.model_validate(data["result"])
+
+
+def parse_recognized_speech(content: bytes | str) -> RecognizedSpeechList:
+    """Разбор файла с результатами распознавания"""
+
+    return RecognizedSpeechList.from_json(content)
+
+
+def parse_transcript(content: bytes | str) -> Transcript:
+    """Разбор файла с результатами распознавания в столбцовую расшифровку"""
+
+    return Transcript.from_json(content)
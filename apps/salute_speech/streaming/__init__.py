@@ -0,0 +1,7 @@
+__all__ = (
+    "StreamingSaluteSpeechClient",
+    "create_stub_server",
+)
+
+from .client import StreamingSaluteSpeechClient
+from .stub import create_stub_server
@@ -0,0 +1,154 @@
+from typing import Self
+
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from types import TracebackType
+
+import grpc
+
+from ..asyncio.oauth import AsyncOAuthSberDevicesClient, TokenCache
+from ..constants import SALUTE_SPEECH_GRPC_TARGET, AudioEncoding, Language
+from ..exceptions import StreamingRecognitionError
+from ..models import StreamingHypothesis
+from .protocol import (
+    RECOGNIZE_METHOD,
+    decode_response,
+    encode_audio_chunk,
+    encode_options,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingSaluteSpeechClient:
+    """Клиент потокового распознавания Salute Speech через gRPC.
+
+    Аудио отправляется частями по мере декодирования, а промежуточные и окончательные
+    гипотезы возвращаются сразу, без загрузки файла и опроса задачи. Сообщения
+    сериализуются минимальным protobuf кодеком (см. `protocol`), поэтому клиенту
+    не нужны сгенерированные stub-ы. Для тестов `target` можно направить
+    на локальный stub сервер с `secure=False`.
+    """
+
+    def __init__(
+            self,
+            apikey: str,
+            scope: str,
+            model: str = "general",
+            target: str = SALUTE_SPEECH_GRPC_TARGET,
+            secure: bool = True,
+            root_certificates: bytes | None = None,
+            client_id: str | None = None,
+            client_secret: str | None = None,
+            token_cache: TokenCache | None = None,
+    ) -> None:
+        """
+        :param apikey: Ключ авторизации (base64 от client_id:client_secret).
+        :param scope: Версия API.
+        :param model: Модель распознавания.
+        :param target: Адрес gRPC сервера в формате host:port.
+        :param secure: Использовать TLS (для локального stub сервера - False).
+        :param root_certificates: Корневые сертификаты в PEM (например, НУЦ Минцифры).
+        :param client_id: Идентификатор клиента, если ключ нужно собрать самостоятельно.
+        :param client_secret: Секрет клиента, если ключ нужно собрать самостоятельно.
+        :param token_cache: Общий кеш access token (*опционально).
+        """
+
+        self._model = model
+        self._target = target
+        self._secure = secure
+        self._root_certificates = root_certificates
+        self._channel: grpc.aio.Channel | None = None
+        self._oauth_client = AsyncOAuthSberDevicesClient(
+            apikey=apikey,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+            token_cache=token_cache,
+        )
+
+    @property
+    def channel(self) -> grpc.aio.Channel:
+        """gRPC канал клиента, создаётся при первом обращении"""
+        if self._channel is None:
+            if self._secure:
+                credentials = grpc.ssl_channel_credentials(self._root_certificates)
+                self._channel = grpc.aio.secure_channel(self._target, credentials)
+            else:
+                self._channel = grpc.aio.insecure_channel(self._target)
+        return self._channel
+
+    async def close(self) -> None:
+        """Закрывает gRPC канал и OAuth клиент"""
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+        await self._oauth_client.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def recognize(
+            self,
+            audio: AsyncIterable[bytes] | Iterable[bytes],
+            audio_encoding: AudioEncoding = "PCM_S16LE",
+            samplerate: int = 16000,
+            language: Language = "ru-RU",
+            partial_results: bool = True,
+    ) -> AsyncIterator[StreamingHypothesis]:
+        """Потоковое распознавание речи.
+
+        :param audio: Части аудио в порядке воспроизведения, например PCM фреймы
+            по мере декодирования.
+        :param audio_encoding: Аудио-кодек.
+        :param samplerate: Частота дискретизации аудио.
+        :param language: Язык распознавания.
+        :param partial_results: Возвращать промежуточные гипотезы.
+        :returns: Асинхронный генератор гипотез, окончательные помечены `is_final`.
+        :raises StreamingRecognitionError: Ошибка gRPC вызова.
+        """
+
+        options = encode_options(
+            audio_encoding=audio_encoding,
+            samplerate=samplerate,
+            language=language,
+            model=self._model,
+            partial_results=partial_results,
+        )
+
+        async def iter_requests() -> AsyncIterator[bytes]:
+            yield options
+            if isinstance(audio, AsyncIterable):
+                async for chunk in audio:
+                    yield encode_audio_chunk(chunk)
+            else:
+                for chunk in audio:
+                    yield encode_audio_chunk(chunk)
+
+        access_token = await self._oauth_client.authenticate()
+        recognize = self.channel.stream_stream(
+            RECOGNIZE_METHOD, response_deserializer=decode_response
+        )
+        call = recognize(
+            iter_requests(), metadata=(("authorization", f"Bearer {access_token}"),)
+        )
+        try:
+            async for hypothesis in call:
+                if hypothesis is not None:
+                    yield hypothesis
+        except grpc.aio.AioRpcError as e:
+            error_message = (
+                f"Streaming recognition failed with status {e.code().name}: {e.details()}"
+            )
+            logger.exception(error_message)
+            raise StreamingRecognitionError(error_message) from e
+        finally:
+            call.cancel()
@@ -0,0 +1,263 @@
+from typing import Final
+
+from collections.abc import Iterator
+
+from ..constants import AudioEncoding, Language
+from ..models import StreamingHypothesis
+
+# Полное имя метода потокового распознавания (smartspeech.recognition.v1)
+RECOGNIZE_METHOD: Final[str] = "/smartspeech.recognition.v1.SmartSpeech/Recognize"
+
+# Значения enum RecognitionOptions.AudioEncoding
+AUDIO_ENCODING_VALUES: Final[dict[AudioEncoding, int]] = {
+    "PCM_S16LE": 1,
+    "OPUS": 2,
+    "MP3": 3,
+    "FLAC": 4,
+    "ALAW": 5,
+    "MULAW": 6,
+}
+
+# Типы полей protobuf (wire types)
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_FIXED32 = 5
+
+# Номера используемых полей сообщений recognition.proto
+REQUEST_OPTIONS = 1
+REQUEST_AUDIO_CHUNK = 2
+OPTIONS_AUDIO_ENCODING = 1
+OPTIONS_SAMPLE_RATE = 2
+OPTIONS_LANGUAGE = 3
+OPTIONS_MODEL = 4
+OPTIONS_ENABLE_MULTI_UTTERANCE = 5
+OPTIONS_ENABLE_PARTIAL_RESULTS = 6
+OPTIONS_HYPOTHESES_COUNT = 7
+OPTIONAL_BOOL_ENABLE = 1
+RESPONSE_TRANSCRIPTION = 1
+TRANSCRIPTION_RESULTS = 1
+TRANSCRIPTION_EOU = 2
+TRANSCRIPTION_SPEAKER_INFO = 8
+HYPOTHESIS_TEXT = 1
+HYPOTHESIS_NORMALIZED_TEXT = 2
+HYPOTHESIS_START = 3
+HYPOTHESIS_END = 4
+SPEAKER_INFO_SPEAKER_ID = 1
+DURATION_SECONDS = 1
+DURATION_NANOS = 2
+
+INT64_SIGN_BIT = 1 << 63
+UINT64 = 1 << 64
+
+
+class ProtocolError(ValueError):
+    """Сообщение не соответствует формату protobuf"""
+
+
+def _encode_varint(value: int) -> bytes:
+    # Отрицательные int32/int64 кодируются как 64-битное беззнаковое число
+    value %= UINT64
+    encoded = bytearray()
+    while value > 0x7F:  # noqa: PLR2004
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _encode_field(number: int, value: int | bytes | str) -> bytes:
+    if isinstance(value, int):
+        return _encode_varint(number << 3 | WIRE_VARINT) + _encode_varint(value)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return (
+        _encode_varint(number << 3 | WIRE_LENGTH_DELIMITED)
+        + _encode_varint(len(value))
+        + value
+    )
+
+
+def _decode_varint(data: bytes | memoryview, position: int) -> tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        if position >= len(data):
+            raise ProtocolError("Truncated varint")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def _iter_fields(data: bytes | memoryview) -> Iterator[tuple[int, int | memoryview]]:
+    """Итерация по полям сообщения: (номер поля, значение).
+
+    Varint поля возвращаются числом, length-delimited - memoryview без копирования,
+    fixed32/fixed64 поля пропускаются (в используемых сообщениях их нет).
+    """
+
+    data = memoryview(data)
+    position = 0
+    while position < len(data):
+        key, position = _decode_varint(data, position)
+        number, wire_type = key >> 3, key & 0x07
+        if wire_type == WIRE_VARINT:
+            value, position = _decode_varint(data, position)
+            yield number, value
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            size, position = _decode_varint(data, position)
+            if position + size > len(data):
+                raise ProtocolError("Truncated length-delimited field")
+            yield number, data[position:position + size]
+            position += size
+        elif wire_type == WIRE_FIXED64:
+            position += 8
+        elif wire_type == WIRE_FIXED32:
+            position += 4
+        else:
+            raise ProtocolError(f"Unsupported wire type {wire_type}")
+
+
+def _decode_int(value: int) -> int:
+    return value - UINT64 if value & INT64_SIGN_BIT else value
+
+
+def _decode_duration(data: memoryview) -> float:
+    seconds, nanos = 0, 0
+    for number, value in _iter_fields(data):
+        if number == DURATION_SECONDS:
+            seconds = _decode_int(value)
+        elif number == DURATION_NANOS:
+            nanos = _decode_int(value)
+    return seconds + nanos / 1e9
+
+
+def encode_options(
+        audio_encoding: AudioEncoding,
+        samplerate: int,
+        language: Language,
+        model: str,
+        partial_results: bool = True,
+        multi_utterance: bool = True,
+        hypotheses_count: int = 1,
+) -> bytes:
+    """Первое сообщение потока: RecognitionRequest с опциями распознавания.
+
+    :param audio_encoding: Аудио-кодек.
+    :param samplerate: Частота дискретизации аудио.
+    :param language: Язык распознавания.
+    :param model: Модель распознавания.
+    :param partial_results: Возвращать промежуточные гипотезы.
+    :param multi_utterance: Распознавать несколько фраз в одном потоке.
+    :param hypotheses_count: Количество гипотез на фразу.
+    :returns: Сериализованное сообщение.
+    """
+
+    if audio_encoding not in AUDIO_ENCODING_VALUES:
+        raise ValueError(f"Audio encoding {audio_encoding} is not supported by streaming API")
+    options = b"".join((
+        _encode_field(OPTIONS_AUDIO_ENCODING, AUDIO_ENCODING_VALUES[audio_encoding]),
+        _encode_field(OPTIONS_SAMPLE_RATE, samplerate),
+        _encode_field(OPTIONS_LANGUAGE, language),
+        _encode_field(OPTIONS_MODEL, model),
+        _encode_field(
+            OPTIONS_ENABLE_MULTI_UTTERANCE,
+            _encode_field(OPTIONAL_BOOL_ENABLE, int(multi_utterance)),
+        ),
+        _encode_field(
+            OPTIONS_ENABLE_PARTIAL_RESULTS,
+            _encode_field(OPTIONAL_BOOL_ENABLE, int(partial_results)),
+        ),
+        _encode_field(OPTIONS_HYPOTHESES_COUNT, hypotheses_count),
+    ))
+    return _encode_field(REQUEST_OPTIONS, options)
+
+
+def encode_audio_chunk(chunk: bytes) -> bytes:
+    """Сообщение потока с частью аудио"""
+
+    return _encode_field(REQUEST_AUDIO_CHUNK, chunk)
+
+
+def decode_response(data: bytes) -> StreamingHypothesis | None:
+    """Разбор RecognitionResponse в гипотезу распознавания.
+
+    :param data: Сериализованное сообщение.
+    :returns: Лучшая гипотеза или None, если ответ не содержит распознанного текста
+        (например, служебная информация о бэкенде).
+    """
+
+    for number, value in _iter_fields(data):
+        if number == RESPONSE_TRANSCRIPTION and isinstance(value, memoryview):
+            return _decode_transcription(value)
+    return None
+
+
+def _decode_transcription(data: memoryview) -> StreamingHypothesis | None:
+    hypothesis: memoryview | None = None
+    eou, speaker = False, None
+    for number, value in _iter_fields(data):
+        if number == TRANSCRIPTION_RESULTS and hypothesis is None:
+            hypothesis = value  # Гипотезы упорядочены по убыванию уверенности
+        elif number == TRANSCRIPTION_EOU:
+            eou = bool(value)
+        elif number == TRANSCRIPTION_SPEAKER_INFO:
+            for info_number, info_value in _iter_fields(value):
+                if info_number == SPEAKER_INFO_SPEAKER_ID:
+                    speaker = _decode_int(info_value)
+    if hypothesis is None:
+        return None
+    return StreamingHypothesis(**_decode_hypothesis(hypothesis), is_final=eou, speaker=speaker)
+
+
+def _decode_hypothesis(data: memoryview) -> dict[str, str | float]:
+    fields: dict[str, str | float] = {}
+    for number, value in _iter_fields(data):
+        if number == HYPOTHESIS_TEXT:
+            fields["text"] = str(value, "utf-8")
+        elif number == HYPOTHESIS_NORMALIZED_TEXT:
+            fields["normalized_text"] = str(value, "utf-8")
+        elif number == HYPOTHESIS_START:
+            fields["start"] = _decode_duration(value)
+        elif number == HYPOTHESIS_END:
+            fields["end"] = _decode_duration(value)
+    return fields
+
+
+def encode_response(hypothesis: StreamingHypothesis) -> bytes:
+    """Сериализация гипотезы в RecognitionResponse (для локального stub сервера)"""
+
+    def encode_duration(seconds: float) -> bytes:
+        whole = int(seconds)
+        return _encode_field(DURATION_SECONDS, whole) + _encode_field(
+            DURATION_NANOS, round((seconds - whole) * 1e9)
+        )
+
+    encoded_hypothesis = b"".join((
+        _encode_field(HYPOTHESIS_TEXT, hypothesis.text),
+        _encode_field(HYPOTHESIS_NORMALIZED_TEXT, hypothesis.normalized_text),
+        _encode_field(HYPOTHESIS_START, encode_duration(hypothesis.start)),
+        _encode_field(HYPOTHESIS_END, encode_duration(hypothesis.end)),
+    ))
+    transcription = _encode_field(TRANSCRIPTION_RESULTS, encoded_hypothesis)
+    transcription += _encode_field(TRANSCRIPTION_EOU, int(hypothesis.is_final))
+    if hypothesis.speaker is not None:
+        transcription += _encode_field(
+            TRANSCRIPTION_SPEAKER_INFO,
+            _encode_field(SPEAKER_INFO_SPEAKER_ID, hypothesis.speaker),
+        )
+    return _encode_field(RESPONSE_TRANSCRIPTION, transcription)
+
+
+def decode_audio_chunk(data: bytes) -> bytes | None:
+    """Разбор RecognitionRequest (для локального stub сервера).
+
+    :returns: Байты аудио или None для сообщения с опциями.
+    """
+
+    for number, value in _iter_fields(data):
+        if number == REQUEST_AUDIO_CHUNK and isinstance(value, memoryview):
+            return value.tobytes()
+    return None
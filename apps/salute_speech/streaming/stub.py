@@ -0,0 +1,48 @@
+from collections.abc import AsyncIterator, Callable
+
+import grpc
+
+from ..models import StreamingHypothesis
+from .protocol import RECOGNIZE_METHOD, decode_audio_chunk, encode_response
+
+type RecognizeHandler = Callable[[AsyncIterator[bytes]], AsyncIterator[StreamingHypothesis]]
+"""Обработчик stub сервера: принимает части аудио, возвращает гипотезы"""
+
+
+def create_stub_server(handler: RecognizeHandler, target: str = "127.0.0.1:0") -> tuple[
+    grpc.aio.Server, int
+]:
+    """Локальный gRPC сервер с методом потокового распознавания Salute Speech.
+
+    Используется для тестов и локальной разработки без доступа к Salute Speech,
+    клиент подключается к нему с `secure=False`. Сервер нужно запустить через
+    `await server.start()` и остановить через `await server.stop(None)`.
+
+    :param handler: Асинхронный генератор гипотез по потоку частей аудио.
+    :param target: Адрес прослушивания, порт 0 - любой свободный.
+    :returns: gRPC сервер и порт, на котором он слушает.
+    """
+
+    async def recognize(
+            request_iterator: AsyncIterator[bytes], context: grpc.aio.ServicerContext  # noqa: ARG001
+    ) -> AsyncIterator[StreamingHypothesis]:
+        async def iter_audio() -> AsyncIterator[bytes]:
+            async for request in request_iterator:
+                chunk = decode_audio_chunk(request)
+                if chunk is not None:
+                    yield chunk
+
+        async for hypothesis in handler(iter_audio()):
+            yield hypothesis
+
+    service, method = RECOGNIZE_METHOD.removeprefix("/").split("/")
+    server = grpc.aio.server()
+    server.add_generic_rpc_handlers((
+        grpc.method_handlers_generic_handler(service, {
+            method: grpc.stream_stream_rpc_method_handler(
+                recognize, response_serializer=encode_response
+            ),
+        }),
+    ))
+    port = server.add_insecure_port(target)
+    return server, port
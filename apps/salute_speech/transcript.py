@@ -0,0 +1,257 @@
+from typing import Any, Self
+
+import math
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+
+from .models import Emotion, RecognizedSpeech, RecognizedSpeechList, iter_json_array, parse_seconds
+
+UNKNOWN_SPEAKER = -1
+COLUMNS = (
+    "starts", "ends", "speakers", "texts", "emotions",
+    "word_index", "words", "word_starts", "word_ends",
+)
+
+
+class Transcript:
+    """Распознанная речь в столбцовом представлении.
+
+    Вместо объекта на каждую фразу фразы хранятся параллельными массивами
+    (начало, конец, спикер, текст, эмоция), а слова фраз - отдельными массивами,
+    где слова фразы `i` занимают диапазон `word_index[i]:word_index[i + 1]`.
+    Время указывается в секундах от начала записи (NaN, если неизвестно),
+    спикер -1 означает, что спикер не определён.
+
+    Attributes:
+        starts: Начала фраз
+        ends: Концы фраз
+        speakers: Номера спикеров фраз
+        texts: Нормализованные тексты фраз
+        emotions: Эмоции фраз
+        word_index: Индексы первых слов фраз (на один элемент длиннее фраз)
+        words: Слова всех фраз подряд
+        word_starts: Начала слов
+        word_ends: Концы слов
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.ends = array("d")
+        self.speakers = array("i")
+        self.texts: list[str] = []
+        self.emotions: list[Emotion | None] = []
+        self.word_index = array("q", [0])
+        self.words: list[str] = []
+        self.word_starts = array("d")
+        self.word_ends = array("d")
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(phrases={len(self)}, words={len(self.words)})"
+
+    @property
+    def duration(self) -> float:
+        """Время окончания последней фразы с известным временем"""
+        return max((end for end in self.ends if not math.isnan(end)), default=0.0)
+
+    @property
+    def speakers_count(self) -> int:
+        """Количество спикеров (по максимальному номеру определённого спикера)"""
+        return max(self.speakers, default=UNKNOWN_SPEAKER) + 1
+
+    def append(
+            self,
+            text: str,
+            start: float | None = None,
+            end: float | None = None,
+            speaker: int | None = None,
+            emotion: Emotion | None = None,
+            words: Iterable[tuple[str, float, float]] = (),
+    ) -> None:
+        """Добавление фразы в конец расшифровки.
+
+        :param text: Текст фразы.
+        :param start: Начало фразы в секундах.
+        :param end: Конец фразы в секундах.
+        :param speaker: Номер спикера.
+        :param emotion: Эмоция фразы.
+        :param words: Слова фразы: (слово, начало, конец).
+        """
+        self.starts.append(math.nan if start is None else start)
+        self.ends.append(math.nan if end is None else end)
+        self.speakers.append(UNKNOWN_SPEAKER if speaker is None else speaker)
+        self.texts.append(text)
+        self.emotions.append(emotion)
+        for word, word_start, word_end in words:
+            self.words.append(word)
+            self.word_starts.append(word_start)
+            self.word_ends.append(word_end)
+        self.word_index.append(len(self.words))
+
+    @classmethod
+    def from_json(cls, content: bytes | str) -> Self:
+        """Разбор файла результатов распознавания с таймингами фраз и слов.
+
+        :param content: JSON массив результатов распознавания.
+        :returns: Расшифровка без фраз с пустым результатом.
+        """
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        transcript = cls()
+        for response in iter_json_array(content):
+            recognized_speech = RecognizedSpeech.from_response(response)
+            if recognized_speech is None:
+                continue
+            results = response["results"]
+            transcript.append(
+                recognized_speech.text,
+                start=recognized_speech.start,
+                end=recognized_speech.end,
+                speaker=recognized_speech.speaker,
+                emotion=recognized_speech.emotion,
+                words=(
+                    (alignment["word"], parse_seconds(alignment["start"]),
+                     parse_seconds(alignment["end"]))
+                    for alignment in results[0].get("word_alignments") or ()
+                ),
+            )
+        return transcript
+
+    @classmethod
+    def from_recognized_speech(cls, recognized_speech_list: Iterable[RecognizedSpeech]) -> Self:
+        """Расшифровка из фраз (без таймингов слов)"""
+        transcript = cls()
+        for recognized_speech in recognized_speech_list:
+            transcript.append(
+                recognized_speech.text,
+                start=recognized_speech.start,
+                end=recognized_speech.end,
+                speaker=recognized_speech.speaker,
+                emotion=recognized_speech.emotion,
+            )
+        return transcript
+
+    def to_dict(self) -> dict[str, list[Any]]:
+        """Столбцы расшифровки в виде списков для сериализации в JSON.
+        Неизвестное время (NaN) заменяется на None.
+        """
+        data: dict[str, list[Any]] = {}
+        for column in COLUMNS:
+            values = getattr(self, column)
+            if isinstance(values, array) and values.typecode == "d":
+                data[column] = [None if math.isnan(value) else value for value in values]
+            else:
+                data[column] = list(values)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, list[Any]]) -> Self:
+        """Расшифровка из столбцов `to_dict`"""
+        transcript = cls()
+        for column in COLUMNS:
+            values = getattr(transcript, column)
+            if isinstance(values, array):
+                if values.typecode == "d":
+                    values = array("d", (math.nan if v is None else v for v in data[column]))
+                else:
+                    values = array(values.typecode, data[column])
+                setattr(transcript, column, values)
+            else:
+                values.extend(data[column])
+        return transcript
+
+    def extend(self, other: Self, offset: float = 0.0, speaker_offset: int = 0) -> None:
+        """Добавление расшифровки следующего сегмента записи.
+
+        Время фраз и слов сегмента сдвигается на `offset` (начало сегмента в записи),
+        номера определённых спикеров - на `speaker_offset`. Если конец расшифровки
+        заходит за начало сегмента (сегменты перекрываются), перекрытие склеивается:
+        фразы, начатые после начала сегмента, отбрасываются, так как сегмент содержит
+        их целиком, а начальные фразы сегмента, большая часть которых уже
+        расшифрована (обрезанное начало фразы на границе), пропускаются.
+
+        :param other: Расшифровка сегмента со временем от начала сегмента.
+        :param offset: Начало сегмента от начала записи в секундах.
+        :param speaker_offset: Сдвиг нумерации спикеров сегмента.
+        """
+        length = len(self)
+        while length and self.starts[length - 1] > offset:
+            length -= 1
+        self.truncate(length)
+        last_end = self.duration
+        first = 0
+        while first < len(other):
+            start, end = other.starts[first] + offset, other.ends[first] + offset
+            # NaN сравнения ложны: фразы без времени не пропускаются
+            if not (start + end) / 2 < last_end:
+                break
+            first += 1
+        word_first, word_offset = other.word_index[first], len(self.words)
+        self.starts.extend(array("d", (start + offset for start in other.starts[first:])))
+        self.ends.extend(array("d", (end + offset for end in other.ends[first:])))
+        self.speakers.extend(array("i", (
+            speaker if speaker == UNKNOWN_SPEAKER else speaker + speaker_offset
+            for speaker in other.speakers[first:]
+        )))
+        self.texts.extend(other.texts[first:])
+        self.emotions.extend(other.emotions[first:])
+        self.word_index.extend(array("q", (
+            index - word_first + word_offset for index in other.word_index[first + 1:]
+        )))
+        self.words.extend(other.words[word_first:])
+        self.word_starts.extend(array("d", (
+            start + offset for start in other.word_starts[word_first:]
+        )))
+        self.word_ends.extend(array("d", (end + offset for end in other.word_ends[word_first:])))
+
+    def truncate(self, length: int) -> None:
+        """Удаление фраз начиная с `length`"""
+        if length >= len(self):
+            return
+        word_length = self.word_index[length]
+        for column in ("starts", "ends", "speakers", "texts", "emotions"):
+            del getattr(self, column)[length:]
+        del self.word_index[length + 1:]
+        for column in ("words", "word_starts", "word_ends"):
+            del getattr(self, column)[word_length:]
+
+    def index_at(self, seconds: float) -> int:
+        """Индекс фразы, звучащей (или последней начатой) в момент `seconds`, -1 если
+        момент раньше первой фразы. Позволяет сопоставить найденный текст с аудио,
+        фразы должны иметь известное время начала.
+        """
+        return bisect_right(self.starts, seconds) - 1
+
+    def iter_words(self, index: int) -> Iterator[tuple[str, float, float]]:
+        """Слова фразы с индексом `index`: (слово, начало, конец)"""
+        word_slice = slice(self.word_index[index], self.word_index[index + 1])
+        return zip(
+            self.words[word_slice],
+            self.word_starts[word_slice],
+            self.word_ends[word_slice],
+            strict=True,
+        )
+
+    def to_recognized_speech(self) -> RecognizedSpeechList:
+        """Фразы расшифровки в виде RecognizedSpeechList"""
+        return RecognizedSpeechList(
+            RecognizedSpeech(
+                text=text,
+                speaker=None if speaker == UNKNOWN_SPEAKER else speaker,
+                emotion=emotion,
+                start=None if math.isnan(start) else start,
+                end=None if math.isnan(end) else end,
+            )
+            for start, end, speaker, text, emotion in zip(
+                self.starts, self.ends, self.speakers, self.texts, self.emotions, strict=True
+            )
+        )
+
+    def to_markdown(self) -> str:
+        """Приводит расшифровку в Markdown формат, по строке на реплику"""
+        return self.to_recognized_speech().to_markdown()
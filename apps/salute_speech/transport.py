@@ -0,0 +1,327 @@
+from typing import Any
+
+import email.utils
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+from .constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CONNECT_TIMEOUT,
+    NON_IDEMPOTENT_RETRY_STATUSES,
+    READ_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+)
+from .exceptions import CircuitOpenError, TransportError
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENT_ERROR = 400
+HTTP_SERVER_ERROR = 500
+
+
+@dataclass(frozen=True, slots=True)
+class Response:
+    """Ответ HTTP сервера, прочитанный целиком"""
+
+    status: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Политика повторов временных ошибок: экспоненциальная задержка с full jitter.
+
+    Attributes:
+        max_attempts: Всего попыток запроса, включая первую
+        base_delay: Базовая задержка перед повтором в секундах
+        max_delay: Максимальная задержка перед повтором в секундах
+        retry_statuses: HTTP статусы, после которых запрос повторяется
+    """
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    retry_statuses: frozenset[int] = field(default=RETRY_STATUSES)
+
+    def should_retry(
+            self,
+            attempt: int,
+            status: int | None = None,
+            idempotent: bool = True,
+            sent: bool = True,
+            retry_after: str | None = None,
+    ) -> bool:
+        """Нужно ли повторить запрос после неудачной попытки.
+
+        Неидемпотентный запрос мог быть выполнен сервером, даже если ответ не получен
+        (таймаут чтения, 5xx), поэтому он повторяется только если не был отправлен
+        (ошибка соединения) или сервер явно отказал 429/503 с `Retry-After`.
+
+        :param attempt: Номер неудачной попытки, начиная с 0.
+        :param status: HTTP статус ответа или None при сетевой ошибке/таймауте.
+        :param idempotent: Можно ли безопасно выполнить запрос повторно.
+        :param sent: Мог ли запрос дойти до сервера (False при ошибке соединения).
+        :param retry_after: Значение заголовка `Retry-After`, если есть.
+        """
+
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if not idempotent and sent:
+            return status in NON_IDEMPOTENT_RETRY_STATUSES and retry_after is not None
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Задержка перед следующей попыткой в секундах.
+
+        Заголовок `Retry-After` (секунды или HTTP-дата) имеет приоритет над backoff,
+        но тоже ограничен `max_delay`.
+
+        :param attempt: Номер неудачной попытки, начиная с 0.
+        :param retry_after: Значение заголовка `Retry-After`, если есть.
+        """
+
+        if retry_after is not None:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))  # noqa: S311
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Разбор заголовка `Retry-After` в секунды ожидания"""
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Circuit breaker для одного хоста.
+
+    После `failure_threshold` ошибок подряд (сетевые ошибки, таймауты, 5xx) цепь
+    размыкается и запросы сразу завершаются CircuitOpenError. Через `reset_timeout`
+    пропускается один пробный запрос: успех замыкает цепь, ошибка размыкает её снова,
+    а прерванная попытка освобождает пробный запрос для следующего.
+    Потокобезопасен, поэтому один экземпляр разделяют синхронный и асинхронный клиенты.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self.host = host
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """Проверка перед запросом.
+
+        :raises CircuitOpenError: Цепь разомкнута и пробный запрос ещё не положен.
+        """
+
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._probing or time.monotonic() - self._opened_at < self._reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit breaker for {self.host} is open, requests are rejected"
+                )
+            self._probing = True  # Пропускаем один пробный запрос
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit breaker for %s is closed", self.host)
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_cancelled(self) -> None:
+        """Попытка прервана без ответа хоста (отмена, непредвиденная ошибка): пробный
+        запрос освобождается, а состояние цепи не меняется.
+        """
+
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self._failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(
+                        "Circuit breaker for %s is open after %s failures",
+                        self.host, self._failures,
+                    )
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Общий для процесса circuit breaker хоста из URL"""
+
+    host = urlsplit(url).netloc
+    with _circuit_breakers_lock:
+        if host not in _circuit_breakers:
+            _circuit_breakers[host] = CircuitBreaker(host)
+        return _circuit_breakers[host]
+
+
+def is_connection_error(error: requests.RequestException) -> bool:
+    """Не удалось установить соединение, то есть запрос точно не отправлен"""
+
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    # NewConnectionError (отказ в соединении, ошибка DNS) наследует ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def is_success(status: int) -> bool:
+    """Успешный ли HTTP статус ответа (2xx/3xx)"""
+
+    return status < HTTP_CLIENT_ERROR
+
+
+def is_failure(status: int | None) -> bool:
+    """Считается ли результат попытки ошибкой хоста для circuit breaker"""
+
+    return status is None or status >= HTTP_SERVER_ERROR
+
+
+class Transport:
+    """Синхронный HTTP транспорт Salute Speech поверх `requests`.
+
+    Держит одну сессию с пулом соединений, повторяет временные ошибки по `RetryPolicy`
+    с учётом `Retry-After` и защищает хост общим circuit breaker.
+    """
+
+    def __init__(
+            self,
+            retry_policy: RetryPolicy | None = None,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            read_timeout: float = READ_TIMEOUT,
+            verify: bool = False,
+    ) -> None:
+        """
+        :param retry_policy: Политика повторов, по умолчанию `RetryPolicy()`.
+        :param connect_timeout: Таймаут установки соединения в секундах.
+        :param read_timeout: Таймаут ожидания данных от сервера в секундах.
+        :param verify: Проверять SSL сертификат.
+        """
+
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._timeout = (connect_timeout, read_timeout)
+        self._verify = verify
+        self._session = requests.Session()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def request(
+            self,
+            method: str,
+            url: str,
+            headers: Mapping[str, str] | None = None,
+            params: Mapping[str, str] | None = None,
+            data: bytes | str | Mapping[str, str] | None = None,
+            idempotent: bool = True,
+    ) -> Response:
+        """Выполнение запроса с повторами временных ошибок.
+
+        :param idempotent: Можно ли повторять запрос после таймаута чтения и 5xx.
+        :returns: Ответ с успешным (2xx/3xx) статусом.
+        :raises TransportError: Ответ с ошибкой или исчерпаны попытки.
+        :raises CircuitOpenError: Хост недоступен по данным circuit breaker.
+        """
+
+        circuit_breaker = get_circuit_breaker(url)
+        attempt = 0
+        while True:
+            circuit_breaker.before_request()
+            try:
+                response = self._session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    timeout=self._timeout,
+                    verify=self._verify,
+                )
+            except requests.RequestException as e:
+                circuit_breaker.record_failure()
+                if not self._retry_policy.should_retry(
+                        attempt, idempotent=idempotent, sent=not is_connection_error(e)
+                ):
+                    raise TransportError(f"{method} {url} failed: {e}") from e
+                delay = self._retry_policy.delay(attempt)
+                logger.warning("%s %s failed: %s, retry in %.2f s", method, url, e, delay)
+            except BaseException:
+                circuit_breaker.record_cancelled()
+                raise
+            else:
+                if is_failure(response.status_code):
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+                if is_success(response.status_code):
+                    return Response(response.status_code, response.headers, response.content)
+                retry_after = response.headers.get("Retry-After")
+                if not self._retry_policy.should_retry(
+                        attempt, response.status_code, idempotent, retry_after=retry_after
+                ):
+                    raise TransportError(
+                        f"{method} {url} failed with status {response.status_code}: "
+                        f"{response.text[:200]}",
+                        status=response.status_code,
+                    )
+                delay = self._retry_policy.delay(attempt, retry_after)
+                logger.warning(
+                    "%s %s failed with status %s, retry in %.2f s",
+                    method, url, response.status_code, delay,
+                )
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,135 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+
+from modules.audio.application import (
+    AudioSegmentStore,
+    TranscribedSegmentsCollector,
+    TranscriptionOrchestrator,
+)
+from modules.audio.domain import AudioFormat, AudioSegmentTranscribedEvent, FileAudioSegment
+from modules.media.application import Storage
+from modules.media.domain import File, FilePart, Filepath
+from salute_speech.transcript import Transcript
+
+
+class MemoryStorage(Storage):
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploaded_parts: list[int] = []
+
+    async def upload(self, file: File) -> None:
+        self.objects[file.path] = file.content
+
+    async def upload_multipart(self, file_parts: AsyncIterable[FilePart]) -> None:
+        chunks = []
+        async for file_part in file_parts:
+            self.uploaded_parts.append(file_part.size)
+            chunks.append(bytes(file_part.content))
+            path = file_part.path
+        self.objects[path] = b"".join(chunks)
+
+    async def download(self, filepath: Filepath) -> File | None:
+        raise NotImplementedError
+
+    async def download_multipart(
+            self, filepath: Filepath, part_size: int
+    ) -> AsyncIterator[FilePart]:
+        content = self.objects[filepath]
+        for offset in range(0, len(content), part_size):
+            yield FilePart(
+                path=filepath,
+                mime_type="audio/wav",
+                number=offset // part_size + 1,
+                offset=offset,
+                content=memoryview(content[offset:offset + part_size]),
+                total_size=len(content),
+                total_parts=-(-len(content) // part_size),
+                uploaded_at=None,
+            )
+
+    async def remove(self, filepath: Filepath) -> bool:
+        return self.objects.pop(filepath, None) is not None
+
+    async def exists(self, filepath: Filepath) -> bool:
+        return filepath in self.objects
+
+
+def make_event(
+        number: int, offset: float | None, *phrases: tuple[str, float, float, int]
+) -> AudioSegmentTranscribedEvent:
+    transcript = Transcript()
+    for text, start, end, speaker in phrases:
+        transcript.append(text, start=start, end=end, speaker=speaker)
+    return AudioSegmentTranscribedEvent(
+        number=number, total_count=2, duration=10, offset=offset, transcript=transcript.to_dict()
+    )
+
+
+def test_reassemble_events_in_segment_order() -> None:
+    events = [
+        make_event(2, 8, ("b", 0, 1.5, 0), ("c", 2, 4, 0)),
+        make_event(1, 0, ("a", 0, 4, 0), ("b", 5, 9.5, 1)),
+    ]
+
+    transcript = TranscriptionOrchestrator.reassemble_events(events)
+
+    assert transcript.texts == ["a", "b", "c"]
+    assert list(transcript.starts) == [0, 5, 10]
+    assert list(transcript.speakers) == [0, 1, 2]
+
+
+def test_reassemble_events_without_offset() -> None:
+    events = [make_event(1, None, ("a", 0, 4, 0)), make_event(2, None, ("b", 1, 2, 0))]
+
+    transcript = TranscriptionOrchestrator.reassemble_events(events)
+
+    assert list(transcript.starts) == [0, 11]
+
+
+def make_record_event(
+        record_id: str, number: int, total_count: int | None
+) -> AudioSegmentTranscribedEvent:
+    return AudioSegmentTranscribedEvent(
+        number=number,
+        total_count=total_count,
+        duration=10,
+        transcript=Transcript().to_dict(),
+        metadata={"collection_id": "collection", "record_id": record_id},
+    )
+
+
+def test_collector_returns_events_after_last_missing_segment() -> None:
+    collector = TranscribedSegmentsCollector()
+
+    assert collector.add(make_record_event("a", 3, 3)) is None
+    assert collector.add(make_record_event("b", 1, 1)) is not None
+    assert collector.add(make_record_event("a", 1, None)) is None
+    assert collector.add(make_record_event("a", 1, None)) is None
+    events = collector.add(make_record_event("a", 2, None))
+
+    assert events is not None
+    assert sorted(event.number for event in events) == [1, 2, 3]
+    assert collector.pending_count == 0
+
+
+def test_segment_store_streams_file_segments(tmp_path: Path) -> None:
+    content = bytes(range(256)) * 64
+    source = tmp_path / "source.wav"
+    source.write_bytes(content)
+    segment = FileAudioSegment(
+        number=1, total_count=1, format=AudioFormat.WAV, size=len(content), duration=1,
+        filepath=source,
+    )
+    storage = MemoryStorage()
+    segment_store = AudioSegmentStore(storage)
+
+    async def main() -> FileAudioSegment:
+        stored_segment = await segment_store.put(segment, stage="enhanced")
+        return await segment_store.download(stored_segment, tmp_path / "downloaded.wav")
+
+    downloaded = asyncio.run(main())
+
+    assert storage.uploaded_parts == [len(content)]
+    assert downloaded.filepath.read_bytes() == content
+    assert downloaded.model_dump(exclude={"filepath"}) == segment.model_dump(exclude={"filepath"})
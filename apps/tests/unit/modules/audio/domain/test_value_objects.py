@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from modules.audio.domain import AudioFormat, FileAudioSegment
+
+
+def make_segment(filepath: Path) -> FileAudioSegment:
+    return FileAudioSegment(
+        number=1, total_count=1, format=AudioFormat.WAV, size=1, duration=1, filepath=filepath
+    )
+
+
+def test_view_maps_file_content(tmp_path: Path) -> None:
+    filepath = tmp_path / "segment.wav"
+    filepath.write_bytes(b"audio")
+
+    with make_segment(filepath).view() as view:
+        assert view.tobytes() == b"audio"
+
+
+def test_view_of_empty_file(tmp_path: Path) -> None:
+    filepath = tmp_path / "segment.wav"
+    filepath.touch()
+
+    with make_segment(filepath).view() as view:
+        assert view.nbytes == 0
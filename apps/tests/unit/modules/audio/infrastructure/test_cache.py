@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from redis import RedisError
+
+from modules.audio.infrastructure.cache import SaluteSpeechTokenCache
+from modules.shared_kernel.application.exceptions import CacheSetError
+from salute_speech.asyncio.oauth import AsyncOAuthSberDevicesClient
+from salute_speech.models import AccessToken
+
+SECRET = "secret-access-token"
+
+
+class FakeRedis:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.data: dict[str, bytes] = {}
+
+    async def set(self, key: str, value: str, ex: timedelta | None = None) -> None:  # noqa: ARG002
+        if self.error is not None:
+            raise self.error
+        self.data[key] = value.encode()
+
+    async def get(self, key: str) -> bytes | None:
+        if self.error is not None:
+            raise self.error
+        return self.data.get(key)
+
+
+def create_cache(redis: FakeRedis) -> SaluteSpeechTokenCache:
+    cache = SaluteSpeechTokenCache(
+        url="redis://localhost:6379",
+        prefix="salute-speech:access-token",
+        ttl=timedelta(minutes=30),
+    )
+    cache.redis = redis
+    return cache
+
+
+def create_token() -> AccessToken:
+    return AccessToken(access_token=SECRET, expires_at=datetime.now(UTC) + timedelta(minutes=30))
+
+
+def assert_not_logged(caplog: pytest.LogCaptureFixture) -> None:
+    assert SECRET not in caplog.text
+    for record in caplog.records:
+        assert SECRET not in repr(record.__dict__)
+
+
+def test_token_is_not_logged_on_set(caplog: pytest.LogCaptureFixture) -> None:
+    redis = FakeRedis()
+    cache = create_cache(redis)
+    caplog.set_level(logging.DEBUG)
+
+    asyncio.run(cache.set("token", create_token()))
+    cached_token = asyncio.run(cache.get("token"))
+
+    assert cached_token is not None
+    assert cached_token.access_token == SECRET
+    assert_not_logged(caplog)
+
+
+def test_token_is_not_logged_on_set_error(caplog: pytest.LogCaptureFixture) -> None:
+    cache = create_cache(FakeRedis(RedisError("connection lost")))
+    caplog.set_level(logging.DEBUG)
+
+    with pytest.raises(CacheSetError) as error:
+        asyncio.run(cache.set("token", create_token()))
+
+    assert SECRET not in str(error.value)
+    assert_not_logged(caplog)
+
+
+def test_oauth_client_does_not_log_token(
+        caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    redis = FakeRedis()
+    cache = create_cache(redis)
+    caplog.set_level(logging.DEBUG)
+
+    async def authenticate() -> str:
+        oauth_client = AsyncOAuthSberDevicesClient(
+            apikey="apikey", scope="SALUTE_SPEECH_PERS", token_cache=cache
+        )
+
+        async def request_token() -> AccessToken:
+            await asyncio.sleep(0)
+            return create_token()
+
+        monkeypatch.setattr(oauth_client, "_request_token", request_token)
+        try:
+            return await oauth_client.authenticate()
+        finally:
+            await oauth_client.close()
+
+    assert asyncio.run(authenticate()) == SECRET
+    # Повреждённый токен в кеше: ошибка валидации содержит значение из кеша
+    redis.data = {
+        key: value.replace(b"expires_at", b"expired") for key, value in redis.data.items()
+    }
+    assert asyncio.run(authenticate()) == SECRET
+    redis.error = RedisError("connection lost")
+    assert asyncio.run(authenticate()) == SECRET
+
+    assert_not_logged(caplog)
+    assert "Failed to write access token to shared cache" in caplog.text
+
+
+def test_oauth_client_does_not_hide_cache_bugs() -> None:
+    cache = create_cache(FakeRedis(TypeError("cache bug")))
+
+    async def authenticate() -> str:
+        oauth_client = AsyncOAuthSberDevicesClient(
+            apikey="apikey", scope="SALUTE_SPEECH_PERS", token_cache=cache
+        )
+        try:
+            return await oauth_client.authenticate()
+        finally:
+            await oauth_client.close()
+
+    with pytest.raises(TypeError, match="cache bug"):
+        asyncio.run(authenticate())
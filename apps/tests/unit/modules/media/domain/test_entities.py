@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+
+import pytest
+
+from modules.media.domain import FileMetadata, FilePart, UploadFileCommand
+from modules.media.domain.entities import assemble_parts
+
+PART_SIZE = 10
+
+
+async def iter_chunks(content: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(content), chunk_size):
+        await asyncio.sleep(0)
+        yield content[start:start + chunk_size]
+
+
+async def collect[T](iterable: AsyncIterable[T]) -> list[T]:
+    return [item async for item in iterable]
+
+
+def create_file_metadata(filesize: int) -> FileMetadata:
+    return FileMetadata.create(UploadFileCommand(
+        filename="recording.wav",
+        mime_type="audio/wav",
+        filesize=filesize,
+        tenant="tenant",
+        entity_type="user",
+        entity_id="1",
+    ))
+
+
+@pytest.mark.parametrize("size", [0, 1, PART_SIZE - 1, PART_SIZE, PART_SIZE + 1, 5 * PART_SIZE])
+@pytest.mark.parametrize("chunk_size", [1, 3, PART_SIZE, PART_SIZE + 3, 4 * PART_SIZE])
+def test_assemble_parts(size: int, chunk_size: int) -> None:
+    content = bytes(range(256)) * (size // 256 + 1)
+    content = content[:size]
+
+    parts = asyncio.run(collect(assemble_parts(iter_chunks(content, chunk_size), PART_SIZE)))
+
+    assert b"".join(parts) == content
+    assert all(len(part) == PART_SIZE for part in parts[:-1])
+    assert not parts or 0 < len(parts[-1]) <= PART_SIZE
+    assert len(parts) == -(-size // PART_SIZE)
+
+
+def test_assemble_parts_does_not_alias_chunks() -> None:
+    chunks = [bytearray(b"abcdefgh"), bytearray(b"ijklmnopqrstuvwxyz")]
+
+    async def iter_mutable_chunks() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+    parts = asyncio.run(collect(assemble_parts(iter_mutable_chunks(), PART_SIZE)))
+    for chunk in chunks:
+        chunk[:] = bytes(len(chunk))
+
+    assert parts == [b"abcdefghij", b"klmnopqrst", b"uvwxyz"]
+
+
+@pytest.mark.parametrize("chunk_size", [3, PART_SIZE, 3 * PART_SIZE + 7])
+def test_generate_file_parts(chunk_size: int) -> None:
+    content = bytes(range(256))[:3 * PART_SIZE + 5]
+    file_metadata = create_file_metadata(len(content))
+
+    parts: list[FilePart] = asyncio.run(collect(
+        file_metadata.generate_file_parts(iter_chunks(content, chunk_size), PART_SIZE)
+    ))
+
+    assert [part.number for part in parts] == [1, 2, 3, 4]
+    assert [part.offset for part in parts] == [0, PART_SIZE, 2 * PART_SIZE, 3 * PART_SIZE]
+    assert [part.size for part in parts] == [PART_SIZE, PART_SIZE, PART_SIZE, 5]
+    assert b"".join(part.content for part in parts) == content
+    assert all(part.total_parts == len(parts) for part in parts)
+    assert [part.is_last for part in parts] == [False, False, False, True]
+    assert parts[-1].offset + parts[-1].size == parts[-1].total_size
@@ -0,0 +1,25 @@
+import pytest
+
+from modules.media.infrastructure.storage import S3Storage
+
+
+def create_storage(**kwargs: int) -> S3Storage:
+    return S3Storage(
+        endpoint_url="http://localhost:9000",
+        access_key="access-key",
+        secret_key="secret-key",  # noqa: S106
+        bucket="bucket",
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("upload_concurrency", [0, -1])
+def test_upload_concurrency_must_be_positive(upload_concurrency: int) -> None:
+    with pytest.raises(ValueError, match="upload_concurrency"):
+        create_storage(upload_concurrency=upload_concurrency)
+
+
+@pytest.mark.parametrize("read_ahead", [0, -1])
+def test_read_ahead_must_be_positive(read_ahead: int) -> None:
+    with pytest.raises(ValueError, match="read_ahead"):
+        create_storage(read_ahead=read_ahead)
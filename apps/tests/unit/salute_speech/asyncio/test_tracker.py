@@ -0,0 +1,90 @@
+import asyncio
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from salute_speech.asyncio import RecognitionTaskTracker
+from salute_speech.exceptions import AuthenticationFailedError, TaskFailedError
+from salute_speech.models import Task
+
+
+def make_task(status: str, task_id: UUID | None = None) -> Task:
+    now = datetime.now(UTC)
+    return Task(
+        id=task_id or uuid4(),
+        status=status,
+        created_at=now,
+        updated_at=now,
+        response_file_id=uuid4() if status == "DONE" else None,
+    )
+
+
+class FakeClient:
+    """Клиент, запросы статуса которого сначала завершаются ошибками"""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.polls = 0
+
+    async def get_task_status(self, task_id: UUID) -> Task:
+        self.polls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return make_task("DONE", task_id)
+
+
+def test_poll_errors_are_retried() -> None:
+    errors = [AuthenticationFailedError("expired"), KeyError("status")]
+    client = FakeClient(*errors)
+
+    async def main() -> Task:
+        tracker = RecognitionTaskTracker(client, min_interval=0.01, backoff_factor=1)
+        try:
+            return await tracker.wait(make_task("NEW"), timeout=5)
+        finally:
+            await tracker.close()
+
+    task = asyncio.run(main())
+
+    assert task.status == "DONE"
+    assert client.polls == len(errors) + 1
+
+
+def test_loop_failure_fails_pending_tasks(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeClient(*(AuthenticationFailedError("expired") for _ in range(100)))
+
+    async def main() -> int:
+        tracker = RecognitionTaskTracker(client, min_interval=0.01, backoff_factor=1)
+
+        def expire(_: float) -> None:
+            raise RuntimeError("tracker bug")
+
+        monkeypatch.setattr(tracker, "_expire", expire)
+        try:
+            with pytest.raises(TaskFailedError):
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        tracker.wait(make_task("NEW")), tracker.wait(make_task("NEW"))
+                    ),
+                    timeout=5,
+                )
+            return tracker.pending_count
+        finally:
+            await tracker.close()
+
+    assert asyncio.run(main()) == 0
+
+
+def test_pending_tasks_time_out_while_polls_fail() -> None:
+    client = FakeClient(*(AuthenticationFailedError("expired") for _ in range(100)))
+
+    async def main() -> None:
+        tracker = RecognitionTaskTracker(client, min_interval=0.01, backoff_factor=1)
+        try:
+            await tracker.wait(make_task("NEW"), timeout=0.05)
+        finally:
+            await tracker.close()
+
+    with pytest.raises(TaskFailedError, match="timed out"):
+        asyncio.run(main())
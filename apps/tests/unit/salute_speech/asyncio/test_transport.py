@@ -0,0 +1,270 @@
+import asyncio
+import email.utils
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from salute_speech.asyncio.transport import AsyncTransport
+from salute_speech.constants import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from salute_speech.exceptions import CircuitOpenError, TransportError
+from salute_speech.transport import RetryPolicy, get_circuit_breaker
+
+type Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@dataclass(frozen=True, slots=True)
+class RecordingRetryPolicy(RetryPolicy):
+    """Политика повторов без ожидания, запоминающая вычисленные задержки"""
+
+    delays: list[float] = field(default_factory=list)
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        self.delays.append(RetryPolicy.delay(self, attempt, retry_after))
+        return 0
+
+
+class Responses:
+    """Обработчик, отвечающий заданными ответами по очереди (последний повторяется)"""
+
+    def __init__(self, *responses: Callable[[], web.Response] | float) -> None:
+        self.responses = list(responses)
+        self.hits = 0
+
+    async def __call__(self, request: web.Request) -> web.Response:
+        await request.read()
+        response = self.responses[min(self.hits, len(self.responses) - 1)]
+        self.hits += 1
+        if isinstance(response, float):  # Ответ не приходит дольше таймаута чтения
+            await asyncio.sleep(response)
+            return web.Response()
+        return response()
+
+
+def status(code: int, retry_after: str | None = None) -> Callable[[], web.Response]:
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return partial(web.Response, status=code, headers=headers)
+
+
+async def request(
+        handler: Handler,
+        retry_policy: RetryPolicy,
+        idempotent: bool = True,
+        data: bytes | AsyncIterable[bytes] | None = None,
+        read_timeout: float = 5,
+) -> int:
+    server = await serve(handler)
+    transport = AsyncTransport(retry_policy=retry_policy, read_timeout=read_timeout)
+    try:
+        response = await transport.request(
+            "POST", str(server.make_url("/")), data=data, idempotent=idempotent
+        )
+        return response.status
+    finally:
+        await transport.close()
+        await server.close()
+
+
+async def serve(handler: Handler) -> TestServer:
+    app = web.Application()
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        return await handler(request)
+
+    app.router.add_route("*", "/", handle)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def test_cancelled_probe_releases_circuit_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def slow(_: web.Request) -> web.Response:
+        await asyncio.sleep(10)
+        return web.Response()
+
+    async def main() -> None:
+        server = await serve(slow)
+        transport = AsyncTransport()
+        url = str(server.make_url("/"))
+        circuit_breaker = get_circuit_breaker(url)
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            circuit_breaker.record_failure()
+        monotonic = time.monotonic
+        monkeypatch.setattr(time, "monotonic", lambda: monotonic() + CIRCUIT_RESET_TIMEOUT)
+        try:
+            probe = asyncio.create_task(transport.request("GET", url))
+            await asyncio.sleep(0.1)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            circuit_breaker.before_request()
+        finally:
+            await transport.close()
+            await server.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "response", [status(500), status(500, retry_after="1"), status(503), status(429)]
+)
+def test_non_idempotent_request_is_not_retried_after_server_error(
+        response: Callable[[], web.Response]
+) -> None:
+    handler = Responses(response, status(200))
+
+    with pytest.raises(TransportError):
+        asyncio.run(request(handler, RecordingRetryPolicy(), idempotent=False))
+
+    assert handler.hits == 1
+
+
+def test_non_idempotent_request_is_retried_after_explicit_rejection() -> None:
+    handler = Responses(status(503, retry_after="1"), status(429, retry_after="2"), status(200))
+    retry_policy = RecordingRetryPolicy()
+
+    assert asyncio.run(request(handler, retry_policy, idempotent=False)) == web.HTTPOk.status_code
+    assert retry_policy.delays == [1, 2]
+
+
+def test_non_idempotent_request_is_not_retried_after_read_timeout() -> None:
+    handler = Responses(1.0, status(200))
+
+    with pytest.raises(TransportError):
+        asyncio.run(request(handler, RecordingRetryPolicy(), idempotent=False, read_timeout=0.1))
+
+    assert handler.hits == 1
+
+
+def test_non_idempotent_request_is_retried_after_connection_error() -> None:
+    async def main() -> list[float]:
+        server = await serve(Responses(status(200)))
+        url = str(server.make_url("/"))
+        await server.close()
+        retry_policy = RecordingRetryPolicy(max_attempts=2)
+        transport = AsyncTransport(retry_policy=retry_policy)
+        try:
+            with pytest.raises(TransportError):
+                await transport.request("POST", url, idempotent=False)
+        finally:
+            await transport.close()
+        return retry_policy.delays
+
+    assert len(asyncio.run(main())) == 1
+
+
+@pytest.mark.parametrize("code", [500, 502, 503, 504, 429])
+def test_temporary_errors_are_retried(code: int) -> None:
+    handler = Responses(status(code), status(code), status(200))
+    retry_policy = RecordingRetryPolicy(base_delay=0.1)
+
+    assert asyncio.run(request(handler, retry_policy)) == web.HTTPOk.status_code
+    assert handler.hits == len(retry_policy.delays) + 1
+
+
+def test_client_errors_are_not_retried() -> None:
+    handler = Responses(status(400), status(200))
+
+    with pytest.raises(TransportError) as error:
+        asyncio.run(request(handler, RecordingRetryPolicy()))
+
+    assert error.value.status == web.HTTPBadRequest.status_code
+    assert handler.hits == 1
+
+
+def test_retry_after_seconds() -> None:
+    handler = Responses(status(429, retry_after="7"), status(200))
+    retry_policy = RecordingRetryPolicy()
+
+    asyncio.run(request(handler, retry_policy))
+
+    assert retry_policy.delays == [7]
+
+
+def test_retry_after_http_date() -> None:
+    retry_in = timedelta(seconds=10)
+    retry_at = email.utils.format_datetime(datetime.now(UTC) + retry_in, usegmt=True)
+    handler = Responses(status(503, retry_after=retry_at), status(200))
+    retry_policy = RecordingRetryPolicy()
+
+    asyncio.run(request(handler, retry_policy))
+
+    [delay] = retry_policy.delays
+    # HTTP-дата с точностью до секунды
+    assert retry_in.total_seconds() - 2 < delay <= retry_in.total_seconds()
+
+
+def test_retry_after_is_limited_by_max_delay() -> None:
+    handler = Responses(status(503, retry_after="3600"), status(200))
+    retry_policy = RecordingRetryPolicy(max_delay=5)
+
+    asyncio.run(request(handler, retry_policy))
+
+    assert retry_policy.delays == [5]
+
+
+def test_retries_exhausted() -> None:
+    handler = Responses(status(502))
+    retry_policy = RecordingRetryPolicy(max_attempts=3)
+
+    with pytest.raises(TransportError) as error:
+        asyncio.run(request(handler, retry_policy))
+
+    assert error.value.status == web.HTTPBadGateway.status_code
+    assert handler.hits == retry_policy.max_attempts
+
+
+def test_streaming_body_is_not_retried() -> None:
+    async def iter_body() -> AsyncIterator[bytes]:
+        for chunk in (b"audio", b"content"):
+            await asyncio.sleep(0)
+            yield chunk
+
+    handler = Responses(status(503), status(200))
+
+    with pytest.raises(TransportError):
+        asyncio.run(request(handler, RecordingRetryPolicy(), data=iter_body()))
+
+    assert handler.hits == 1
+
+
+def test_circuit_breaker_opens_half_opens_and_closes(monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = Responses(status(500))
+
+    async def main() -> None:
+        server = await serve(handler)
+        url = str(server.make_url("/"))
+        transport = AsyncTransport(retry_policy=RecordingRetryPolicy(max_attempts=1))
+        try:
+            for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+                with pytest.raises(TransportError):
+                    await transport.request("GET", url)
+            # Цепь разомкнута: запрос отклоняется без обращения к хосту
+            with pytest.raises(CircuitOpenError):
+                await transport.request("GET", url)
+            assert handler.hits == CIRCUIT_FAILURE_THRESHOLD
+            # Пробный запрос после reset_timeout снова неудачен: цепь размыкается
+            monotonic = time.monotonic
+            monkeypatch.setattr(time, "monotonic", lambda: monotonic() + CIRCUIT_RESET_TIMEOUT)
+            with pytest.raises(TransportError):
+                await transport.request("GET", url)
+            with pytest.raises(CircuitOpenError):
+                await transport.request("GET", url)
+            # Успешный пробный запрос замыкает цепь
+            handler.responses = [status(200)]
+            monkeypatch.setattr(
+                time, "monotonic", lambda: monotonic() + 2 * CIRCUIT_RESET_TIMEOUT
+            )
+            await transport.request("GET", url)
+            assert not get_circuit_breaker(url).is_open
+            await transport.request("GET", url)
+        finally:
+            await transport.close()
+            await server.close()
+
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from salute_speech.exceptions import StreamingRecognitionError
+from salute_speech.models import AccessToken, StreamingHypothesis
+from salute_speech.streaming import StreamingSaluteSpeechClient
+from salute_speech.streaming.stub import RecognizeHandler, create_stub_server
+
+
+class StaticTokenCache:
+    """Кеш с действующим токеном, чтобы клиент не обращался к OAuth"""
+
+    def __init__(self) -> None:
+        self.token = AccessToken(
+            access_token="token",  # noqa: S106
+            expires_at=datetime.now(UTC) + timedelta(hours=1),
+        )
+
+    async def get(self, key: str) -> AccessToken | None:  # noqa: ARG002
+        return self.token
+
+    async def set(self, key: str, value: AccessToken, ttl: timedelta | None = None) -> None:
+        pass
+
+
+async def echo(audio: AsyncIterator[bytes]) -> AsyncIterator[StreamingHypothesis]:
+    """Гипотеза на каждую часть аудио: промежуточная, а для последней части - окончательная"""
+    number = 0
+    async for chunk in audio:
+        text = chunk.decode()
+        yield StreamingHypothesis(
+            text=text,
+            normalized_text=text.capitalize(),
+            start=number * 0.5,
+            end=number * 0.5 + 1.25,
+            is_final=text.endswith("."),
+            speaker=number % 2 if text.endswith(".") else None,
+        )
+        number += 1
+
+
+async def failing(audio: AsyncIterator[bytes]) -> AsyncIterator[StreamingHypothesis]:
+    async for _ in audio:
+        raise RuntimeError("recognition backend failed")
+    yield StreamingHypothesis()
+
+
+async def recognize(handler: RecognizeHandler, chunks: list[bytes]) -> list[StreamingHypothesis]:
+    server, port = create_stub_server(handler)
+    await server.start()
+    client = StreamingSaluteSpeechClient(
+        apikey="apikey",
+        scope="SALUTE_SPEECH_PERS",
+        target=f"127.0.0.1:{port}",
+        secure=False,
+        token_cache=StaticTokenCache(),
+    )
+    try:
+        return [hypothesis async for hypothesis in client.recognize(chunks)]
+    finally:
+        await client.close()
+        await server.stop(None)
+
+
+def test_recognize_round_trip() -> None:
+    hypotheses = asyncio.run(recognize(echo, [b"one", b"two.", "три.".encode()]))
+
+    assert hypotheses == [
+        StreamingHypothesis(text="one", normalized_text="One", start=0, end=1.25),
+        StreamingHypothesis(
+            text="two.", normalized_text="Two.", start=0.5, end=1.75, is_final=True, speaker=1
+        ),
+        StreamingHypothesis(
+            text="три.", normalized_text="Три.", start=1, end=2.25, is_final=True, speaker=0
+        ),
+    ]
+
+
+def test_recognize_server_error() -> None:
+    with pytest.raises(StreamingRecognitionError):
+        asyncio.run(recognize(failing, [b"one"]))
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from salute_speech.models import RecognizedSpeech, RecognizedSpeechList, iter_json_array
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[]",
+        " [ ] ",
+        '[{"a": 1}]',
+        '[{"a": 1}, {"b": [2, 3]}, "text", 4]',
+        '\n[\n  {"a": "],["},\n  null\n]\n',
+    ],
+)
+def test_iter_json_array_matches_json_loads(content: str) -> None:
+    assert list(iter_json_array(content)) == json.loads(content)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        '{"a": 1}',
+        "[",
+        '[{"a": 1}',
+        '[{"a": 1},',
+        '[{"a": 1},]',
+        '[,{"a": 1}]',
+        '[,,{"a": 1} {"b": 2}]',
+        '[{"a": 1} {"b": 2}]',
+        '[{"a": 1},,{"b": 2}]',
+    ],
+)
+def test_iter_json_array_rejects_malformed_arrays(content: str) -> None:
+    with pytest.raises(ValueError, match=r"JSON array|Expecting value"):
+        list(iter_json_array(content))
+
+
+def test_to_markdown_merges_turns_of_one_speaker() -> None:
+    recognized_speech_list = RecognizedSpeechList([
+        RecognizedSpeech("Привет.", speaker=0, emotion="positive", start=0, end=1),
+        RecognizedSpeech("Как дела?", speaker=0, emotion="neutral", start=1, end=2),
+        RecognizedSpeech("Хорошо.", speaker=0, emotion="positive", start=2, end=3),
+        RecognizedSpeech("Отлично.", speaker=1, start=3, end=4),
+        RecognizedSpeech("Шум.", speaker=None),
+        RecognizedSpeech("Помехи.", speaker=None),
+        RecognizedSpeech("Пока.", speaker=0, emotion="negative", start=5, end=6),
+    ])
+
+    turns = list(recognized_speech_list.iter_turns())
+
+    assert turns[0] == RecognizedSpeech(
+        "Привет. Как дела? Хорошо.", speaker=0, emotion="positive", start=0, end=3
+    )
+    assert recognized_speech_list.to_markdown() == (
+        "0. Привет. Как дела? Хорошо. (0) [positive]\n"
+        "1. Отлично. (1)\n"
+        "2. Шум.\n"
+        "3. Помехи.\n"
+        "4. Пока. (0) [negative]"
+    )
+
+
+def test_to_markdown_without_speech() -> None:
+    assert RecognizedSpeechList().to_markdown() == "No speech recognized"
+
+
+def test_from_json_skips_empty_results() -> None:
+    content = json.dumps([
+        {"results": []},
+        {
+            "results": [{"normalized_text": "Да.", "start": "0.5s", "end": "1s"}],
+            "speaker_info": {"speaker_id": 2},
+            "emotions_result": {"positive": 0.1, "neutral": 0.8, "negative": 0.1},
+        },
+    ])
+
+    assert RecognizedSpeechList.from_json(content) == [
+        RecognizedSpeech("Да.", speaker=2, emotion="neutral", start=0.5, end=1)
+    ]
@@ -0,0 +1,128 @@
+import json
+import math
+
+from salute_speech.transcript import UNKNOWN_SPEAKER, Transcript
+
+
+def make_transcript(*phrases: tuple[str, float | None, float | None, int | None]) -> Transcript:
+    transcript = Transcript()
+    for text, start, end, speaker in phrases:
+        words = () if start is None or end is None else ((text, start, end),)
+        transcript.append(text, start=start, end=end, speaker=speaker, words=words)
+    return transcript
+
+
+def test_truncate_removes_phrases_and_their_words() -> None:
+    transcript = make_transcript(("a", 0, 1, 0), ("b", 1, 2, 1), ("c", 2, 3, 0))
+
+    transcript.truncate(1)
+
+    assert transcript.texts == ["a"]
+    assert list(transcript.starts) == [0]
+    assert list(transcript.speakers) == [0]
+    assert list(transcript.word_index) == [0, 1]
+    assert transcript.words == ["a"]
+    assert list(transcript.iter_words(0)) == [("a", 0, 1)]
+
+
+def test_truncate_beyond_length_is_noop() -> None:
+    transcript = make_transcript(("a", 0, 1, 0), ("b", 1, 2, 1))
+
+    transcript.truncate(5)
+
+    assert transcript.texts == ["a", "b"]
+    assert list(transcript.word_index) == [0, 1, 2]
+
+
+def test_truncate_to_empty() -> None:
+    transcript = make_transcript(("a", 0, 1, 0))
+
+    transcript.truncate(0)
+
+    assert len(transcript) == 0
+    assert list(transcript.word_index) == [0]
+    assert transcript.words == []
+
+
+def test_extend_shifts_time_speakers_and_words() -> None:
+    transcript = make_transcript(("a", 0, 4, 0), ("b", 5, 9, 1))
+    segment = make_transcript(("c", 1, 3, 0), ("d", 4, 6, None))
+
+    transcript.extend(segment, offset=10, speaker_offset=2)
+
+    assert transcript.texts == ["a", "b", "c", "d"]
+    assert list(transcript.starts) == [0, 5, 11, 14]
+    assert list(transcript.ends) == [4, 9, 13, 16]
+    assert list(transcript.speakers) == [0, 1, 2, UNKNOWN_SPEAKER]
+    assert list(transcript.word_index) == [0, 1, 2, 3, 4]
+    assert list(transcript.iter_words(3)) == [("d", 14, 16)]
+
+
+def test_extend_does_not_duplicate_overlap() -> None:
+    # Сегмент начинается на 8 секунде: фраза "x" начата на перекрытии и
+    # расшифрована в сегменте целиком, а начало сегмента "b" уже расшифровано
+    transcript = make_transcript(("a", 0, 4, 0), ("b", 5, 9.5, 1), ("x", 9, 10, 0))
+    segment = make_transcript(("b", 0, 1.5, 0), ("x", 1, 2, 1), ("d", 2.5, 4, 0))
+
+    transcript.extend(segment, offset=8, speaker_offset=2)
+
+    assert transcript.texts == ["a", "b", "x", "d"]
+    assert list(transcript.starts) == [0, 5, 9, 10.5]
+    assert list(transcript.speakers) == [0, 1, 3, 2]
+    assert transcript.words == ["a", "b", "x", "d"]
+    assert list(transcript.word_index) == [0, 1, 2, 3, 4]
+    assert list(transcript.iter_words(2)) == [("x", 9, 10)]
+
+
+def test_extend_keeps_phrases_without_time() -> None:
+    transcript = make_transcript(("a", 0, 4, 0), ("?", None, None, None))
+    segment = make_transcript(("??", None, None, 0), ("b", 1, 2, 1))
+
+    transcript.extend(segment, offset=2)
+
+    assert transcript.texts == ["a", "?", "??", "b"]
+    assert math.isnan(transcript.starts[1])
+    assert math.isnan(transcript.starts[2])
+    assert list(transcript.starts[3:]) == [3]
+    assert list(transcript.ends[:1]) == [transcript.duration]
+
+
+def test_extend_empty_transcript() -> None:
+    transcript = Transcript()
+
+    transcript.extend(make_transcript(("a", 0, 1, 0)), offset=3)
+
+    assert transcript.texts == ["a"]
+    assert list(transcript.starts) == [3]
+    assert list(transcript.word_index) == [0, 1]
+
+
+def test_from_json_skips_empty_results() -> None:
+    content = json.dumps([
+    {"results": []},
+    {
+        "results": [{
+            "normalized_text": "Привет",
+            "start": "0.5s",
+            "end": "1.25s",
+            "word_alignments": [{"word": "привет", "start": "0.5s", "end": "1.25s"}],
+        }],
+        "speaker_info": {"speaker_id": 1},
+    },
+    ])
+
+    transcript = Transcript.from_json(content.encode())
+
+    assert transcript.texts == ["Привет"]
+    assert list(transcript.speakers) == [1]
+    assert list(transcript.iter_words(0)) == [("привет", 0.5, 1.25)]
+
+
+def test_dict_round_trip_keeps_unknown_time() -> None:
+    transcript = make_transcript(("a", 0, 1, 0), ("?", None, None, None))
+
+    restored = Transcript.from_dict(json.loads(json.dumps(transcript.to_dict())))
+
+    assert restored.texts == transcript.texts
+    assert math.isnan(restored.starts[1])
+    assert list(restored.word_index) == list(transcript.word_index)
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+import requests
+
+from salute_speech.constants import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from salute_speech.exceptions import CircuitOpenError
+from salute_speech.transport import (
+    CircuitBreaker,
+    RetryPolicy,
+    Transport,
+    get_circuit_breaker,
+    is_connection_error,
+)
+
+
+def open_circuit_breaker(reset_timeout: float = 0) -> CircuitBreaker:
+    circuit_breaker = CircuitBreaker("host", failure_threshold=2, reset_timeout=reset_timeout)
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    return circuit_breaker
+
+
+def test_circuit_breaker_opens_after_failures() -> None:
+    circuit_breaker = open_circuit_breaker(reset_timeout=60)
+
+    assert circuit_breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+
+def test_circuit_breaker_lets_single_probe() -> None:
+    circuit_breaker = open_circuit_breaker()
+
+    circuit_breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+
+def test_circuit_breaker_closes_after_successful_probe() -> None:
+    circuit_breaker = open_circuit_breaker()
+
+    circuit_breaker.before_request()
+    circuit_breaker.record_success()
+
+    assert not circuit_breaker.is_open
+    circuit_breaker.before_request()
+
+
+def test_circuit_breaker_reopens_after_failed_probe() -> None:
+    circuit_breaker = open_circuit_breaker(reset_timeout=0.05)
+    time.sleep(0.05)
+
+    circuit_breaker.before_request()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+
+def test_cancelled_probe_is_released() -> None:
+    circuit_breaker = open_circuit_breaker()
+
+    circuit_breaker.before_request()
+    circuit_breaker.record_cancelled()
+
+    assert circuit_breaker.is_open
+    circuit_breaker.before_request()
+
+
+def test_unexpected_error_releases_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    url = "http://unexpected-error.test/path"
+    circuit_breaker = get_circuit_breaker(url)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        circuit_breaker.record_failure()
+    monotonic = time.monotonic
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic() + CIRCUIT_RESET_TIMEOUT)
+
+    def request(*_: object, **__: object) -> None:
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    with pytest.raises(ValueError, match="unexpected"):
+        Transport().request("GET", url)
+
+    circuit_breaker.before_request()
+
+
+@pytest.mark.parametrize(
+    ("status", "sent", "retry_after", "expected"),
+    [
+        (None, False, None, True),
+        (None, True, None, False),
+        (500, True, None, False),
+        (503, True, None, False),
+        (503, True, "1", True),
+        (429, True, "1", True),
+        (500, True, "1", False),
+    ],
+)
+def test_non_idempotent_retry(
+        status: int | None, sent: bool, retry_after: str | None, expected: bool
+) -> None:
+    retry_policy = RetryPolicy()
+
+    assert retry_policy.should_retry(
+        0, status, idempotent=False, sent=sent, retry_after=retry_after
+    ) is expected
+
+
+def test_refused_connection_is_connection_error() -> None:
+    with pytest.raises(requests.ConnectionError) as error:
+        requests.post("http://127.0.0.1:1/", timeout=1)
+
+    assert is_connection_error(error.value)
+    assert not is_connection_error(requests.ReadTimeout())
@@ -5,7 +5,9 @@ from faststream.rabbit import RabbitBroker
 
 from client.v1 import ClientV1
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
+from modules.audio.application import AudioSegmentStore
+from modules.audio.domain import ENCODING_PROFILES, AudioSegment, StoredAudioSegment
+from modules.media.infrastructure.storage import S3Storage
 from modules.summarization.domain import AudioSplitEvent, SummarizationTaskCreatedEvent
 
 from .splitter import AudioSplitter
@@ -18,6 +20,29 @@ app = FastStream(broker)
 
 client = ClientV1(base_url=dev_settings.app.url)
 
+storage = S3Storage(
+    endpoint_url=dev_settings.minio.url,
+    access_key=dev_settings.minio.user,
+    secret_key=dev_settings.minio.password,
+    bucket=dev_settings.minio.bucket,
+    upload_concurrency=dev_settings.minio.upload_concurrency,
+    read_ahead=dev_settings.minio.read_ahead,
+    max_pool_connections=dev_settings.minio.max_pool_connections,
+    keepalive_timeout=dev_settings.minio.keepalive_timeout,
+)
+
+segment_store = AudioSegmentStore(storage, prefix=dev_settings.audio_pipeline.segments_prefix)
+
+
+@app.on_startup
+async def connect_storage() -> None:
+    await storage.connect()
+
+
+@app.after_shutdown
+async def close_storage() -> None:
+    await storage.close()
+
 
 def should_chunking(total_duration: int) -> bool:
     return total_duration > ...
@@ -31,12 +56,14 @@ def calculate_chunk_duration(total_duration: int, record_count: int) -> int:
 @broker.publisher("sound_enhancement")
 async def handle_summarization_task_created_event(
         event: SummarizationTaskCreatedEvent, logger: Logger
-) -> AsyncIterable[AudioSegment]:
+) -> AsyncIterable[AudioSegment | StoredAudioSegment]:
     logger.debug("Start audio processing for collection with id %s", event.collection_id)
     collection = await client.collections.get(event.collection_id)
     chunk_duration = calculate_chunk_duration(collection.total_duration, collection.record_count)
     splitter = AudioSplitter(
-        chunk_duration=chunk_duration, chunk_format=AudioFormat.WAV, prefix=collection.id,
+        chunk_duration=chunk_duration,
+        prefix=collection.id,
+        encoding_profile=ENCODING_PROFILES[dev_settings.audio_pipeline.encoding_profile],
     )
     segments_count = 0
     for record in collection.records:
@@ -49,7 +76,10 @@ async def handle_summarization_task_created_event(
                     "record_id": record.id
                 }
         ):
-            yield audio_segment
+            if dev_settings.audio_pipeline.claim_check:
+                yield await segment_store.put(audio_segment, stage="split")
+            else:
+                yield audio_segment
             segments_count += 1
     event = AudioSplitEvent(
         task_id=event.task_id, collection_id=collection.id, segments_count=segments_count
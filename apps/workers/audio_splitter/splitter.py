@@ -1,19 +1,25 @@
 from typing import Any
 
 import asyncio
-import glob
 import json
 import logging
+import math
 import os
-import re
+from collections import deque
 from collections.abc import AsyncIterable, AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from uuid import UUID
 
 import aiofiles
 
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
+from modules.audio.domain import (
+    AudioFormat,
+    AudioSegment,
+    EncodingProfile,
+    UnsupportedAudioError,
+)
+from modules.audio.utils.audio import extract_wav_info
 
 logger = logging.getLogger(__name__)
 
@@ -27,19 +33,34 @@ class AudioSplitter:
 
     AsyncIterable[bytes] ──► 1. Запись во временный файл (temp_audio_file.input)
     2. ffmpeg разбиение по аудио фреймам ──► chunk_000.wav, chunk_001.wav, ...
-    3. Чтение чанков + получение метаданных ──► yield AudioSegment
+       (ffmpeg сообщает в stdout о каждом закрытом чанке через segment list)
+    3. Чтение закрытых чанков + получение метаданных ──► yield AudioSegment
+       (параллельно с кодированием следующих чанков)
+
+    Общее количество чанков (`total_count`) известно только у последнего чанка.
     """
 
     def __init__(
-            self, chunk_duration: int, chunk_format: AudioFormat = "wav", prefix: Prefix = "",
+            self,
+            chunk_duration: int,
+            chunk_format: AudioFormat = "wav",
+            prefix: Prefix = "",
+            encoding_profile: EncodingProfile | None = None,
     ) -> None:
         """
         :param chunk_duration: Продолжительность чанка в секундах.
         :param chunk_format: Формат чанка на выходе, например: 'wav', 'mp3', ...
         :param prefix: Уникальный префикс для избежания коллизий и конфликтов данных.
+        :param encoding_profile: Профиль кодирования чанков, если передан -
+        переопределяет chunk_format. По умолчанию PCM 16-bit стерео 44.1 kHz.
         """
+        if encoding_profile is None:
+            encoding_profile = EncodingProfile(
+                format=chunk_format, codec="pcm_s16le", channels=2, samplerate=44100
+            )
         self._chunk_duration = chunk_duration
-        self._chunk_format = chunk_format
+        self._chunk_format = encoding_profile.format
+        self._encoding_profile = encoding_profile
         self._prefix = prefix
 
     @property
@@ -69,8 +90,21 @@ class AudioSplitter:
     @staticmethod
     async def _probe_file_metadata(filepath: Path) -> dict[str, float]:
         """Получение метаданных аудио файла
-        (длительность, частота дискретизации, количество каналов)
+        (длительность, частота дискретизации, количество каналов).
+        Для PCM WAV (формат чанков по умолчанию) заголовок читается без запуска процесса,
+        ffprobe используется только для остальных форматов.
         """
+        try:
+            wav_info = extract_wav_info(filepath)
+        except UnsupportedAudioError:
+            logger.debug("File %s is not PCM WAV, probing with FFprobe", filepath)
+        else:
+            return {
+                # Точная продолжительность, extract_wav_info округляет её вниз
+                "duration": wav_info["data_size"] * 8 / wav_info["bitrate"],
+                "samplerate": float(wav_info["samplerate"]),
+                "channels": float(wav_info["channels"]),
+            }
         ffprobe_command = [
             "ffprobe",
             "-v", "quiet",
@@ -123,9 +157,11 @@ class AudioSplitter:
             "-i", f"{input_file}",
             "-f", "segment",
             "-segment_time", f"{self._chunk_duration}",
-            "-c:a", "pcm_s16le",  # Кодирование в WAV (PCM 16-bit)
-            "-ac", "2",  # 2 канала (стерео)
-            "-ar", "44100",  # Частота дискретизации 44.1 kHz
+            "-segment_list", "pipe:1",  # Сообщение о каждом закрытом чанке в stdout
+            "-segment_list_type", "csv",  # Формат строки: имя файла,начало,конец
+            "-c:a", self._encoding_profile.codec,
+            "-ac", f"{self._encoding_profile.channels}",  # Понижающее сведение каналов
+            "-ar", f"{self._encoding_profile.samplerate}",  # Передискретизация
             "-reset_timestamps", "1",
             "-map", "0:a",  # Только аудио
             output_pattern
@@ -145,39 +181,74 @@ class AudioSplitter:
                     process.kill()
                     await process.wait()
 
+    @staticmethod
+    async def _drain_stderr(process: asyncio.subprocess.Process, tail: deque[str]) -> None:
+        """Вычитывает stderr ffmpeg, чтобы процесс не блокировался на переполненном pipe"""
+        async for line in process.stderr:
+            tail.append(line.decode(errors="replace"))
+
+    async def _read_chunk(
+            self,
+            filepath: Path,
+            duration: int,
+            number: int,
+            metadata: dict[str, Any],
+            is_last: bool = False,
+    ) -> AudioSegment:
+        # Продолжительность берётся из segment list ffmpeg, у FLAC чанков
+        # segment муксер не проставляет длину в заголовке
+        file_metadata = await self._probe_file_metadata(filepath)
+        if not file_metadata:
+            raise ValueError(f"Empty metadata for file {filepath}")
+        async with aiofiles.open(filepath, mode="rb") as file:
+            content = await file.read()
+        return AudioSegment(
+            number=number,
+            total_count=number if is_last else None,
+            content=content,
+            duration=duration,
+            format=AudioFormat.from_filepath(filepath),
+            size=len(content),
+            samplerate=int(file_metadata["samplerate"]),
+            channels=int(file_metadata["channels"]),
+            metadata=metadata.copy(),
+        )
+
+    @staticmethod
+    def _unlink(filepath: Path) -> None:
+        try:
+            os.unlink(filepath)
+        except (PermissionError, OSError):
+            logger.exception("Error occurred while unlinking file %s", filepath)
+
     async def _iter_chunks(
-            self, metadata: dict[str, Any] | None = None
+            self, process: asyncio.subprocess.Process, metadata: dict[str, Any] | None = None
     ) -> AsyncIterator[AudioSegment]:
+        """Выдаёт чанки по мере того как ffmpeg сообщает об их закрытии.
+        Чанк отдаётся когда закрыт следующий за ним (или ffmpeg завершился),
+        поэтому у последнего чанка известно общее количество чанков.
+        """
         if metadata is None:
             metadata = {}
-        files = sorted(
-            glob.glob(self._ffmpeg_output_pattern.replace("%03d", "*")),
-            key=lambda x: int(
-                re.search(rf"{self._prefix}_chunk_(\d+)\.{self._chunk_format}", x).group(1)
-            )
-        )
-        total_count = len(files)
-        for id, filepath in enumerate(files):  # noqa: A001
-            file_metadata = await self._probe_file_metadata(Path(filepath))
-            if not file_metadata:
-                raise ValueError(f"Empty metadata for file {filepath}")
-            async with aiofiles.open(filepath, mode="rb") as file:
-                content = await file.read()
-            yield AudioSegment(
-                id=id + 1,
-                total_count=total_count,
-                content=content,
-                duration=int(file_metadata["duration"]),
-                format=AudioFormat.from_filepath(filepath),
-                size=len(content),
-                samplerate=int(file_metadata["samplerate"]),
-                channels=int(file_metadata["channels"]),
-                metadata=metadata.copy(),
-            )
-            try:
-                os.unlink(filepath)
-            except (PermissionError, OSError):
-                logger.exception("Error occurred while unlinking file %s", filepath)
+        output_dir = Path(self._ffmpeg_output_pattern).parent
+        pending: tuple[Path, int] | None = None
+        number = 0
+        async for line in process.stdout:
+            filename, *times = line.decode().strip().split(",")
+            if not filename:
+                continue
+            if pending is not None:
+                number += 1
+                yield await self._read_chunk(*pending, number, metadata)
+                self._unlink(pending[0])
+            start, end = map(float, times)
+            pending = output_dir / filename, math.floor(end - start)
+        if await process.wait() != 0:
+            return
+        if pending is not None:
+            number += 1
+            yield await self._read_chunk(*pending, number, metadata, is_last=True)
+            self._unlink(pending[0])
 
     async def split_stream(
             self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
@@ -189,12 +260,21 @@ class AudioSplitter:
         :returns: Байты чанка + фактическая продолжительность чанка.
         """
         input_file = await self._write_input_file(stream)
-        async with self._ffmpeg_pipe(input_file, self._ffmpeg_output_pattern) as process:
-            _, stderr = await process.communicate()
-            if process.returncode != 0:
-                error_message = stderr.decode()
-                logger.error("FFmpeg process failed with error: %s", error_message)
-                raise RuntimeError(f"FFmpeg process failed with error: {error_message}")
-            async for chunk in self._iter_chunks(metadata):
-                yield chunk
-            os.unlink(input_file)
+        stderr_tail: deque[str] = deque(maxlen=50)
+        try:
+            async with self._ffmpeg_pipe(input_file, self._ffmpeg_output_pattern) as process:
+                stderr_reader = asyncio.create_task(self._drain_stderr(process, stderr_tail))
+                try:
+                    async for chunk in self._iter_chunks(process, metadata):
+                        yield chunk
+                    await stderr_reader
+                finally:
+                    stderr_reader.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await stderr_reader
+                if process.returncode != 0:
+                    error_message = "".join(stderr_tail)
+                    logger.error("FFmpeg process failed with error: %s", error_message)
+                    raise RuntimeError(f"FFmpeg process failed with error: {error_message}")
+        finally:
+            self._unlink(input_file)
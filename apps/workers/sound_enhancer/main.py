@@ -1,13 +1,27 @@
-import io
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
 
-import soundfile as sf
+import aiofiles.os
+import aiofiles.tempfile
 from faststream import FastStream, Logger
-from faststream.rabbit import RabbitBroker
-from pedalboard import Compressor, Gain, LowShelfFilter, NoiseGate, Pedalboard
+from faststream.rabbit import Channel, RabbitBroker
 
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
+from modules.audio.application import AudioSegmentStore
+from modules.audio.domain import (
+    AudioFormat,
+    AudioSegment,
+    FileAudioSegment,
+    StoredAudioSegment,
+)
+from modules.audio.utils.audio import enhance_sound_quality, enhance_sound_quality_stream
+from modules.audio.utils.enhancement import load_enhancement_profiles
+from modules.media.infrastructure.storage import S3Storage
 from modules.summarization.domain import SoundEnhancedEvent
 
 logger = logging.getLogger(__name__)
@@ -17,50 +31,144 @@ broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 app = FastStream(broker)
 
 
-def enhance_sound_quality(audio: bytes, output_format: AudioFormat = "wav") -> tuple[bytes, int]:
-    """Улучшение качества звука используя технологии Spotify.
+class ThroughputMeter:
+    """Замер пропускной способности воркера в сегментах в секунду на одно ядро.
 
-    :param audio: Байты аудио записи.
-    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
-    :returns: Байты обработанной аудио записи + частота дискретизации.
+    :param cores: Количество процессов, между которыми распределяется обработка.
     """
-    with io.BytesIO(audio) as stream:
-        content, samplerate = sf.read(stream)
-    board = Pedalboard([
-        NoiseGate(threshold_db=-30, ratio=1.5, release_ms=250),
-        Compressor(threshold_db=-16, ratio=4, attack_ms=5, release_ms=100),
-        LowShelfFilter(cutoff_frequency_hz=400, gain_db=8, q=1),
-        Gain(gain_db=2)
-    ])
-    effected = board(content, samplerate)
-    with io.BytesIO(effected) as stream:
-        sf.write(stream, content, samplerate, format=output_format)
-        stream.seek(0)
-        return stream.read(), samplerate
-
-
-@broker.subscriber("sound_enhancement")
-@broker.publisher("sound_enhancement")
+
+    def __init__(self, cores: int) -> None:
+        self._cores = cores
+        self._started_at: float | None = None
+        self._processed = 0
+
+    def start(self) -> None:
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+
+    def mark(self) -> float:
+        """Учитывает обработанный сегмент и возвращает текущую пропускную способность."""
+        self._processed += 1
+        elapsed = time.perf_counter() - (self._started_at or time.perf_counter())
+        if elapsed <= 0:
+            return 0.0
+        return self._processed / elapsed / self._cores
+
+
+# Декодирование, обработка и кодирование сегмента нагружают CPU,
+# поэтому выполняются в пуле процессов, а не в цикле событий
+max_workers = dev_settings.sound_enhancer.max_workers or os.process_cpu_count() or 1
+# Количество сегментов, которые брокер отдаёт воркеру без подтверждения,
+# с запасом, чтобы процессы пула не простаивали в ожидании следующего сегмента
+prefetch_count = dev_settings.sound_enhancer.prefetch_count or max_workers * 2
+
+executor = ProcessPoolExecutor(
+    max_workers=max_workers,
+    initializer=load_enhancement_profiles,
+    initargs=(dev_settings.sound_enhancer.profiles_path,),
+)
+
+throughput_meter = ThroughputMeter(cores=max_workers)
+
+storage = S3Storage(
+    endpoint_url=dev_settings.minio.url,
+    access_key=dev_settings.minio.user,
+    secret_key=dev_settings.minio.password,
+    bucket=dev_settings.minio.bucket,
+    upload_concurrency=dev_settings.minio.upload_concurrency,
+    read_ahead=dev_settings.minio.read_ahead,
+    max_pool_connections=dev_settings.minio.max_pool_connections,
+    keepalive_timeout=dev_settings.minio.keepalive_timeout,
+)
+
+segment_store = AudioSegmentStore(storage, prefix=dev_settings.audio_pipeline.segments_prefix)
+
+
+@app.on_startup
+async def connect_storage() -> None:
+    await storage.connect()
+
+
+@app.after_shutdown
+async def shutdown() -> None:
+    await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+    await storage.close()
+
+
+async def enhance_stored_segment(
+        stored_segment: StoredAudioSegment, profile: str
+) -> StoredAudioSegment:
+    """Улучшение качества звука сегмента из хранилища через временные файлы.
+    Сегмент скачивается потоком в файл, обрабатывается блоками в пуле процессов
+    и загружается обратно из файла, поэтому контент не копируется в память воркера.
+
+    :param stored_segment: Ссылка на сегмент в хранилище.
+    :param profile: Название профиля улучшения звука.
+    :returns: Ссылка на обработанный сегмент в хранилище.
+    """
+
+    async with aiofiles.tempfile.TemporaryDirectory(prefix="sound_enhancer_") as temp_dir:
+        source = await segment_store.download(
+            stored_segment, Path(temp_dir, f"source.{stored_segment.format}")
+        )
+        destination = Path(temp_dir, f"enhanced.{AudioFormat.WAV}")
+        loop = asyncio.get_running_loop()
+        samplerate = await loop.run_in_executor(
+            executor,
+            partial(enhance_sound_quality_stream, source.filepath, destination, profile=profile),
+        )
+        enhanced_segment = FileAudioSegment(
+            **source.model_dump(exclude={"filepath", "size", "format", "samplerate"}),
+            filepath=destination,
+            size=await aiofiles.os.path.getsize(destination),
+            format=AudioFormat.WAV,
+            samplerate=samplerate,
+        )
+        return await segment_store.put(enhanced_segment, stage="enhanced")
+
+
+async def enhance_segment(audio_segment: AudioSegment, profile: str) -> AudioSegment:
+    """Улучшение качества звука сегмента, переданного через брокер вместе с контентом"""
+
+    loop = asyncio.get_running_loop()
+    effected, samplerate = await loop.run_in_executor(
+        executor, partial(enhance_sound_quality, audio_segment.content, profile=profile)
+    )
+    return audio_segment.model_copy(update={
+        "content": effected,
+        "size": len(effected),
+        "format": AudioFormat.WAV,
+        "samplerate": samplerate,
+    })
+
+
+@broker.subscriber("sound_enhancement", channel=Channel(prefetch_count=prefetch_count))
+@broker.publisher("transcribing")
 async def handle_sound_quality_enhancement(
-        audio_segment: AudioSegment, logger: Logger
-) -> AudioSegment:
+        audio_segment: AudioSegment | StoredAudioSegment, logger: Logger
+) -> AudioSegment | StoredAudioSegment:
     logger.info(
         "Start sound quality enhancement for audio segment %s/%s with duration %s sec",
-        audio_segment.id, audio_segment.total_count, audio_segment.duration,
+        audio_segment.number, audio_segment.total_count, audio_segment.duration,
         extra=audio_segment.metadata
     )
-    effected, samplerate = enhance_sound_quality(audio_segment.content)
+    profile = audio_segment.metadata.get(
+        "enhancement_profile", dev_settings.sound_enhancer.profile
+    )
+    throughput_meter.start()
+    if isinstance(audio_segment, StoredAudioSegment):
+        enhanced_segment = await enhance_stored_segment(audio_segment, profile)
+        await segment_store.remove(audio_segment)
+    else:
+        enhanced_segment = await enhance_segment(audio_segment, profile)
     logger.info(
-        "Finished sound quality enhancement for audio segment %s/%s with duration %s sec",
-        audio_segment.id, audio_segment.total_count, audio_segment.duration,
+        "Finished sound quality enhancement for audio segment %s/%s with duration %s sec, "
+        "throughput %.3f segments/sec per core",
+        audio_segment.number, audio_segment.total_count, audio_segment.duration,
+        throughput_meter.mark(),
         extra=audio_segment.metadata
     )
     if audio_segment.is_last:
         event = SoundEnhancedEvent(collection_id=audio_segment.metadata["collection_id"])
         await broker.publish(event, queue="sound_enhancement")
-    return audio_segment.rewrite(
-        content=effected,
-        size=len(effected),
-        format=AudioFormat.WAV,
-        samplerate=samplerate
-    )
+    return enhanced_segment
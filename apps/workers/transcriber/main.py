@@ -1,12 +1,20 @@
-import asyncio
+from datetime import timedelta
 
 from faststream import FastStream, Logger
-from faststream.rabbit import RabbitBroker
+from faststream.rabbit import Channel, RabbitBroker
 
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioSegment
+from modules.audio.application import (
+    AudioSegmentStore,
+    TranscribedSegmentsCollector,
+    TranscriptionOrchestrator,
+)
+from modules.audio.domain import AudioSegment, AudioSegmentTranscribedEvent, StoredAudioSegment
+from modules.audio.infrastructure.cache import SaluteSpeechTokenCache, TranscriptionCache
+from modules.media.infrastructure.storage import S3Storage
 from modules.summarization.domain import AudioTranscribedEvent
 from salute_speech.asyncio import AsyncSaluteSpeechClient
+from salute_speech.transcript import Transcript
 
 broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 
@@ -15,45 +23,123 @@ app = FastStream(broker)
 salute_speech_client = AsyncSaluteSpeechClient(
     apikey=dev_settings.salute_speech.apikey,
     scope=dev_settings.salute_speech.scope,
+    # Access token живёт 30 минут и разделяется всеми воркерами
+    token_cache=SaluteSpeechTokenCache(
+        url=dev_settings.redis.url, prefix="salute-speech:access-token", ttl=timedelta(minutes=30)
+    ),
+)
+
+storage = S3Storage(
+    endpoint_url=dev_settings.minio.url,
+    access_key=dev_settings.minio.user,
+    secret_key=dev_settings.minio.password,
+    bucket=dev_settings.minio.bucket,
+    upload_concurrency=dev_settings.minio.upload_concurrency,
+    read_ahead=dev_settings.minio.read_ahead,
+    max_pool_connections=dev_settings.minio.max_pool_connections,
+    keepalive_timeout=dev_settings.minio.keepalive_timeout,
+)
+
+segment_store = AudioSegmentStore(storage, prefix=dev_settings.audio_pipeline.segments_prefix)
+
+# Сегменты распознаются параллельно, брокер отдаёт воркеру
+# столько сегментов, сколько распознаваний разрешено одновременно
+transcription_orchestrator = TranscriptionOrchestrator(
+    salute_speech_client,
+    max_concurrency=dev_settings.audio_pipeline.transcription_concurrency,
+    # Повторно загруженные записи не распознаются заново
+    cache=TranscriptionCache(
+        url=dev_settings.redis.url,
+        prefix="audio:transcription",
+        ttl=dev_settings.audio_pipeline.transcription_cache_ttl,
+    ) if dev_settings.audio_pipeline.transcription_cache else None,
 )
 
+# Расшифровки сегментов копятся до последнего сегмента записи
+transcribed_segments_collector = TranscribedSegmentsCollector()
+
+
+@app.on_startup
+async def connect_storage() -> None:
+    await storage.connect()
+
+
+@app.after_shutdown
+async def close_clients() -> None:
+    await transcription_orchestrator.close()
+    await salute_speech_client.close()
+    await storage.close()
 
-async def transcribe_audio(audio_segment: AudioSegment) -> str:
+
+async def transcribe_audio(audio_segment: AudioSegment | StoredAudioSegment) -> Transcript:
     """Асинхронная трансрибация аудио сегмента.
 
+    Сегмент из хранилища не скачивается целиком, а передаётся в Salute Speech
+    потоком ranged запросов.
+
     :param audio_segment: Аудио сегмент для трансрибации.
-    :returns: Трансрибация + диаризация в формате Markdown.
+    :returns: Расшифровка сегмента (время от начала сегмента).
     """
-    request_file_id = await salute_speech_client.upload_file(
-        file=audio_segment.content, audio_encoding="PCM_S16LE"
-    )
-    task = await salute_speech_client.async_recognize(
-        request_file_id, channels=audio_segment.channels, max_speakers_count=10
-    )
-    while task.status != "DONE":
-        await asyncio.sleep(1)
-        task = await salute_speech_client.get_task_status(task.id)
-    recognized_speech_list = await salute_speech_client.download_file(task.response_file_id)
-    return recognized_speech_list.to_markdown()
+    content = None
+    if isinstance(audio_segment, StoredAudioSegment):
+        content = segment_store.iter_content(audio_segment)
+    return await transcription_orchestrator.transcribe_segment(audio_segment, content=content)
 
 
-@broker.subscriber("transcribing")
-@broker.publisher("transcribing")
+@broker.subscriber(
+    "transcribing",
+    channel=Channel(prefetch_count=dev_settings.audio_pipeline.transcription_concurrency),
+)
 async def handle_audio_segment(
-        audio_segment: AudioSegment, logger: Logger
-) -> AudioTranscribedEvent:
-    text = await transcribe_audio(audio_segment)
+        audio_segment: AudioSegment | StoredAudioSegment, logger: Logger
+) -> None:
+    transcript = await transcribe_audio(audio_segment)
+    # Столбцы расшифровки с началом сегмента в записи для склейки расшифровки записи.
+    # AudioTranscribedEvent публикуется один раз на запись после склейки: количество
+    # сегментов при потоковом разбиении известно только у последнего сегмента
+    await broker.publish(
+        AudioSegmentTranscribedEvent(
+            number=audio_segment.number,
+            total_count=audio_segment.total_count,
+            duration=audio_segment.duration,
+            offset=audio_segment.offset,
+            overlap=audio_segment.overlap,
+            transcript=transcript.to_dict(),
+            metadata=audio_segment.metadata,
+        ),
+        queue=AudioSegmentTranscribedEvent.event_type,
+    )
+    if isinstance(audio_segment, StoredAudioSegment):
+        await segment_store.remove(audio_segment)
     logger.info(
         "Audio transcribing successfully for segment %s/%s",
-        audio_segment.id, audio_segment.total_count
+        audio_segment.number, audio_segment.total_count
+    )
+
+
+@broker.subscriber(AudioSegmentTranscribedEvent.event_type)
+async def handle_audio_segment_transcribed(
+        event: AudioSegmentTranscribedEvent, logger: Logger
+) -> None:
+    events = transcribed_segments_collector.add(event)
+    if events is None:
+        return
+    transcript = TranscriptionOrchestrator.reassemble_events(events)
+    logger.info(
+        "Audio transcript reassembled from %s segments for record %s",
+        len(events), event.metadata["record_id"]
     )
-    return AudioTranscribedEvent(
-        task_id=audio_segment.metadata["task_id"],
-        collection_id=audio_segment.metadata["collection_id"],
-        record_id=audio_segment.metadata["record_id"],
-        segment_id=audio_segment.id,
-        segment_duration=audio_segment.duration,
-        segments_count=audio_segment.total_count,
-        is_last=audio_segment.is_last,
-        text=text,
+    # Расшифровка всей записи, продолжительность без перекрытий соседних сегментов
+    await broker.publish(
+        AudioTranscribedEvent(
+            task_id=event.metadata["task_id"],
+            collection_id=event.metadata["collection_id"],
+            record_id=event.metadata["record_id"],
+            segment_id=len(events),
+            segment_duration=round(sum(event.duration - event.overlap for event in events)),
+            segments_count=len(events),
+            is_last=True,
+            text=transcript.to_markdown(),
+        ),
+        queue="transcribing",
     )
@@ -1,3 +1,4 @@
+import asyncio
 import io
 import logging
 import time
@@ -32,6 +33,8 @@ broker = RedisBroker(
 app = FastStream(broker)
 
 MEETING_MINUTES_PROMPT = (PROMPTS_DIR / "meeting_minutes_prompt.md").read_text(encoding="utf-8")
+# Максимальное количество сегментов, распознаваемых одновременно
+MAX_CONCURRENT_RECOGNITIONS = 4
 
 
 def split_audio_into_segments(
@@ -106,7 +109,6 @@ async def process_minutes_task(task: schemas.MinutesTask, logger: Logger) -> Non
         chat_id=task.user_id,
         text="Скачиваю аудио файл 🔜 ..."
     )
-    transcription_segments: list[str] = []
     start_time = time.time()
     file_buffer = await bot.download_file(task.audio_path, destination=io.BytesIO())
     audio_data = file_buffer.getbuffer().tobytes()
@@ -114,23 +116,39 @@ async def process_minutes_task(task: schemas.MinutesTask, logger: Logger) -> Non
         "Audio file `%s` downloaded from telegram, size %s mb, downloading time %s seconds",
         task.audio_path, round(len(audio_data) / 1_000_000, 2), round(time.time() - start_time, 2)
     )
-    for audio_segment in split_audio_into_segments(audio_data, audio_format=task.audio_format):
-        bot_message = await update_progress(
-            bot=bot,
-            chat_id=task.user_id,
-            percent=audio_segment.index + 1 / audio_segment.segments_count * 100,
-            prev_message_id=bot_message.message_id
-        )
-        logger.info(
-            "Recognizing %s/%s segment of audio file `%s`",
-            audio_segment.index + 1, audio_segment.segments_count, task.audio_path
-        )
-        transcription = await salute_speech.recognize_async(
-            audio_data=audio_segment.data,
-            audio_encoding="PCM_S16LE",
-            max_speakers=task.max_speakers,
-        )
-        transcription_segments.append(transcription)
+    audio_segments = list(
+        split_audio_into_segments(audio_data, audio_format=task.audio_format)
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RECOGNITIONS)
+    progress_lock = asyncio.Lock()
+    recognized_count = 0
+
+    async def recognize_segment(audio_segment: schemas.AudioSegment) -> str:
+        nonlocal bot_message, recognized_count
+        async with semaphore:
+            logger.info(
+                "Recognizing %s/%s segment of audio file `%s`",
+                audio_segment.index + 1, audio_segment.segments_count, task.audio_path
+            )
+            transcription = await salute_speech.recognize_async(
+                audio_data=audio_segment.data,
+                audio_encoding="PCM_S16LE",
+                max_speakers=task.max_speakers,
+            )
+        async with progress_lock:
+            recognized_count += 1
+            bot_message = await update_progress(
+                bot=bot,
+                chat_id=task.user_id,
+                percent=recognized_count / len(audio_segments) * 100,
+                prev_message_id=bot_message.message_id
+            )
+        return transcription
+
+    # Сегменты распознаются параллельно, gather сохраняет их исходный порядок
+    transcription_segments = await asyncio.gather(
+        *(recognize_segment(audio_segment) for audio_segment in audio_segments)
+    )
     full_transcription = "\n".join(transcription_segments)
     await bot.delete_message(chat_id=task.user_id, message_id=bot_message.message_id)
     await bot.send_message(